@@ -26,9 +26,13 @@ def convert_video(self, data):
 
 @celery_app.task(bind=True, max_retries=3)
 def upload_video(self, data):
-    '''vercel 저장소에 비디오 파일 업로드'''
-    video_service.upload_video(data)
+    '''업로드 저장소(UPLOAD_BACKEND)에 비디오 파일 업로드'''
     print("변환한 파일을 업로드합니다.")
+    try:
+        video_service.upload_video(data)
+    except Exception as e:
+        # S3 multipart 업로드는 재시도 시 이미 올라간 파트를 건너뜀
+        raise self.retry(exc=e)
     return data
     
 
@@ -65,17 +69,26 @@ def prepare_training_data(self, data):
 
 @celery_app.task(bind=True, max_retries=3)
 def upload_csv(self, data):
-    inference_service.upload_csv(data)
     print("모델 추론 결과를 csv로 저장합니다.")
+    try:
+        return inference_service.upload_csv(data)
+    except Exception as e:
+        raise self.retry(exc=e)
     
 
 @celery_app.task(bind=True, max_retries=3)
 def upload_json(self, data):
-    inference_service.upload_json(data)
+    try:
+        return inference_service.upload_json(data)
+    except Exception as e:
+        raise self.retry(exc=e)
     
 @celery_app.task(bind=True, max_retries=3)    
 def upload_overlaid_video(self, data):
-    inference_service.upload_overlaid_video(data)
+    try:
+        return inference_service.upload_overlaid_video(data)
+    except Exception as e:
+        raise self.retry(exc=e)
 
 # @celery_app.task(bind=True, max_retries=3)
 # def train_model(self, data):
@@ -1,3 +1,3 @@
 from .video import Video
-from .task import Task
+from .task import Task, TaskStep
 from .base import Base
\ No newline at end of file
@@ -0,0 +1,36 @@
+from typing import List
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import MetaData
+
+
+def add_missing_columns(engine: Engine, metadata: MetaData) -> List[str]:
+    """이미 있는 테이블에 엔티티에 새로 추가된 nullable 컬럼을 ALTER TABLE로 추가합니다.
+
+    ``create_all``은 없는 테이블만 만들고 기존 테이블의 컬럼은 바꾸지 않으므로, 영속 볼륨의 DB를 쓰는
+    배포에서는 create_all 뒤에 이 함수를 호출해야 새 컬럼을 조회할 수 있습니다. 여러 프로세스가 동시에
+    호출해도 되도록 PostgreSQL에서는 ``ADD COLUMN IF NOT EXISTS``를 사용합니다.
+    NOT NULL 컬럼은 기존 행의 값을 정할 수 없으므로 추가하지 않습니다.
+
+    Returns:
+        추가한 컬럼 리스트 ("table.column")
+    """
+    inspector = inspect(engine)
+    preparer = engine.dialect.identifier_preparer
+    if_not_exists = "IF NOT EXISTS " if engine.dialect.name == "postgresql" else ""
+    added = []
+    with engine.begin() as connection:
+        for table in metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                connection.execute(text(
+                    f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {if_not_exists}"
+                    f"{preparer.format_column(column)} {column.type.compile(dialect=engine.dialect)}"
+                ))
+                added.append(f"{table.name}.{column.name}")
+    return added
@@ -27,6 +27,8 @@ class TaskStep(Base):
     status = Column(String, nullable=False, default="pending")  # pending, processing, completed, failed
     started_at = Column(DateTime, nullable=True)
     finished_at = Column(DateTime, nullable=True)
+    progress = Column(Float, nullable=True)  # 0~1, 배치 이벤트를 보내는 단계만 기록
+    error = Column(String, nullable=True)  # 실패 사유 (예: truncated_stream)
     
     # relationship 설정
     task = relationship("Task", back_populates="steps")
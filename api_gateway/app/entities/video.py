@@ -1,4 +1,7 @@
-from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Enum
+import enum
+
+from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.orm import relationship
 
 
@@ -7,7 +10,7 @@ from datetime import timezone
 
 from app.entities.base import Base
 
-class VideoType(str, Enum):
+class VideoType(str, enum.Enum):
     MP4 = "mp4"
     AVI = "avi"
     MOV = "mov"
@@ -17,7 +20,7 @@ class VideoType(str, Enum):
     WEBM = "webm"
 
 
-class VideoCodec(str, Enum):
+class VideoCodec(str, enum.Enum):
     AVC1 = "avc1"
     MP4V = "mp4v"
     HEV1 = "hev1"
@@ -34,14 +37,38 @@ class VideoCodec(str, Enum):
     H264 = "H264"
 
 
-class CameraAngle(str, Enum):
+class CameraAngle(str, enum.Enum):
     TOP = "top"
     FRONT = "front"
     BOTTOM = "bottom"
 
-class VideoQuality(str, Enum):
-    QUALIFIED: "qualified"
-    UNQUALIFIED: "unqualified"
+class VideoQuality(str, enum.Enum):
+    QUALIFIED = "qualified"
+    UNQUALIFIED = "unqualified"
+
+
+class EnumValue(TypeDecorator):
+    """enum 값(value)을 VARCHAR로 저장합니다.
+
+    목록에 없는 문자열(예: ffprobe 코덱 이름 "h264")도 그대로 저장/조회되고, 목록에 있는 값은 enum으로 조회됩니다.
+    """
+
+    impl = String(32)
+    cache_ok = True
+
+    def __init__(self, enum_class, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.enum_class = enum_class
+
+    def process_bind_param(self, value, dialect):
+        return value.value if isinstance(value, enum.Enum) else value
+
+    def process_result_value(self, value, dialect):
+        try:
+            return self.enum_class(value) if value is not None else None
+        except ValueError:
+            return value
+
 
 class Video(Base):
     __tablename__ = "videos"
@@ -49,11 +76,12 @@ class Video(Base):
     id = Column(String, primary_key=True)
     task_id = Column(String, ForeignKey("tasks.id"), nullable=False, unique=True)
     frame_count = Column(Integer, nullable=True)
-    codec = Column(VideoCodec, nullable=True)
-    video_type = Column(VideoType, nullable=True)
+    codec = Column(EnumValue(VideoCodec), nullable=True)
+    video_type = Column(EnumValue(VideoType), nullable=True)
     duration_sec = Column(Float, nullable=True)
-    camera_angle = Column(CameraAngle, nullable=True)
-    video_quality = Column(VideoQuality, nullable=True)
+    camera_angle = Column(EnumValue(CameraAngle), nullable=True)
+    video_quality = Column(EnumValue(VideoQuality), nullable=True)
+    conversion_mode = Column(String, nullable=True)  # remux, transcode
     upload_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
     
     task = relationship("Task", back_populates="video", uselist=False)
@@ -1,9 +1,10 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from glob import glob
 import os
+from typing import Iterable, List
 
 import spb_label.sdk
+from actverse_common.frame_archive import FrameArchive, frame_image_names
 from spb_label.tasks.manager import TaskManager
 
 class LabellingManager(ABC):
@@ -11,6 +12,10 @@ class LabellingManager(ABC):
     def upload_images(self, image_path: str):
         raise NotImplementedError
 
+    @abstractmethod
+    def upload_image_files(self, image_files: List[str], task_id: str):
+        raise NotImplementedError
+
     @abstractmethod
     def get_labelling_status(self):
         raise NotImplementedError
@@ -34,10 +39,26 @@ class SuperbLabellingManager(LabellingManager):
             self.client.credential["team_name"], self.client.credential["access_key"]
         )
 
-    def upload_images(self, image_path: str, task_id: str):
-        image_paths = glob(os.path.join(image_path, "*.jpg"))
-        for image_path in image_paths:
-            self.client.upload_image(image_path, dataset_name=task_id)
+    def upload_images(self, image_path: str, task_id: str, exclude: Iterable[str] = ()):
+        """image_path의 프레임 이미지를 업로드합니다. exclude에 있는 파일명(배치로 이미 올린 파일)은 건너뜁니다.
+
+        이미지 형식(jpg/webp/png)과 관계없이 frames_manifest.json에 기록된 파일을 올리고,
+        프레임이 샤드 아카이브(frames_index.json)로 저장되어 있으면 임시 파일로 풀어서 업로드합니다.
+        """
+        exclude = set(exclude)
+        names = [name for name in frame_image_names(image_path) if name not in exclude]
+        if FrameArchive.exists(image_path):
+            with FrameArchive(image_path) as archive:
+                with archive.temporary_files(names) as image_paths:
+                    self.upload_image_files(image_paths, task_id)
+            return
+
+        self.upload_image_files([os.path.join(image_path, name) for name in names], task_id)
+
+    def upload_image_files(self, image_files: List[str], task_id: str):
+        """프레임 배치 이벤트로 받은 파일들만 업로드합니다."""
+        for image_file in image_files:
+            self.client.upload_image(image_file, dataset_name=task_id)
 
     def get_labelling_status(self, task_id: str) -> LabellingStatus:
         task_progress = self.task_manager.get_task_progress_by_id(task_id)
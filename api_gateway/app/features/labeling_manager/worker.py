@@ -2,7 +2,7 @@ import json
 import pika
 import os
 import time
-from typing import Dict, Any
+from typing import Dict, Any, List
 from dotenv import load_dotenv
 
 from app.features.labeling_manager.labelling_manager import SuperbLabellingManager
@@ -16,32 +16,81 @@ from actverse_common.logging import (
 )
 from actverse_common.events import (
     EVENT_LABELING_REQUESTED, 
-    EVENT_LABELING_COMPLETED
+    EVENT_LABELING_COMPLETED,
+    EVENT_FRAMES_BATCH_EXTRACTED
 )
 from actverse_common.messaging import (
     get_rabbitmq_connection, 
     publish_event
 )
+from actverse_common.frame_archive import FrameArchive
 # 로거 설정
 logger = setup_logger(service_name="labeling_manager")
 load_dotenv()
 
 # 구독할 이벤트
-SUBSCRIBE_EVENTS = [EVENT_LABELING_REQUESTED]
+SUBSCRIBE_EVENTS = [
+    EVENT_LABELING_REQUESTED,
+    EVENT_FRAMES_BATCH_EXTRACTED  # 프레임 추출 중 저장된 배치를 먼저 업로드
+]
+
+# 배치 이벤트로 업로드를 마친 파일명 기록 (프레임 디렉토리 안에 저장)
+UPLOADED_FILES_NAME = ".labeling_uploaded.json"
 
 label_task_repository: LabelTaskRepository = PostgresLabelTaskRepository(os.getenv("DATABASE_URL"))
 
+
+def get_labelling_manager() -> SuperbLabellingManager:
+    return SuperbLabellingManager(
+        project_name=os.getenv("LABELING_PROJECT_NAME"),
+        team_name=os.getenv("LABELING_TEAM_NAME"),
+        superbai_token=os.getenv("SUPERBAI_TOKEN")
+    )
+
+
+def load_uploaded_files(frames_path: str) -> List[str]:
+    uploaded_path = os.path.join(frames_path, UPLOADED_FILES_NAME)
+    if not os.path.exists(uploaded_path):
+        return []
+    with open(uploaded_path) as f:
+        return json.load(f)
+
+
+def record_uploaded_files(frames_path: str, files: List[str]):
+    uploaded = load_uploaded_files(frames_path)
+    with open(os.path.join(frames_path, UPLOADED_FILES_NAME), "w") as f:
+        json.dump(uploaded + [name for name in files if name not in uploaded], f)
+
+
+def process_frames_batch_extracted(data: Dict[str, Any]):
+    """프레임 배치 저장 이벤트 처리: 추출이 끝나기 전에 배치의 파일부터 업로드"""
+    task_id = data.get("task_id")
+    frames_path = data.get("frames_path")
+    files = data.get("files", [])
+
+    try:
+        if FrameArchive.exists(frames_path):
+            # 샤드로 저장된 배치는 SDK가 파일 경로를 요구하므로 임시 파일로 풀어서 업로드
+            with FrameArchive(frames_path) as archive, archive.temporary_files(files) as image_files:
+                get_labelling_manager().upload_image_files(image_files, task_id)
+        else:
+            get_labelling_manager().upload_image_files(
+                [os.path.join(frames_path, name) for name in files], task_id
+            )
+        record_uploaded_files(frames_path, files)
+        logger.info(f"프레임 배치 업로드 완료: batch {data.get('batch_index')}, {len(files)}장")
+        return True
+    except Exception as e:
+        logger.error(f"프레임 배치 업로드 중 오류: {str(e)}")
+        return False
+
 def process_frames_extracted(data: Dict[str, Any]):
     """프레임 추출 완료 이벤트 처리"""
     task_id = data.get("task_id")
     frames_path = data.get("frames_path")
     user_id = data.get("user_id")
 
-    superb_labelling_manager = SuperbLabellingManager(
-        project_name=os.getenv("LABELING_PROJECT_NAME"),
-        team_name=os.getenv("LABELING_TEAM_NAME"),
-        superbai_token=os.getenv("SUPERBAI_TOKEN")
-    )
+    superb_labelling_manager = get_labelling_manager()
 
     logger.info(f'project name: {os.getenv("LABELING_PROJECT_NAME")}')
     logger.info(f'team name: {os.getenv("LABELING_TEAM_NAME")}')
@@ -49,7 +98,8 @@ def process_frames_extracted(data: Dict[str, Any]):
     
 
     # TODO: 테스트 설정
-    superb_labelling_manager.upload_images(frames_path, task_id)
+    # 배치 이벤트로 이미 업로드한 파일은 제외하고 남은 파일만 업로드
+    superb_labelling_manager.upload_images(frames_path, task_id, exclude=load_uploaded_files(frames_path))
     # DB에 라벨 태스크 저장
     # TODO: 리포지토리 초기화 위치 지정.
     label_task_repository.save_label_task(LabelTask(user_id = user_id, task_id=task_id, status=LabellingStatus.INPROGRESS.value, label_url=f"{os.getenv('DATA_STORAGE_PATH')}/{task_id}/labels"))
@@ -77,6 +127,8 @@ def callback(ch, method, properties, body):
         
         if event_type == EVENT_LABELING_REQUESTED:
             success = process_frames_extracted(data)
+        elif event_type == EVENT_FRAMES_BATCH_EXTRACTED:
+            success = process_frames_batch_extracted(data)
         else:
             logger.warning(f"처리할 수 없는 이벤트 타입: {event_type}")
             success = True  # 모르는 이벤트는 성공으로 처리
@@ -1,10 +1,12 @@
 from abc import ABC, abstractmethod
 import os, json, zipfile
 import pandas as pd
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Optional, Tuple
 
 from actnova.model import Yolov8KeypointEstimator
 
+from app.features.video_processor.video_converter import ConversionGeometry
+
 import logging
 logger = logging.getLogger(__name__)
 
@@ -89,7 +91,6 @@ def convert_dict_to_dataframe(
     return metadata_df, results_df
 
 
-
 class ModelInference(ABC):
 
     @abstractmethod
@@ -98,8 +99,25 @@ class ModelInference(ABC):
 
 
 class YOLOv8KeypointInference(ModelInference):
-    def __init__(self, download_path: str):
+    def __init__(self, download_path: str, geometry: Optional[ConversionGeometry] = None):
         self.download_path = download_path
+        # 변환본(e.g. analysis-640)으로 추론할 때 원본 대비 해상도/fps
+        self.geometry = geometry
+
+    def conversion_metadata(self) -> Dict[str, Any]:
+        """키포인트 좌표 / analysis_scale, 프레임 번호 * source_fps / analysis_fps로 원본에 대응합니다."""
+        if self.geometry is None:
+            return {}
+        geometry = self.geometry
+        return {
+            "analysis_scale": geometry.scale,
+            "analysis_width": geometry.width,
+            "analysis_height": geometry.height,
+            "analysis_fps": geometry.fps,
+            "source_width": geometry.source_width,
+            "source_height": geometry.source_height,
+            "source_fps": geometry.source_fps,
+        }
 
     def predict_and_postprocess(self, video_file: str, model_path: str, task_id: str):
         model = Yolov8KeypointEstimator(model_path)
@@ -113,6 +131,7 @@ class YOLOv8KeypointInference(ModelInference):
         mean_box_score = prediction.get_mean_box_score()
         score_data = {"mean_num_mice": mean_num_mice, "mean_box_score": mean_box_score}
         prediction_json = prediction.to_json()
+        prediction_json["metadata"].update(self.conversion_metadata())
         csv_metadata, csv_results = convert_dict_to_dataframe(prediction_json)
 
         return {
@@ -6,6 +6,7 @@ from typing import Dict, Any
 from glob import glob
 from app.features.model_inference.inference import YOLOv8KeypointInference
 from app.features.model_inference.analysis_notebook import generate_analysis_script
+from app.features.video_processor.video_converter import find_conversion
 from actverse_common.logging import (
     setup_logger, 
     log_event_received, 
@@ -35,9 +36,20 @@ def process_inference_requested(data: Dict[str, Any]):
         # 모델 추론 로직
         download_path = f'inference_results/{task_id}'
         # TODO: 비디오 이름 식별 필요
-        video_file = glob(f'{os.getenv("DATA_STORAGE_PATH")}/videos/{task_id}/*.mp4')[0]
+        # 분석용(analysis-640)으로 변환된 비디오가 있으면 우선 사용하고,
+        # 원본을 지웠으면 archive 변환본을 사용
+        video_dir = f'{os.getenv("DATA_STORAGE_PATH")}/videos/{task_id}'
+        video_file = (
+            glob(f'{video_dir}/converted/*_analysis-640.mp4')
+            or glob(f'{video_dir}/*.mp4')
+            or glob(f'{video_dir}/converted/*.mp4')
+        )[0]
+        # 변환본의 키포인트 좌표/프레임 번호를 원본으로 되돌릴 수 있도록 변환 정보를 결과에 기록
+        conversion = find_conversion(video_file, "inference")
 
-        inference = YOLOv8KeypointInference(download_path)
+        inference = YOLOv8KeypointInference(
+            download_path, geometry=conversion.geometry if conversion else None
+        )
 
         inference(video_file, task_id)
         
@@ -11,6 +11,7 @@ __all__ = [
     "VideoFrameHandler",
     "NaiveVideoFrameCurator",
     "LocalUploader",
+    "S3Uploader",
 ]
 
 def __getattr__(name):
@@ -27,4 +28,7 @@ def __getattr__(name):
     if name == "LocalUploader":
         from .video_uploader import LocalUploader as _cls
         return _cls
+    if name == "S3Uploader":
+        from .s3_uploader import S3Uploader as _cls
+        return _cls
     raise AttributeError(name)
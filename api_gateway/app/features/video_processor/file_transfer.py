@@ -0,0 +1,235 @@
+import errno
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from glob import glob
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# 전송 방식 (빠른 순)
+TRANSFER_HARDLINK = "hardlink"
+TRANSFER_REFLINK = "reflink"
+TRANSFER_COPY_FILE_RANGE = "copy_file_range"
+TRANSFER_SENDFILE = "sendfile"
+TRANSFER_BUFFERED = "buffered"
+
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+# 같은 파일시스템이 아니거나 파일시스템이 지원하지 않을 때 다음 방식으로 넘어가는 errno
+FALLBACK_ERRNOS = {
+    errno.EXDEV,
+    errno.EPERM,
+    errno.EACCES,
+    errno.EOPNOTSUPP,
+    errno.ENOTSUP,
+    errno.ENOSYS,
+    errno.EINVAL,
+    errno.ENOTTY,
+    errno.EMLINK,
+}
+
+
+@dataclass
+class TransferredFile:
+    source: str
+    destination: str
+    size: int
+    method: str
+    checksum: Optional[str] = None
+
+
+@dataclass
+class TransferManifest:
+    files: List[TransferredFile] = field(default_factory=list)
+    checksum_algorithm: Optional[str] = None
+    elapsed_sec: float = 0.0
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(f.size for f in self.files)
+
+    @property
+    def methods(self) -> Dict[str, int]:
+        """전송 방식별 파일 수"""
+        counts: Dict[str, int] = {}
+        for f in self.files:
+            counts[f.method] = counts.get(f.method, 0) + 1
+        return counts
+
+    def to_dict(self) -> dict:
+        return {
+            "checksum_algorithm": self.checksum_algorithm,
+            "elapsed_sec": self.elapsed_sec,
+            "total_bytes": self.total_bytes,
+            "methods": self.methods,
+            "files": [asdict(f) for f in self.files],
+        }
+
+    def save(self, path: str) -> str:
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+
+class FileTransfer:
+    """로컬 파일을 가능한 한 데이터 복사 없이 옮기는 전송 엔진입니다.
+
+    hardlink -> reflink(FICLONE) -> copy_file_range -> sendfile -> 버퍼 복사 순으로 시도합니다.
+    같은 볼륨이면 hardlink로 inode만 공유하므로 파일 크기와 관계없이 메타데이터 작업 한 번으로 끝나고,
+    다른 볼륨이어도 copy_file_range/sendfile은 커널 안에서 복사해 사용자 공간 버퍼를 거치지 않습니다.
+
+    hardlink는 원본과 같은 파일이므로 전송 후 원본을 제자리에서 수정하지 않는 파일(프레임, 결과물)에만
+    사용해야 합니다. 복사는 임시 이름으로 쓴 뒤 rename하므로 읽는 쪽이 쓰다 만 파일을 보지 않습니다.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        allow_hardlink: bool = True,
+        allow_reflink: bool = True,
+        checksum: Optional[str] = "crc32",
+    ):
+        """
+        Args:
+            max_workers: 동시에 전송할 파일 수 (기본값: CPU 코어 수, 최대 8). 1이면 스레드 없이 전송합니다.
+            allow_hardlink: False면 원본과 독립된 사본을 만듭니다.
+            allow_reflink: False면 reflink를 건너뜁니다 (사본이 블록을 공유하지 않음).
+            checksum: "crc32"(zlib, 기본값) 또는 hashlib 알고리즘 이름. None이면 체크섬을 계산하지 않습니다.
+                체크섬은 파일 내용을 모두 읽으므로 hardlink 전송에서는 전송보다 오래 걸립니다.
+        """
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self.allow_hardlink = allow_hardlink
+        self.allow_reflink = allow_reflink
+        self.checksum = checksum
+
+    def transfer_file(self, source: str, destination: str) -> TransferredFile:
+        """source를 destination 경로로 전송합니다. destination이 디렉토리면 같은 파일명으로 전송합니다."""
+        if os.path.isdir(destination):
+            destination = os.path.join(destination, os.path.basename(source))
+        size = os.path.getsize(source)
+        if self.allow_hardlink and self._link(source, destination):
+            method = TRANSFER_HARDLINK
+        else:
+            temp_path = self._temp_path(destination)
+            try:
+                method = self._copy(source, temp_path, size)
+                os.replace(temp_path, destination)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+
+        checksum = self._checksum(destination) if self.checksum else None
+        return TransferredFile(source, destination, size, method, checksum)
+
+    def transfer_files(self, pairs: Iterable[Tuple[str, str]]) -> TransferManifest:
+        """(원본, 목적지) 쌍을 스레드 풀에서 동시에 전송하고 manifest를 반환합니다.
+
+        전송 syscall과 체크섬 계산(zlib, hashlib)은 GIL을 해제하므로 스레드로 병렬화됩니다.
+        """
+        started = time.perf_counter()
+        pairs = list(pairs)
+        for directory in {os.path.dirname(destination) for _, destination in pairs}:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        if self.max_workers <= 1:
+            files = [self.transfer_file(source, destination) for source, destination in pairs]
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                files = list(executor.map(lambda pair: self.transfer_file(*pair), pairs))
+
+        return TransferManifest(files, self.checksum, time.perf_counter() - started)
+
+    def transfer_dir(self, source_dir: str, dest_dir: str, pattern: str = "*") -> TransferManifest:
+        """source_dir에서 pattern에 맞는 파일(하위 디렉토리 제외)을 dest_dir로 전송합니다."""
+        os.makedirs(dest_dir, exist_ok=True)
+        sources = sorted(path for path in glob(os.path.join(source_dir, pattern)) if os.path.isfile(path))
+        return self.transfer_files((path, os.path.join(dest_dir, os.path.basename(path))) for path in sources)
+
+    @staticmethod
+    def _temp_path(destination: str) -> str:
+        directory, name = os.path.split(destination)
+        return os.path.join(directory or ".", f".{name}.{uuid.uuid4().hex[:8]}.tmp")
+
+    def _link(self, source: str, destination: str) -> bool:
+        """destination에 hardlink를 만듭니다. 파일시스템이 다르거나 지원하지 않으면 False입니다."""
+        try:
+            try:
+                os.link(source, destination)
+            except FileExistsError:
+                # 이미 있으면 임시 링크를 만든 뒤 교체
+                temp_path = self._temp_path(destination)
+                os.link(source, temp_path)
+                os.replace(temp_path, destination)
+            return True
+        except OSError as e:
+            if e.errno not in FALLBACK_ERRNOS:
+                raise
+            return False
+
+    def _copy(self, source: str, destination: str, size: int) -> str:
+        with open(source, "rb") as src, open(destination, "wb") as dst:
+            method = self._copy_in_kernel(src.fileno(), dst.fileno(), size)
+            if method is None:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+                method = TRANSFER_BUFFERED
+        shutil.copymode(source, destination)
+        return method
+
+    def _copy_in_kernel(self, src_fd: int, dst_fd: int, size: int) -> Optional[str]:
+        """reflink, copy_file_range, sendfile 순으로 시도합니다. 모두 지원하지 않으면 None입니다."""
+        if self.allow_reflink:
+            try:
+                fcntl.ioctl(dst_fd, FICLONE, src_fd)
+                return TRANSFER_REFLINK
+            except OSError as e:
+                if e.errno not in FALLBACK_ERRNOS:
+                    raise
+
+        for method, copy_chunk in (
+            (TRANSFER_COPY_FILE_RANGE, getattr(os, "copy_file_range", None)),
+            (TRANSFER_SENDFILE, self._sendfile_chunk),
+        ):
+            if copy_chunk is None:
+                continue
+            try:
+                copied = 0
+                while copied < size:
+                    sent = copy_chunk(src_fd, dst_fd, size - copied)
+                    if sent == 0:
+                        break
+                    copied += sent
+                return method
+            except OSError as e:
+                if e.errno not in FALLBACK_ERRNOS:
+                    raise
+                # 일부만 복사된 상태일 수 있으므로 처음부터 다시
+                os.lseek(src_fd, 0, os.SEEK_SET)
+                os.lseek(dst_fd, 0, os.SEEK_SET)
+                os.ftruncate(dst_fd, 0)
+        return None
+
+    @staticmethod
+    def _sendfile_chunk(src_fd: int, dst_fd: int, count: int) -> int:
+        return os.sendfile(dst_fd, src_fd, None, count)
+
+    def _checksum(self, path: str) -> str:
+        with open(path, "rb") as f:
+            chunks = iter(lambda: f.read(1024 * 1024), b"")
+            if self.checksum == "crc32":
+                crc = 0
+                for chunk in chunks:
+                    crc = zlib.crc32(chunk, crc)
+                return f"{crc:08x}"
+            hasher = hashlib.new(self.checksum)
+            for chunk in chunks:
+                hasher.update(chunk)
+            return hasher.hexdigest()
@@ -0,0 +1,376 @@
+"""
+디코딩한 프레임을 공유 캐시 디렉토리의 ``.npy`` memmap에 저장해 같은 비디오를 다시 읽을 때 디코딩을 생략합니다.
+
+파일 구조 (target_size=640, letterbox 패딩인 경우)::
+
+    {cache_dir}/{dev}-{inode}-640-pad.npy      # (capacity, H, W, 3) uint8, 채운 프레임만 디스크를 차지
+    {cache_dir}/{dev}-{inode}-640-pad.filled   # 프레임별 저장 여부 (uint8 x capacity)
+    {cache_dir}/{dev}-{inode}-640-pad.json     # shape, fps, scale/letterbox, 원본 크기·mtime·해시
+    {cache_dir}/.lock
+
+캐시는 파일 inode로 찾으므로 공유 비디오 캐시에서 하드링크한 같은 비디오는 태스크가 달라도 같은 캐시를
+씁니다. 전체 비디오를 미리 디코딩하지 않고, 디코더가 요청받아 디코딩한 프레임을 그때그때 채웁니다.
+원본 비디오의 크기나 내용(앞뒤 1MiB 해시)이 바뀌면 캐시를 버리고, 디렉토리 전체의 사용량이 max_bytes를
+넘으면 가장 오래 사용하지 않은 캐시부터 지웁니다.
+"""
+import fcntl
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+from glob import glob
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from app.features.video_processor.frame_decoders import FrameDecoder, Letterbox, OpenCVFrameDecoder
+
+CACHE_VERSION = 2
+# 원본 변경 감지에 쓰는 앞뒤 구간 크기
+HASH_CHUNK_BYTES = 1024 * 1024
+# 프레임 수가 실제보다 조금 적게 잡혀도 뒤쪽 프레임을 저장할 수 있도록 둔 여유
+CAPACITY_MARGIN = 1.02
+
+
+def cache_base_path(
+    cache_dir: str, video_path: str, target_size: Optional[int] = None, letterbox: bool = True
+) -> str:
+    """캐시 파일 경로에서 확장자(.npy/.filled/.json)를 뺀 부분"""
+    stat = os.stat(video_path)
+    variant = f"{target_size}-pad" if target_size and letterbox else str(target_size or "full")
+    return os.path.join(cache_dir, f"{stat.st_dev:x}-{stat.st_ino:x}-{variant}")
+
+
+def source_signature(video_path: str, with_hash: bool = True) -> dict:
+    """원본 비디오의 크기, mtime과 앞뒤 HASH_CHUNK_BYTES의 해시"""
+    stat = os.stat(video_path)
+    signature = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if with_hash:
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(str(stat.st_size).encode())
+        with open(video_path, "rb") as f:
+            hasher.update(f.read(HASH_CHUNK_BYTES))
+            if stat.st_size > HASH_CHUNK_BYTES:
+                f.seek(max(HASH_CHUNK_BYTES, stat.st_size - HASH_CHUNK_BYTES))
+                hasher.update(f.read(HASH_CHUNK_BYTES))
+        signature["hash"] = hasher.hexdigest()
+    return signature
+
+
+class FrameCache:
+    """비디오 하나(target_size/letterbox 조합 하나)의 프레임 캐시입니다.
+
+    ``frames``는 memmap이라 범위를 슬라이싱해도 해당 페이지만 읽고, 파일 전체를 메모리에 올리지 않습니다.
+    여러 프로세스가 같은 캐시를 열면 페이지 캐시를 공유하고, 서로 다른 프레임을 동시에 채울 수 있습니다.
+    """
+
+    def __init__(self, base_path: str, header: dict):
+        self.base_path = base_path
+        self.header = header
+        self.capacity: int = header["shape"][0]
+        self.fps: float = header["fps"]
+        self.letterbox: Optional[Letterbox] = Letterbox(**header["letterbox"]) if header.get("letterbox") else None
+        self.frames: np.ndarray = np.load(f"{base_path}.npy", mmap_mode="r+")
+        self.filled: np.ndarray = np.memmap(f"{base_path}.filled", dtype=np.uint8, mode="r+", shape=(self.capacity,))
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.frames.shape
+
+    @property
+    def scale(self) -> float:
+        return self.letterbox.scale if self.letterbox else 1.0
+
+    def has(self, frame_index: int) -> bool:
+        return 0 <= frame_index < self.capacity and bool(self.filled[frame_index])
+
+    def read(self, start: int, stop: int) -> Optional[np.ndarray]:
+        """[start, stop) 프레임을 (N, H, W, 3) 읽기 전용 뷰로 반환합니다. 하나라도 비어 있으면 None입니다."""
+        if start < 0 or stop > self.capacity or not self.filled[start:stop].all():
+            return None
+        view = self.frames[start:stop]
+        view.flags.writeable = False
+        return view
+
+    def write(self, frame_index: int, frame: np.ndarray) -> bool:
+        """프레임을 저장합니다. 범위나 크기가 맞지 않으면 저장하지 않고 False를 반환합니다."""
+        if not 0 <= frame_index < self.capacity or frame.shape != self.frames.shape[1:]:
+            return False
+        self.frames[frame_index] = frame
+        # 데이터를 쓴 뒤 표시해야 다른 프로세스가 덜 쓴 프레임을 읽지 않음
+        self.filled[frame_index] = 1
+        return True
+
+    def iter_frames(self, frame_indices: Iterable[int]) -> Iterator[Tuple[int, np.ndarray]]:
+        """캐시에 있는 인덱스만 오름차순으로 ``(frame_index, 읽기 전용 frame)``를 반환합니다."""
+        for frame_index in sorted(set(frame_indices)):
+            if self.has(frame_index):
+                yield frame_index, self.read(frame_index, frame_index + 1)[0]
+
+    @classmethod
+    def open(
+        cls, cache_dir: str, video_path: str, target_size: Optional[int] = None, letterbox: bool = True
+    ) -> Optional["FrameCache"]:
+        """유효한 캐시가 있으면 열고, 없거나 원본이 바뀌었으면 (캐시를 지우고) None을 반환합니다."""
+        base_path = cache_base_path(cache_dir, video_path, target_size, letterbox)
+        header = cls._load_header(base_path)
+        if header is None:
+            return None
+        if not cls._matches(header["source"], video_path):
+            remove_cache(base_path)
+            return None
+        try:
+            # 마지막 사용 시각 (eviction 순서)
+            os.utime(f"{base_path}.json")
+            return cls(base_path, header)
+        except (OSError, ValueError):
+            # 다른 프로세스가 방금 지운 캐시
+            return None
+
+    @classmethod
+    def create(
+        cls,
+        cache_dir: str,
+        video_path: str,
+        decoder: FrameDecoder,
+        frame_shape: Tuple[int, ...],
+        max_bytes: int,
+        frame_count: Optional[int] = None,
+    ) -> Optional["FrameCache"]:
+        """decoder 설정(target_size/letterbox)으로 디코딩한 frame_shape 프레임을 담을 빈 캐시를 만듭니다.
+
+        npy는 sparse 파일이라 만들 때는 디스크를 거의 쓰지 않습니다. 프레임 수를 알 수 없거나 비디오 전체를
+        채웠을 때 max_bytes를 넘으면 만들지 않고 None을 반환합니다. 다른 프로세스가 먼저 만들었으면 그 캐시를
+        엽니다.
+
+        frame_count는 video parser(ffprobe 패킷 수)의 프레임 수입니다. OpenCV의 CAP_PROP_FRAME_COUNT는
+        VFR이나 edit list가 있는 파일에서 실제보다 적어 뒤쪽 프레임이 캐시에 들어가지 못하므로, 주어지면
+        이 값으로 용량을 잡습니다.
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        width, height, fps, probed_count = _probe(video_path)
+        frame_count = max(frame_count or 0, probed_count)
+        if frame_count <= 0:
+            return None
+        capacity = int(frame_count * CAPACITY_MARGIN) + 8
+        if capacity * int(np.prod(frame_shape)) > max_bytes:
+            return None
+
+        with _locked(cache_dir):
+            cache = cls.open(cache_dir, video_path, decoder.target_size, decoder.letterbox)
+            if cache is not None:
+                return cache
+
+            base_path = cache_base_path(cache_dir, video_path, decoder.target_size, decoder.letterbox)
+            letterbox = decoder.letterbox_for(width, height)
+            np.lib.format.open_memmap(
+                f"{base_path}.npy", mode="w+", dtype=np.uint8, shape=(capacity, *frame_shape)
+            ).flush()
+            with open(f"{base_path}.filled", "wb") as f:
+                f.truncate(capacity)
+            header = {
+                "version": CACHE_VERSION,
+                "shape": [capacity, *frame_shape],
+                "fps": fps,
+                "target_size": decoder.target_size,
+                "letterbox": letterbox.to_dict() if letterbox else None,
+                "decoder": decoder.name,
+                "source": source_signature(video_path),
+                "created_at": time.time(),
+            }
+            # 헤더가 있으면 npy/filled가 준비된 캐시
+            _write_json(f"{base_path}.json", header)
+            return cls(base_path, header)
+
+    @staticmethod
+    def _load_header(base_path: str) -> Optional[dict]:
+        try:
+            with open(f"{base_path}.json") as f:
+                header = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if header.get("version") != CACHE_VERSION:
+            return None
+        return header
+
+    @staticmethod
+    def _matches(cached: dict, video_path: str) -> bool:
+        """크기와 mtime이 같으면 그대로 사용하고, mtime만 다르면(복사, touch) 해시로 내용을 확인합니다."""
+        try:
+            current = source_signature(video_path, with_hash=False)
+        except OSError:
+            return False
+        if current["size"] != cached["size"]:
+            return False
+        if current["mtime_ns"] == cached["mtime_ns"]:
+            return True
+        return source_signature(video_path)["hash"] == cached["hash"]
+
+
+class CachedFrameDecoder(FrameDecoder):
+    """프레임 캐시에 있는 프레임은 memmap에서 바로 읽고, 없는 프레임은 decoder로 디코딩해 캐시에 채우는
+    디코더입니다. 같은 비디오를 다시 추출하거나(키프레임 미리보기 후 정확한 추출, 다른 큐레이션으로 재요청)
+    같은 프레임을 여러 번 읽을 때 두 번째부터 디코딩 비용이 없습니다.
+
+    캐시에서 읽은 프레임은 읽기 전용 뷰입니다. 수정하려면 복사해야 합니다.
+    """
+
+    name = "cached"
+
+    def __init__(
+        self,
+        cache_dir: str,
+        decoder: Optional[FrameDecoder] = None,
+        max_bytes: int = 8 * 1024 ** 3,
+        build: bool = True,
+        seek_threshold: int = 120,
+        target_size: Optional[int] = None,
+        letterbox: bool = True,
+        frame_count: Optional[int] = None,
+    ):
+        """
+        Args:
+            cache_dir: 캐시 디렉토리. 여러 워커/태스크가 공유합니다.
+            decoder: 캐시에 없는 프레임을 디코딩할 디코더 (기본값: OpenCV). target_size/letterbox는 decoder를 따릅니다.
+            max_bytes: 캐시 디렉토리 전체의 디스크 사용량 상한
+            build: False면 캐시를 읽기만 하고 디코딩한 프레임을 채우지 않습니다.
+            frame_count: video parser가 센 비디오의 프레임 수. 캐시 용량을 잡을 때 사용합니다.
+        """
+        decoder = decoder or OpenCVFrameDecoder(
+            seek_threshold=seek_threshold, target_size=target_size, letterbox=letterbox
+        )
+        super().__init__(seek_threshold=decoder.seek_threshold, target_size=decoder.target_size, letterbox=decoder.letterbox)
+        self.cache_dir = cache_dir
+        self.decoder = decoder
+        self.max_bytes = max_bytes
+        self.build = build
+        self.frame_count = frame_count
+
+    def read_only(self) -> "CachedFrameDecoder":
+        """캐시를 채우지 않는 복사본. 구간별 병렬 디코딩 워커에서 사용합니다."""
+        return CachedFrameDecoder(
+            self.cache_dir, self.decoder, self.max_bytes, build=False, frame_count=self.frame_count
+        )
+
+    def iter_frames(
+        self, video_path: str, frame_indices: Iterable[int]
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+        frame_indices = sorted(set(frame_indices))
+        cache = FrameCache.open(self.cache_dir, video_path, self.target_size, self.letterbox)
+        missing = [i for i in frame_indices if cache is None or not cache.has(i)]
+        decoded = iter(self.decoder.iter_frames(video_path, missing) if missing else ())
+        # 캐시를 만들 수 없으면 (용량 초과 등) 다시 시도하지 않음
+        can_create = self.build
+        written = False
+        # decoder가 다음에 반환한 (frame_index, frame). decoder는 missing의 부분열을 오름차순으로 반환함
+        pending = None
+        try:
+            for frame_index in frame_indices:
+                if cache is not None and cache.has(frame_index):
+                    yield frame_index, cache.read(frame_index, frame_index + 1)[0]
+                    continue
+
+                if pending is None:
+                    pending = next(decoded, None)
+                    if pending is None:
+                        return
+                if pending[0] != frame_index:
+                    # decoder가 건너뛴 프레임
+                    continue
+                frame = pending[1]
+                pending = None
+                if cache is None and can_create:
+                    cache = FrameCache.create(
+                        self.cache_dir, video_path, self.decoder, frame.shape, self.max_bytes, self.frame_count
+                    )
+                    can_create = cache is not None
+                if self.build and cache is not None:
+                    written = cache.write(frame_index, frame) or written
+                yield frame_index, frame
+        finally:
+            if hasattr(decoded, "close"):
+                decoded.close()
+            if written:
+                with _locked(self.cache_dir):
+                    evict_caches(self.cache_dir, self.max_bytes, keep=cache.base_path)
+
+
+def remove_cache(base_path: str):
+    for path in (f"{base_path}.json", f"{base_path}.npy", f"{base_path}.filled"):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def cache_disk_usage(base_path: str) -> int:
+    """npy가 실제로 차지하는 디스크 크기 (sparse 파일이라 채운 프레임만큼)"""
+    try:
+        return os.stat(f"{base_path}.npy").st_blocks * 512
+    except OSError:
+        return 0
+
+
+def evict_caches(cache_dir: str, max_bytes: int, keep: Optional[str] = None) -> List[str]:
+    """캐시 디렉토리의 디스크 사용량이 max_bytes 이하가 되도록 가장 오래 사용하지 않은 캐시부터 지웁니다.
+
+    keep 캐시는 지우지 않습니다. 호출하는 쪽에서 캐시 디렉토리를 잠가야 합니다.
+
+    Returns:
+        지운 캐시의 base path 리스트
+    """
+    caches = []
+    for header_path in glob(os.path.join(cache_dir, "*.json")):
+        base_path = header_path[: -len(".json")]
+        try:
+            last_access = os.path.getmtime(header_path)
+        except OSError:
+            continue
+        caches.append((last_access, cache_disk_usage(base_path), base_path))
+
+    total = sum(size for _, size, _ in caches)
+    removed = []
+    for _, size, base_path in sorted(caches):
+        if total <= max_bytes:
+            break
+        if base_path == keep:
+            continue
+        remove_cache(base_path)
+        removed.append(base_path)
+        total -= size
+    return removed
+
+
+def _probe(video_path: str) -> Tuple[int, int, float, int]:
+    """(width, height, fps, frame_count). 컨테이너 메타데이터만 읽습니다."""
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise ValueError(f"Cannot open video file: {video_path}")
+    try:
+        return (
+            int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            float(cap.get(cv2.CAP_PROP_FPS) or 0.0),
+            int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+        )
+    finally:
+        cap.release()
+
+
+def _write_json(path: str, data: dict):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(temp_path, path)
+
+
+@contextmanager
+def _locked(cache_dir: str):
+    with open(os.path.join(cache_dir, ".lock"), "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
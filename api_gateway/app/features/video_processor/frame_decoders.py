@@ -0,0 +1,529 @@
+import abc
+import importlib.util
+import itertools
+import shutil
+from dataclasses import asdict, dataclass
+from fractions import Fraction
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import cv2
+import ffmpeg
+import numpy as np
+
+
+# OpenCV FOURCC와 ffprobe 코덱 이름을 같은 이름으로 맞추기 위한 매핑
+CODEC_ALIASES = {
+    "avc1": "h264",
+    "h264": "h264",
+    "x264": "h264",
+    "hev1": "hevc",
+    "hvc1": "hevc",
+    "hevc": "hevc",
+    "h265": "hevc",
+    "mp4v": "mpeg4",
+    "xvid": "mpeg4",
+    "divx": "mpeg4",
+    "fmp4": "mpeg4",
+    "mpeg4": "mpeg4",
+    "mjpg": "mjpeg",
+    "mjpeg": "mjpeg",
+    "vp80": "vp8",
+    "vp8": "vp8",
+    "vp90": "vp9",
+    "vp9": "vp9",
+    "av01": "av1",
+    "av1": "av1",
+}
+
+
+def normalize_codec(codec: Optional[str]) -> Optional[str]:
+    if not codec:
+        return None
+    return CODEC_ALIASES.get(codec.strip().lower(), codec.strip().lower())
+
+
+def parse_frame_rate(rate: Optional[str]) -> float:
+    """ffprobe의 "30000/1001" 형식 frame rate를 float로 변환합니다. 알 수 없으면 0.0입니다."""
+    try:
+        return float(Fraction(rate or "0/1"))
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+
+
+def group_indices(frame_indices: List[int], seek_threshold: int) -> List[List[int]]:
+    """정렬된 인덱스를 간격이 seek_threshold 이하인 묶음으로 나눕니다. 묶음 사이는 seek합니다."""
+    groups: List[List[int]] = []
+    for frame_index in frame_indices:
+        if groups and frame_index - groups[-1][-1] <= seek_threshold:
+            groups[-1].append(frame_index)
+        else:
+            groups.append([frame_index])
+    return groups
+
+
+def select_ranges(frame_indices: List[int]) -> List[Tuple[int, int]]:
+    """정렬된 인덱스를 연속 구간 ``(첫 인덱스, 마지막 인덱스)`` 목록으로 묶습니다."""
+    ranges: List[Tuple[int, int]] = []
+    for frame_index in frame_indices:
+        if ranges and frame_index == ranges[-1][1] + 1:
+            ranges[-1] = (ranges[-1][0], frame_index)
+        else:
+            ranges.append((frame_index, frame_index))
+    return ranges
+
+
+# 표시 순서 pts가 저장되어 pts로 프레임 인덱스를 계산할 수 있는 컨테이너 (ffprobe format 이름)
+# AVI처럼 dts만 저장하는 컨테이너는 B-프레임이 있으면 pts가 표시 순서와 어긋나므로 seek하지 않고 순차 디코딩
+TIMESTAMP_SEEK_FORMATS = {"mov", "mp4", "matroska", "webm"}
+# select_frame_decoder가 PyAV/ffmpeg를 고르는 컨테이너 (확장자)
+TIMESTAMP_SEEK_CONTAINERS = {"mp4", "m4v", "mov", "mkv", "webm"}
+
+
+def supports_timestamp_seek(format_name: Optional[str]) -> bool:
+    """ffprobe/libav format 이름("mov,mp4,m4a,..." 형식)이 pts 기반 seek를 믿을 수 있는 컨테이너인지"""
+    return bool(set((format_name or "").split(",")) & TIMESTAMP_SEEK_FORMATS)
+
+
+def probe_output_geometry(video_path: str) -> Tuple[int, int, float]:
+    """ffmpeg가 출력할 프레임의 (width, height)와 평균 fps를 반환합니다."""
+    return _output_geometry(ffmpeg.probe(video_path, select_streams="v:0"))
+
+
+def _output_geometry(probe: dict) -> Tuple[int, int, float]:
+    stream = probe["streams"][0]
+    width, height = stream["width"], stream["height"]
+    # ffmpeg는 회전 메타데이터를 적용해 출력하므로 90도 회전이면 가로세로가 바뀜
+    rotation = int(stream.get("tags", {}).get("rotate", 0))
+    for side_data in stream.get("side_data_list", []):
+        rotation = int(side_data.get("rotation", rotation))
+    if rotation % 180:
+        width, height = height, width
+    return width, height, parse_frame_rate(stream.get("avg_frame_rate"))
+
+
+# YOLO letterbox와 같은 패딩 색
+LETTERBOX_COLOR = (114, 114, 114)
+
+
+@dataclass
+class Letterbox:
+    """원본 프레임을 긴 변 기준으로 줄이고 (선택적으로) 정사각형으로 패딩한 변환 정보입니다.
+
+    출력 좌표 (x, y)는 원본 좌표 ((x - pad_left) / scale, (y - pad_top) / scale)에 대응합니다.
+    """
+
+    source_width: int
+    source_height: int
+    width: int  # 패딩을 포함한 출력 크기
+    height: int
+    scale: float
+    pad_left: int
+    pad_top: int
+
+    @classmethod
+    def fit(cls, source_width: int, source_height: int, target_size: int, pad: bool = True) -> "Letterbox":
+        """긴 변을 target_size로 줄입니다. 원본이 더 작으면 키우지 않습니다."""
+        scale = min(1.0, target_size / max(source_width, source_height))
+        resized_width = max(1, int(round(source_width * scale)))
+        resized_height = max(1, int(round(source_height * scale)))
+        if not pad:
+            return cls(source_width, source_height, resized_width, resized_height, scale, 0, 0)
+        return cls(
+            source_width,
+            source_height,
+            target_size,
+            target_size,
+            scale,
+            (target_size - resized_width) // 2,
+            (target_size - resized_height) // 2,
+        )
+
+    @property
+    def resized_size(self) -> Tuple[int, int]:
+        """패딩 전 리사이즈 크기 (width, height)"""
+        return (
+            max(1, int(round(self.source_width * self.scale))),
+            max(1, int(round(self.source_height * self.scale))),
+        )
+
+    def apply(self, frame: np.ndarray) -> np.ndarray:
+        """원본 프레임에 리사이즈와 패딩을 적용합니다."""
+        resized_width, resized_height = self.resized_size
+        if (resized_width, resized_height) != (frame.shape[1], frame.shape[0]):
+            frame = cv2.resize(frame, (resized_width, resized_height), interpolation=cv2.INTER_AREA)
+        return self.pad(frame)
+
+    def pad(self, frame: np.ndarray) -> np.ndarray:
+        """이미 리사이즈된 프레임에 패딩만 적용합니다."""
+        if (frame.shape[1], frame.shape[0]) == (self.width, self.height):
+            return frame
+        resized_width, resized_height = self.resized_size
+        return cv2.copyMakeBorder(
+            frame,
+            self.pad_top,
+            self.height - resized_height - self.pad_top,
+            self.pad_left,
+            self.width - resized_width - self.pad_left,
+            cv2.BORDER_CONSTANT,
+            value=LETTERBOX_COLOR,
+        )
+
+    def to_source(self, points: np.ndarray) -> np.ndarray:
+        """출력 이미지 좌표 (..., 2)를 원본 비디오 좌표로 변환합니다. 라벨을 원본에 맞출 때 사용합니다."""
+        points = np.asarray(points, dtype=np.float64)
+        return (points - (self.pad_left, self.pad_top)) / self.scale
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class FrameDecoder(abc.ABC):
+    """지정한 인덱스의 프레임을 BGR ``np.ndarray``로 디코딩하는 백엔드입니다."""
+
+    name: str = ""
+
+    def __init__(self, seek_threshold: int = 120, target_size: Optional[int] = None, letterbox: bool = True):
+        """
+        Args:
+            seek_threshold: 다음 대상 프레임까지의 간격이 이 값보다 크면 순차 디코딩 대신 seek합니다.
+                seek는 직전 키프레임부터 다시 디코딩하므로 GOP 길이 정도가 적당합니다.
+            target_size: 지정하면 디코딩하면서 긴 변을 이 크기로 줄입니다 (모델 입력 크기).
+            letterbox: target_size와 함께 쓰면 target_size x target_size 정사각형으로 패딩합니다.
+        """
+        self.seek_threshold = seek_threshold
+        self.target_size = target_size
+        self.letterbox = letterbox
+
+    def letterbox_for(self, source_width: int, source_height: int) -> Optional[Letterbox]:
+        """원본 크기에 대한 리사이즈/패딩 정보. target_size가 없으면 None입니다."""
+        if not self.target_size:
+            return None
+        return Letterbox.fit(source_width, source_height, self.target_size, pad=self.letterbox)
+
+    def resize(self, frame: np.ndarray) -> np.ndarray:
+        """디코딩된 원본 프레임에 target_size 리사이즈를 적용합니다."""
+        letterbox = self.letterbox_for(frame.shape[1], frame.shape[0])
+        return letterbox.apply(frame) if letterbox else frame
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return True
+
+    @abc.abstractmethod
+    def iter_frames(
+        self, video_path: str, frame_indices: Iterable[int]
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+        """지정한 인덱스의 프레임만 ``(frame_index, frame)`` 형태로 오름차순으로 하나씩 반환합니다."""
+        pass
+
+
+class OpenCVFrameDecoder(FrameDecoder):
+    """``cv2.VideoCapture`` 기반 디코더. 기본 빌드에서는 디코딩이 단일 스레드입니다."""
+
+    name = "opencv"
+
+    def iter_frames(
+        self, video_path: str, frame_indices: Iterable[int]
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+        """대상이 아닌 프레임은 ``grab``으로 건너뛰어 BGR 변환과 복사를 생략하고,
+        간격이 ``seek_threshold``보다 크면 ``CAP_PROP_POS_FRAMES``로 seek합니다.
+        한 번에 메모리에 올라가는 프레임은 하나뿐입니다. 리사이즈는 읽은 직후 적용합니다.
+        """
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise ValueError(f"Cannot open video file: {video_path}")
+
+        try:
+            # 다음 read()가 반환할 프레임 인덱스
+            position = 0
+            for frame_index in sorted(set(frame_indices)):
+                gap = frame_index - position
+                if gap > self.seek_threshold:
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+                else:
+                    for _ in range(gap):
+                        if not cap.grab():
+                            return
+
+                ret, frame = cap.read()
+                if not ret:
+                    return
+                position = frame_index + 1
+                yield frame_index, self.resize(frame)
+        finally:
+            cap.release()
+
+
+class PyAVFrameDecoder(FrameDecoder):
+    """PyAV(libav) 기반 디코더. ``thread_type='AUTO'``로 프레임/슬라이스 스레드 디코딩을 사용합니다.
+
+    av는 선택 의존성이므로 사용할 때 import합니다: pip install av
+    """
+
+    name = "pyav"
+
+    def __init__(
+        self,
+        seek_threshold: int = 120,
+        target_size: Optional[int] = None,
+        letterbox: bool = True,
+        thread_type: str = "AUTO",
+    ):
+        super().__init__(seek_threshold=seek_threshold, target_size=target_size, letterbox=letterbox)
+        self.thread_type = thread_type
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return importlib.util.find_spec("av") is not None
+
+    def iter_frames(
+        self, video_path: str, frame_indices: Iterable[int]
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+        import av
+
+        try:
+            container = av.open(video_path)
+        except (av.error.FFmpegError, OSError) as e:
+            raise ValueError(f"Cannot open video file: {video_path}") from e
+
+        try:
+            stream = container.streams.video[0]
+            stream.thread_type = self.thread_type
+            rate = stream.average_rate or stream.guessed_rate
+            start_pts = stream.start_time or 0
+            can_seek = bool(rate) and supports_timestamp_seek(container.format.name)
+
+            decoded = self._decode(container, stream)
+            # decoded가 다음에 반환할 프레임의 인덱스
+            position = 0
+            for group in group_indices(sorted(set(frame_indices)), self.seek_threshold):
+                if can_seek and group[0] - position > self.seek_threshold:
+                    decoded, position = self._seek(container, stream, group[0], start_pts, rate)
+
+                for target in group:
+                    frame = None
+                    while position <= target:
+                        frame = next(decoded, None)
+                        if frame is None:
+                            return
+                        position += 1
+                    yield target, self._to_bgr(frame)
+        finally:
+            container.close()
+
+    def _seek(self, container, stream, target: int, start_pts: int, rate) -> Tuple[Iterator, int]:
+        """target 직전 키프레임으로 seek하고 (디코딩 iterator, 첫 프레임 인덱스)를 반환합니다.
+
+        첫 프레임의 인덱스는 pts로 계산합니다. pts가 없거나 대상보다 뒤라서 target 프레임을 찾을 수 없으면
+        다른 프레임을 대상으로 반환하지 않도록 처음으로 돌아가 순차 디코딩합니다.
+        """
+        target_pts = start_pts + int(Fraction(target) / Fraction(rate) / stream.time_base)
+        container.seek(target_pts, stream=stream, backward=True, any_frame=False)
+        decoded = self._decode(container, stream)
+        first = next(decoded, None)
+        if first is not None and first.pts is not None:
+            position = self._index_from_pts(first.pts, start_pts, stream.time_base, rate)
+            if position <= target:
+                return itertools.chain([first], decoded), position
+
+        container.seek(start_pts, stream=stream, backward=True, any_frame=False)
+        return self._decode(container, stream), 0
+
+    def _to_bgr(self, frame) -> np.ndarray:
+        """BGR 변환과 리사이즈를 swscale에서 한 번에 처리하고, 회전 메타데이터를 적용합니다.
+
+        OpenCV/ffmpeg와 같은 방향으로 출력하도록 display matrix의 회전(반시계 방향)만큼 돌립니다.
+        90도 회전이면 리사이즈는 돌리기 전 방향의 크기로 합니다.
+        """
+        turns = self._rotation(frame) // 90 % 4
+        width, height = (frame.height, frame.width) if turns % 2 else (frame.width, frame.height)
+        letterbox = self.letterbox_for(width, height)
+        if letterbox is None:
+            return self._rotate(frame.to_ndarray(format="bgr24"), turns)
+        width, height = letterbox.resized_size
+        if turns % 2:
+            width, height = height, width
+        image = frame.to_ndarray(format="bgr24", width=width, height=height, interpolation="AREA")
+        return letterbox.pad(self._rotate(image, turns))
+
+    @staticmethod
+    def _rotation(frame) -> int:
+        # display matrix의 반시계 방향 회전 각도 (90도 단위로 맞춤)
+        return int(round((getattr(frame, "rotation", 0) or 0) / 90)) * 90
+
+    @staticmethod
+    def _rotate(image: np.ndarray, turns: int) -> np.ndarray:
+        return np.ascontiguousarray(np.rot90(image, turns)) if turns else image
+
+    @staticmethod
+    def _decode(container, stream):
+        return iter(container.decode(stream))
+
+    @staticmethod
+    def _index_from_pts(pts, start_pts, time_base, rate) -> int:
+        if pts is None:
+            return 0
+        return int(round((pts - start_pts) * time_base * rate))
+
+
+class FFmpegPipeFrameDecoder(FrameDecoder):
+    """ffmpeg 서브프로세스 디코더. 인덱스 묶음마다 ``-ss``로 seek한 뒤 select 필터로 고른 프레임을
+    rawvideo(bgr24)로 stdout에 받습니다. 대상 프레임이 촘촘한 묶음은 select 없이 전체를 받아 Python에서 고릅니다.
+    디코딩은 ffmpeg의 스레드를 그대로 사용합니다.
+    """
+
+    name = "ffmpeg"
+    # ffmpeg 프로세스 하나의 select 식에 넣을 최대 구간 수. 식은 프레임마다 평가되고 argv 길이 제한도 있음
+    max_select_ranges = 64
+    # 묶음 구간에서 대상 프레임 비율이 이 값 이상이면 select 없이 구간 전체를 받아 Python에서 고름
+    dense_ratio = 0.5
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return shutil.which("ffmpeg") is not None
+
+    def iter_frames(
+        self, video_path: str, frame_indices: Iterable[int]
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+        try:
+            probe = ffmpeg.probe(video_path, select_streams="v:0")
+        except ffmpeg.Error as e:
+            raise ValueError(f"Cannot open video file: {video_path}") from e
+        width, height, fps = _output_geometry(probe)
+        frame_indices = sorted(set(frame_indices))
+        # -ss는 pts 기준이라 pts를 믿을 수 없는 컨테이너에서는 seek하지 않고 처음부터 select로 고름
+        can_seek = supports_timestamp_seek(probe["format"].get("format_name"))
+        groups = group_indices(frame_indices, self.seek_threshold) if can_seek else [frame_indices]
+        letterbox = self.letterbox_for(width, height)
+        if letterbox is not None:
+            width, height = letterbox.width, letterbox.height
+
+        for group in groups:
+            for indices, ranges in self._split_group(group, can_seek):
+                yield from self._decode_part(
+                    video_path, indices, ranges, fps if can_seek else 0.0, letterbox, width, height
+                )
+
+    def _split_group(
+        self, group: List[int], can_seek: bool
+    ) -> List[Tuple[List[int], Optional[List[Tuple[int, int]]]]]:
+        """묶음을 ffmpeg 프로세스 단위 ``(인덱스, select 구간)``으로 나눕니다. 구간이 None이면 전체를 받습니다.
+
+        구간이 max_select_ranges개를 넘으면 프로세스를 나눠 seek하고, seek할 수 없으면 전체를 받습니다.
+        """
+        if not group:
+            return []
+        ranges = select_ranges(group)
+        dense = len(group) >= self.dense_ratio * (group[-1] - group[0] + 1)
+        if dense or (not can_seek and len(ranges) > self.max_select_ranges):
+            return [(group, None)]
+        parts = []
+        for i in range(0, len(ranges), self.max_select_ranges):
+            chunk = ranges[i:i + self.max_select_ranges]
+            parts.append(([index for first, last in chunk for index in range(first, last + 1)], chunk))
+        return parts
+
+    def _decode_part(
+        self,
+        video_path: str,
+        indices: List[int],
+        ranges: Optional[List[Tuple[int, int]]],
+        fps: float,
+        letterbox: Optional[Letterbox],
+        width: int,
+        height: int,
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+        """fps가 0이면 seek하지 않고 처음부터 디코딩합니다."""
+        start = indices[0]
+        input_options = {}
+        if start > 0 and fps:
+            # 직전 프레임과 대상 프레임 사이 시각으로 seek하면 첫 출력 프레임이 start가 됨
+            input_options["ss"] = (start - 0.5) / fps
+        else:
+            start = 0
+        output_options = {}
+
+        selected = ffmpeg.input(video_path, **input_options).video
+        if ranges is None:
+            # 대상이 촘촘하면 구간 전체를 받고 대상이 아닌 프레임은 버림
+            output_options["frames:v"] = indices[-1] - start + 1
+        else:
+            select_expr = "+".join(f"between(n,{first - start},{last - start})" for first, last in ranges)
+            selected = selected.filter("select", select_expr)
+        if letterbox is not None:
+                # 선택된 프레임만 ffmpeg 안에서 리사이즈/패딩
+                resized_width, resized_height = letterbox.resized_size
+                selected = selected.filter("scale", resized_width, resized_height, flags="area").filter(
+                    "pad", letterbox.width, letterbox.height, letterbox.pad_left, letterbox.pad_top,
+                    color="0x{:02x}{:02x}{:02x}".format(*LETTERBOX_COLOR),
+                )
+        process = (
+            selected
+            .output("pipe:", format="rawvideo", pix_fmt="bgr24", fps_mode="vfr", **output_options)
+            .global_args("-nostdin", "-loglevel", "error")
+            .run_async(pipe_stdout=True)
+        )
+        frame_size = width * height * 3
+        # select를 쓰면 대상 프레임만, 아니면 start부터 모든 프레임이 출력됨
+        outputs = indices if ranges is not None else range(start, indices[-1] + 1)
+        wanted = set(indices)
+        try:
+            for frame_index in outputs:
+                data = process.stdout.read(frame_size)
+                if len(data) < frame_size:
+                    return
+                if frame_index in wanted:
+                    yield frame_index, np.frombuffer(data, np.uint8).reshape(height, width, 3)
+        finally:
+            process.stdout.close()
+            process.kill()
+            process.wait()
+
+
+FRAME_DECODERS = {
+    decoder.name: decoder for decoder in (OpenCVFrameDecoder, PyAVFrameDecoder, FFmpegPipeFrameDecoder)
+}
+
+
+def select_frame_decoder(
+    codec: Optional[str] = None, container: Optional[str] = None, seek_threshold: int = 120, **options
+) -> FrameDecoder:
+    """코덱과 컨테이너로 디코더를 고릅니다.
+
+    - H.264/HEVC/VP9/AV1처럼 디코딩이 무거운 코덱은 스레드 디코딩이 되는 PyAV를 우선 사용
+    - mkv/webm은 OpenCV의 프레임 수와 seek가 부정확하므로 PyAV, 없으면 ffmpeg를 사용
+    - MPEG-4 Part 2, MJPEG처럼 가벼운 코덱이나 대안이 없으면 OpenCV를 사용
+    - mp4/mov/mkv/webm이 아닌 컨테이너(AVI 등)는 pts로 seek 위치를 맞출 수 없으므로 항상 OpenCV를 사용
+    """
+    codec = normalize_codec(codec)
+    container = (container or "").lower().lstrip(".")
+    if container not in TIMESTAMP_SEEK_CONTAINERS:
+        return OpenCVFrameDecoder(seek_threshold=seek_threshold, **options)
+
+    preferred: List[type] = []
+    if codec in ("h264", "hevc", "vp9", "av1"):
+        preferred = [PyAVFrameDecoder, FFmpegPipeFrameDecoder]
+    if container in ("mkv", "webm"):
+        preferred = [PyAVFrameDecoder, FFmpegPipeFrameDecoder]
+    for decoder_cls in preferred:
+        if decoder_cls.is_available():
+            return decoder_cls(seek_threshold=seek_threshold, **options)
+    return OpenCVFrameDecoder(seek_threshold=seek_threshold, **options)
+
+
+def build_frame_decoder(
+    name: str = "auto",
+    codec: Optional[str] = None,
+    container: Optional[str] = None,
+    seek_threshold: int = 120,
+    **options,
+) -> FrameDecoder:
+    """이름으로 디코더를 생성합니다. ``auto``면 ``select_frame_decoder``로 고릅니다.
+
+    options는 디코더 생성자로 전달됩니다 (예: target_size, letterbox).
+    """
+    if name == "auto":
+        return select_frame_decoder(codec, container, seek_threshold=seek_threshold, **options)
+    if name not in FRAME_DECODERS:
+        raise ValueError(f"지원하지 않는 디코더입니다: {name} (지원: auto, {', '.join(FRAME_DECODERS)})")
+    return FRAME_DECODERS[name](seek_threshold=seek_threshold, **options)
@@ -0,0 +1,67 @@
+from typing import List, Optional, Tuple
+
+import ffmpeg
+import numpy as np
+
+from app.features.video_processor.frame_decoders import probe_output_geometry
+from app.features.video_processor.video_parser import FFprobeVideoParser
+from app.features.video_processor.videoframe_handler import NaiveVideoFrameCurator, VideoFrameHandler
+
+
+class KeyframeExtractor:
+    """키프레임(I-frame)만 디코딩해 미리보기용 프레임을 빠르게 뽑습니다.
+
+    ffmpeg ``-skip_frame nokey``로 키프레임 외의 프레임은 디코딩하지 않으므로 정확한 인덱스가
+    필요 없는 글로벌 모델 미리보기나 썸네일에 적합합니다. 키프레임이 요청 수보다 적으면
+    균등 간격 인덱스로 가장 가까운 프레임을 seek해 디코딩합니다.
+    """
+
+    def __init__(self, handler: Optional[VideoFrameHandler] = None):
+        """
+        Args:
+            handler: 키프레임이 부족할 때 seek 디코딩에 사용할 핸들러
+        """
+        self.handler = handler or VideoFrameHandler()
+
+    def extract(
+        self, video_path: str, num_frames: int, video_info: Optional[dict] = None
+    ) -> Tuple[List[int], List[np.ndarray], bool]:
+        """
+        Args:
+            video_info: ``FFprobeVideoParser`` 결과. keyframes가 없으면 새로 probe합니다.
+
+        Returns:
+            (각 프레임의 실제 프레임 인덱스, 프레임 리스트, 키프레임만 사용했는지 여부)
+        """
+        if not video_info or video_info.get("keyframes") is None:
+            video_info = FFprobeVideoParser(read_packets=True).extract_info(video_path)
+        keyframes = video_info["keyframes"]
+
+        if len(keyframes) < num_frames:
+            frame_indices = NaiveVideoFrameCurator(num_frames).select_indices(video_info["frame_count"])
+            decoded = list(self.handler.iter_frames(video_path, frame_indices))
+            return [frame_index for frame_index, _ in decoded], [frame for _, frame in decoded], False
+
+        ordinals = NaiveVideoFrameCurator(num_frames).select_indices(len(keyframes))
+        frames = [self.handler.decoder.resize(frame) for frame in self.decode_keyframes(video_path, ordinals)]
+        return [keyframes[ordinal] for ordinal in ordinals[:len(frames)]], frames, True
+
+    @staticmethod
+    def decode_keyframes(video_path: str, ordinals: List[int]) -> List[np.ndarray]:
+        """``ordinals``번째 키프레임들을 디코딩합니다. skip_frame nokey에서 select의 n은 키프레임 순번입니다."""
+        width, height, _ = probe_output_geometry(video_path)
+        frame_size = width * height * 3
+        select_expr = "+".join(f"eq(n,{ordinal})" for ordinal in ordinals)
+
+        out, _ = (
+            ffmpeg.input(video_path, skip_frame="nokey")
+            .video.filter("select", select_expr)
+            .output("pipe:", format="rawvideo", pix_fmt="bgr24", fps_mode="vfr")
+            .global_args("-nostdin", "-loglevel", "error")
+            .run(capture_stdout=True, capture_stderr=True)
+        )
+        num_frames = len(out) // frame_size
+        return [
+            np.frombuffer(out, np.uint8, count=frame_size, offset=i * frame_size).reshape(height, width, 3)
+            for i in range(num_frames)
+        ]
@@ -0,0 +1,259 @@
+import json
+import math
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from glob import glob
+from typing import Dict, Optional
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+
+from app.features.video_processor.file_transfer import TransferManifest, TransferredFile
+from app.features.video_processor.video_uploader import BaseUploader
+
+# 업로드 방식
+UPLOAD_PUT_OBJECT = "put_object"
+UPLOAD_MULTIPART = "multipart"
+
+# S3 multipart 제약: 마지막 파트를 제외한 파트 최소 크기, 최대 파트 수
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
+S3_MAX_PARTS = 10000
+
+# 일시적인 오류로 보고 같은 파트를 다시 보내는 에러 코드 (5xx는 코드와 관계없이 재시도)
+RETRYABLE_ERROR_CODES = {
+    "RequestTimeout",
+    "RequestTimeTooSkewed",
+    "SlowDown",
+    "Throttling",
+    "ThrottlingException",
+    "InternalError",
+    "ServiceUnavailable",
+}
+
+
+class S3Uploader(BaseUploader):
+    """S3 호환 저장소(AWS S3, MinIO 등)에 업로드합니다. ``LocalUploader``와 같은 인터페이스이며
+    dest_dir은 버킷 안의 key prefix이고, 반환값은 ``s3://bucket/key`` 형식입니다.
+
+    multipart_threshold 이상인 파일은 multipart로 여러 파트를 동시에 올리고, 파트마다 재시도합니다.
+    진행 상황은 원본 옆의 상태 파일(.{파일명}.s3upload.json)에 기록하므로 워커가 중간에 죽거나
+    재시도 횟수를 넘겨 실패해도 같은 파일을 다시 업로드하면 이미 올라간 파트는 건너뜁니다.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        client=None,
+        endpoint_url: Optional[str] = None,
+        max_concurrency: int = 8,
+        multipart_threshold: int = 64 * 1024 * 1024,
+        min_part_size: int = 8 * 1024 * 1024,
+        max_part_size: int = 64 * 1024 * 1024,
+        max_attempts: int = 5,
+        backoff_sec: float = 0.5,
+        state_dir: Optional[str] = None,
+    ):
+        """
+        Args:
+            prefix: 모든 key 앞에 붙일 prefix
+            client: boto3 S3 client. 없으면 endpoint_url(MinIO 등)과 AWS_* 환경 변수로 만듭니다.
+            max_concurrency: 동시에 올리는 파트(프레임 업로드에서는 파일) 수
+            multipart_threshold: 이 크기 이상이면 multipart 업로드
+            min_part_size, max_part_size: 파트 크기 범위. 메모리에는 최대 max_concurrency개 파트가 올라갑니다.
+            max_attempts: 파트별 최대 시도 횟수
+            backoff_sec: 재시도 대기 시간의 기준값 (시도마다 2배, jitter 포함)
+            state_dir: 재개용 상태 파일 위치 (기본값: 원본 파일과 같은 디렉토리)
+        """
+        if client is None:
+            client = boto3.client(
+                "s3",
+                endpoint_url=endpoint_url,
+                config=Config(max_pool_connections=max_concurrency, retries={"mode": "standard"}),
+            )
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self.multipart_threshold = max(multipart_threshold, S3_MIN_PART_SIZE)
+        self.min_part_size = max(min_part_size, S3_MIN_PART_SIZE)
+        self.max_part_size = max(max_part_size, self.min_part_size)
+        self.max_attempts = max_attempts
+        self.backoff_sec = backoff_sec
+        self.state_dir = state_dir
+        # 마지막 upload_frames 결과 (checksum에는 ETag를 기록)
+        self.last_manifest: Optional[TransferManifest] = None
+
+    def upload_video(self, file_path: str, dest_dir: str) -> str:
+        return self.upload_file(file_path, self._key(dest_dir, os.path.basename(file_path))).destination
+
+    def upload_frames(self, frames_dir: str, dest_dir: str, manifest_path: Optional[str] = None) -> str:
+        """frames_dir의 파일을 max_concurrency개씩 동시에 올립니다. manifest_path를 주면 업로드 manifest를 저장합니다."""
+        started = time.perf_counter()
+        sources = sorted(path for path in glob(os.path.join(frames_dir, "*")) if os.path.isfile(path))
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            files = list(executor.map(
+                lambda path: self.upload_file(path, self._key(dest_dir, os.path.basename(path))), sources
+            ))
+        self.last_manifest = TransferManifest(files, "etag", time.perf_counter() - started)
+        if manifest_path:
+            self.last_manifest.save(manifest_path)
+        return self._uri(self._key(dest_dir))
+
+    def upload_file(self, file_path: str, key: str) -> TransferredFile:
+        """한 파일을 key로 업로드합니다. 크기에 따라 put_object 또는 multipart를 사용합니다."""
+        size = os.path.getsize(file_path)
+        if size < self.multipart_threshold:
+            with open(file_path, "rb") as f:
+                body = f.read()
+            response = self._with_retry(lambda: self.client.put_object(Bucket=self.bucket, Key=key, Body=body))
+            return TransferredFile(file_path, self._uri(key), size, UPLOAD_PUT_OBJECT, response["ETag"].strip('"'))
+
+        etag = self._upload_multipart(file_path, key, size)
+        return TransferredFile(file_path, self._uri(key), size, UPLOAD_MULTIPART, etag)
+
+    def part_size(self, size: int) -> int:
+        """파일 크기에 맞춰 파트 크기를 고릅니다.
+
+        동시 업로드 수의 4배 정도로 나눠 연결을 모두 쓰되 [min_part_size, max_part_size] 범위로 제한하고,
+        아주 큰 파일은 파트 수가 S3 한도(10,000)를 넘지 않도록 키웁니다. 1MiB 단위로 올림합니다.
+        """
+        part_size = min(max(math.ceil(size / (self.max_concurrency * 4)), self.min_part_size), self.max_part_size)
+        part_size = max(part_size, math.ceil(size / S3_MAX_PARTS))
+        return math.ceil(part_size / (1024 * 1024)) * 1024 * 1024
+
+    def state_path(self, file_path: str) -> str:
+        directory = self.state_dir or os.path.dirname(os.path.abspath(file_path))
+        return os.path.join(directory, f".{os.path.basename(file_path)}.s3upload.json")
+
+    def _upload_multipart(self, file_path: str, key: str, size: int) -> str:
+        state_path = self.state_path(file_path)
+        state = self._resume_state(state_path, file_path, key, size)
+        if state is None:
+            upload_id = self.client.create_multipart_upload(Bucket=self.bucket, Key=key)["UploadId"]
+            state = {
+                "bucket": self.bucket,
+                "key": key,
+                "upload_id": upload_id,
+                "size": size,
+                "mtime_ns": os.stat(file_path).st_mtime_ns,
+                "part_size": self.part_size(size),
+                "parts": {},
+            }
+            self._save_state(state_path, state)
+
+        part_size = state["part_size"]
+        num_parts = math.ceil(size / part_size)
+        pending = [n for n in range(1, num_parts + 1) if str(n) not in state["parts"]]
+        lock = threading.Lock()
+
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            def upload_part(part_number: int):
+                offset = (part_number - 1) * part_size
+                body = os.pread(fd, min(part_size, size - offset), offset)
+                response = self._with_retry(lambda: self.client.upload_part(
+                    Bucket=self.bucket, Key=key, UploadId=state["upload_id"], PartNumber=part_number, Body=body,
+                ))
+                with lock:
+                    state["parts"][str(part_number)] = response["ETag"]
+                    self._save_state(state_path, state)
+
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+                # 실패한 파트가 있어도 나머지 파트는 끝까지 올려 상태 파일에 남김
+                futures = [executor.submit(upload_part, n) for n in pending]
+            errors = [error for error in (future.exception() for future in futures) if error is not None]
+            if errors:
+                raise errors[0]
+        finally:
+            os.close(fd)
+
+        parts = [{"PartNumber": int(n), "ETag": etag} for n, etag in sorted(state["parts"].items(), key=lambda p: int(p[0]))]
+        response = self._with_retry(lambda: self.client.complete_multipart_upload(
+            Bucket=self.bucket, Key=key, UploadId=state["upload_id"], MultipartUpload={"Parts": parts},
+        ))
+        os.remove(state_path)
+        return response["ETag"].strip('"')
+
+    def _resume_state(self, state_path: str, file_path: str, key: str, size: int) -> Optional[dict]:
+        """같은 파일, 같은 key의 업로드 상태가 있으면 서버에 남아 있는 파트 기준으로 갱신해 반환합니다."""
+        if not os.path.exists(state_path):
+            return None
+        try:
+            with open(state_path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (state.get("bucket"), state.get("key"), state.get("size"), state.get("mtime_ns")) != (
+            self.bucket, key, size, os.stat(file_path).st_mtime_ns
+        ):
+            # 원본이 바뀌었거나 다른 곳으로 올리는 중이던 상태는 버림
+            self._abort(state)
+            return None
+
+        try:
+            uploaded = self._list_parts(state["key"], state["upload_id"])
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "NoSuchUpload":
+                return None
+            raise
+        # 크기가 맞는 파트만 완료로 봄 (마지막 파트는 더 작음)
+        part_size = state["part_size"]
+        state["parts"] = {
+            str(n): etag for n, (etag, part_bytes) in uploaded.items()
+            if part_bytes == min(part_size, size - (n - 1) * part_size)
+        }
+        return state
+
+    def _list_parts(self, key: str, upload_id: str) -> Dict[int, tuple]:
+        parts = {}
+        kwargs = {"Bucket": self.bucket, "Key": key, "UploadId": upload_id}
+        while True:
+            response = self.client.list_parts(**kwargs)
+            for part in response.get("Parts", []):
+                parts[part["PartNumber"]] = (part["ETag"], part["Size"])
+            if not response.get("IsTruncated"):
+                return parts
+            kwargs["PartNumberMarker"] = response["NextPartNumberMarker"]
+
+    def _abort(self, state: dict):
+        try:
+            self.client.abort_multipart_upload(Bucket=state["bucket"], Key=state["key"], UploadId=state["upload_id"])
+        except (BotoCoreError, ClientError, KeyError):
+            pass
+
+    @staticmethod
+    def _save_state(state_path: str, state: dict):
+        temp_path = f"{state_path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(temp_path, state_path)
+
+    def _with_retry(self, request):
+        """일시적인 오류면 지수 백오프(jitter 포함)로 max_attempts번까지 다시 시도합니다."""
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                return request()
+            except (BotoCoreError, ClientError) as e:
+                if attempt == self.max_attempts or not self._is_retryable(e):
+                    raise
+                time.sleep(self.backoff_sec * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        if not isinstance(error, ClientError):
+            # 연결 끊김, 타임아웃 등
+            return True
+        code = error.response.get("Error", {}).get("Code", "")
+        status = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0)
+        return code in RETRYABLE_ERROR_CODES or status >= 500
+
+    def _key(self, *parts: str) -> str:
+        return "/".join(part.strip("/") for part in (self.prefix, *parts) if part and part.strip("/"))
+
+    def _uri(self, key: str) -> str:
+        return f"s3://{self.bucket}/{key}"
@@ -0,0 +1,206 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import ffmpeg
+import numpy as np
+
+from app.features.video_processor.frame_cache import CachedFrameDecoder
+from app.features.video_processor.frame_decoders import FrameDecoder, group_indices, probe_output_geometry
+from app.features.video_processor.videoframe_handler import VideoFrameHandler
+
+
+def split_segments(frame_indices: List[int], num_segments: int, min_frames_per_segment: int = 1) -> List[List[int]]:
+    """정렬된 프레임 인덱스를 타임라인 기준으로 num_segments개의 연속 구간으로 나눕니다.
+
+    구간 폭이 같으므로 전체 프레임을 디코딩할 때 프로세스별 디코딩량이 비슷해집니다.
+    구간당 프레임 수가 min_frames_per_segment보다 적어지지 않도록 구간 수를 줄이고,
+    빈 구간은 제외합니다.
+    """
+    if not frame_indices:
+        return []
+
+    num_segments = max(1, min(num_segments, len(frame_indices) // max(1, min_frames_per_segment)))
+    boundaries = np.linspace(frame_indices[0], frame_indices[-1] + 1, num_segments + 1)
+    cuts = np.searchsorted(frame_indices, boundaries[1:-1], side="left")
+
+    segments = []
+    start = 0
+    for cut in list(cuts) + [len(frame_indices)]:
+        if cut > start:
+            segments.append(frame_indices[start:cut])
+        start = cut
+    return segments
+
+
+def estimate_decoded_frames(frame_indices: List[int], seek_threshold: int) -> int:
+    """정렬된 인덱스를 읽을 때 실제로 디코딩하는 프레임 수를 추정합니다.
+
+    묶음 안은 순차 디코딩하고, seek 한 번은 직전 키프레임부터 다시 디코딩하므로 평균 seek_threshold / 2
+    프레임으로 계산합니다. 몇 프레임만 뽑더라도 비디오가 길면 seek 비용이 커서 분할할 가치가 있습니다.
+    """
+    groups = group_indices(frame_indices, seek_threshold)
+    return sum(group[-1] - group[0] + 1 for group in groups) + len(groups) * seek_threshold // 2
+
+
+def _decode_segment(
+    video_path: str, frame_indices: List[int], decoder: FrameDecoder, spill_dir: Optional[str]
+) -> Tuple[List[int], Optional[str]]:
+    """워커 프로세스에서 한 구간을 디코딩해 임시 .npy 파일에 씁니다.
+
+    프레임을 pickle로 부모 프로세스에 보내지 않고 파일에 바로 쓰므로 워커와 부모 모두 메모리에는
+    프레임 하나만 올라갑니다.
+
+    Returns:
+        (디코딩된 프레임 인덱스 리스트, 임시 파일 경로). 디코딩된 프레임이 없으면 경로는 None입니다.
+    """
+    decoded: List[int] = []
+    frames = None
+    path = None
+    try:
+        for frame_index, frame in decoder.iter_frames(video_path, frame_indices):
+            if frames is None:
+                fd, path = tempfile.mkstemp(prefix="segment-", suffix=".npy", dir=spill_dir)
+                os.close(fd)
+                frames = np.lib.format.open_memmap(
+                    path, mode="w+", dtype=frame.dtype, shape=(len(frame_indices), *frame.shape)
+                )
+            frames[len(decoded)] = frame
+            decoded.append(frame_index)
+        if frames is not None:
+            frames.flush()
+    except BaseException:
+        if path:
+            os.remove(path)
+        raise
+    return decoded, path
+
+
+def _read_segment(decoded: List[int], path: Optional[str]) -> Iterator[Tuple[int, np.ndarray]]:
+    """``_decode_segment``가 쓴 파일을 memmap으로 읽어 프레임을 하나씩 반환하고, 다 읽으면 지웁니다."""
+    if path is None:
+        return
+    try:
+        frames = np.load(path, mmap_mode="r")
+        for position, frame_index in enumerate(decoded):
+            # 순차 디코딩과 같은 쓰기 가능한 배열을 반환
+            yield frame_index, np.array(frames[position])
+    finally:
+        os.remove(path)
+
+
+class SegmentedVideoFrameHandler(VideoFrameHandler):
+    """긴 비디오를 여러 구간으로 나눠 프로세스별로 디코딩하는 VideoFrameHandler입니다.
+
+    각 프로세스는 자신의 디코더로 구간 시작점에 seek한 뒤 구간만 디코딩해 임시 파일(spill_dir)에 쓰고,
+    부모 프로세스는 구간 순서대로 파일을 읽어 프레임을 하나씩 반환한 뒤 지웁니다. 메모리에는 프레임
+    하나만 올라갑니다. 구간은 부모가 읽는 속도에 맞춰 (프로세스 수 + 1)개까지만 미리 디코딩하고,
+    구간 크기는 디스크에 쌓이는 양이 max_spill_bytes를 넘지 않도록 나눕니다. 구간이 하나뿐이거나
+    spill_dir의 여유 공간이 부족하면 현재 프로세스에서 디코딩합니다.
+    """
+
+    def __init__(
+        self,
+        num_processes: Optional[int] = None,
+        seek_threshold: int = 120,
+        min_frames_per_segment: int = 256,
+        decoder: Optional[FrameDecoder] = None,
+        spill_dir: Optional[str] = None,
+        retain_max_bytes: int = 0,
+        max_spill_bytes: int = 1024 ** 3,
+    ):
+        """
+        Args:
+            num_processes: 디코딩 프로세스 수 (기본값: CPU 코어 수)
+            seek_threshold: ``VideoFrameHandler`` 참고
+            min_frames_per_segment: 구간당 최소 디코딩 프레임 수 (``estimate_decoded_frames`` 기준,
+                seek 비용 포함). 디코딩량이 적으면 프로세스 생성 비용이 더 크므로 분할하지 않습니다.
+            decoder: ``VideoFrameHandler`` 참고. 각 워커 프로세스로 복사되어 사용됩니다.
+            spill_dir: 구간별 디코딩 결과를 쓸 임시 디렉토리 (기본값: 시스템 임시 디렉토리)
+            retain_max_bytes: ``VideoFrameHandler`` 참고
+            max_spill_bytes: 아직 읽지 않은 구간이 spill_dir에 차지할 수 있는 최대 크기
+        """
+        super().__init__(seek_threshold=seek_threshold, decoder=decoder, retain_max_bytes=retain_max_bytes)
+        self.num_processes = num_processes or os.cpu_count() or 1
+        self.min_frames_per_segment = min_frames_per_segment
+        self.spill_dir = spill_dir
+        self.max_spill_bytes = max_spill_bytes
+
+    def iter_frames(
+        self, video_path: str, frame_indices: Iterable[int]
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+        frame_indices = sorted(set(frame_indices))
+        decoded_frames = estimate_decoded_frames(frame_indices, self.decoder.seek_threshold)
+        num_processes = min(self.num_processes, decoded_frames // max(1, self.min_frames_per_segment))
+        segments = self._plan_segments(video_path, frame_indices, num_processes)
+        if len(segments) <= 1:
+            yield from super().iter_frames(video_path, frame_indices)
+            return
+
+        # 프레임 캐시는 읽기만 함 (워커마다 캐시를 채우면 같은 캐시 파일을 두고 잠금 경쟁)
+        decoder = self.decoder.read_only() if isinstance(self.decoder, CachedFrameDecoder) else self.decoder
+        # fork는 cv2/ffmpeg 내부 스레드와 함께 쓰면 교착될 수 있어 spawn을 사용합니다.
+        executor = ProcessPoolExecutor(max_workers=num_processes, mp_context=multiprocessing.get_context("spawn"))
+        remaining = iter(segments)
+        pending = deque()
+
+        def submit_next():
+            segment = next(remaining, None)
+            if segment is not None:
+                pending.append(executor.submit(_decode_segment, video_path, segment, decoder, self.spill_dir))
+
+        for _ in range(num_processes + 1):
+            submit_next()
+        try:
+            while pending:
+                decoded, path = pending.popleft().result()
+                submit_next()
+                yield from _read_segment(decoded, path)
+        finally:
+            # 중간에 멈추거나 실패하면 남은 구간을 취소하고 이미 쓴 임시 파일을 지움
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+            for future in pending:
+                if not future.cancelled() and future.exception() is None:
+                    _, path = future.result()
+                    if path and os.path.exists(path):
+                        os.remove(path)
+
+    def _plan_segments(self, video_path: str, frame_indices: List[int], num_processes: int) -> List[List[int]]:
+        """프로세스별 구간을 나누고, 디스크에 쌓이는 양이 max_spill_bytes 안에 들도록 잘게 나눕니다.
+
+        동시에 디스크에 있을 수 있는 구간은 디코딩 중인 num_processes개, 대기 중인 1개, 읽는 중인 1개입니다.
+        여유 공간이 부족하거나 프레임 크기를 알 수 없으면 나누지 않습니다 (현재 프로세스에서 디코딩).
+        """
+        if num_processes <= 1:
+            return [frame_indices]
+        frame_bytes = self._frame_bytes(video_path)
+        if not frame_bytes:
+            return [frame_indices]
+        spilled_segments = num_processes + 2
+        segment_frames = max(1, self.max_spill_bytes // (frame_bytes * spilled_segments))
+        segments = [
+            segment[start:start + segment_frames]
+            for segment in split_segments(frame_indices, num_processes)
+            for start in range(0, len(segment), segment_frames)
+        ]
+        required = spilled_segments * max(len(segment) for segment in segments) * frame_bytes
+        if shutil.disk_usage(self.spill_dir or tempfile.gettempdir()).free < required:
+            return [frame_indices]
+        return segments
+
+    def _frame_bytes(self, video_path: str) -> Optional[int]:
+        """디코더가 반환할 BGR 프레임 하나의 크기 (target_size 리사이즈 반영)"""
+        try:
+            width, height, _ = probe_output_geometry(video_path)
+        except (ffmpeg.Error, KeyError, IndexError):
+            return None
+        letterbox = self.letterbox_for({"width": width, "height": height})
+        if letterbox is not None:
+            width, height = letterbox.width, letterbox.height
+        return width * height * 3
@@ -0,0 +1,382 @@
+import fcntl
+import os
+import tempfile
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+
+# 헤더 (int64 배열) 필드 위치
+MAGIC = 0x31474E4952465641  # b"AVFRING1"
+_MAGIC, _CAPACITY, _HEIGHT, _WIDTH, _CHANNELS, _WRITE_SEQ, _STATE, _PRODUCER_HEARTBEAT, _MAX_CONSUMERS = range(9)
+_CONSUMERS_OFFSET = 16
+# 소비자 테이블: 소비자마다 (사용 여부, 다음에 읽을 seq, heartbeat)
+_CONSUMER_FIELDS = 3
+
+STATE_OPEN = 0
+STATE_CLOSED = 1  # 생산자가 정상 종료. 남은 프레임을 다 읽으면 끝
+STATE_ABORTED = 2  # 생산자가 오류로 중단
+
+# 대기할 때 polling 간격 (처음엔 짧게, 점점 길게)
+_MIN_SLEEP_SEC = 0.00005
+_MAX_SLEEP_SEC = 0.0005
+
+
+class RingClosedError(RuntimeError):
+    """생산자가 중단했거나 heartbeat가 끊겨 더 읽을 수 없습니다."""
+
+
+def frame_ring_name(task_id: str) -> str:
+    """태스크의 프레임 링 이름. 생산자(video_processor)와 소비자(model_inference)가 같은 규칙을 씁니다."""
+    return f"actverse-frames-{task_id}"
+
+
+def _now_ns() -> int:
+    # CLOCK_MONOTONIC은 같은 호스트의 프로세스(컨테이너 포함)끼리 공유됨
+    return time.monotonic_ns()
+
+
+class SharedFrameRing:
+    """같은 호스트의 프로세스끼리 고정 크기 uint8 프레임을 주고받는 공유 메모리 링 버퍼입니다.
+
+    생산자(디코더) 하나가 ``publish``로 프레임을 슬롯에 복사하면, 등록된 소비자들은 모든 프레임을
+    각자의 속도로 읽습니다. 소비자는 슬롯을 가리키는 NumPy view를 받으므로 복사가 없고,
+    JPEG 인코딩 -> 디스크 -> 디코딩 왕복이 사라집니다.
+
+    - 백프레셔: 가장 느린 소비자보다 capacity만큼 앞서면 생산자가 기다립니다.
+    - 크래시 처리: 생산자와 소비자는 heartbeat를 기록합니다. stale_after_sec 동안 갱신이 없는 소비자는
+      생산자가 등록 해제하고, 생산자가 멈추면 소비자는 ``RingClosedError``를 내고 세그먼트를 unlink합니다.
+      같은 이름으로 다시 create하면 죽은 생산자가 남긴 세그먼트를 정리합니다.
+
+    락 없이 seq 카운터로 동기화합니다. 생산자는 프레임을 모두 쓴 뒤 write_seq를 올리고,
+    소비자는 view 사용을 마친 뒤(다음 프레임을 요청할 때) 자신의 read_seq를 올립니다.
+    컨테이너 간에 쓰려면 두 컨테이너가 /dev/shm을 공유해야 합니다 (docker ``ipc: shareable``).
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool, stale_after_sec: float):
+        self.shm = shm
+        self.name = shm.name
+        self.owner = owner
+        self.stale_after_ns = int(stale_after_sec * 1e9)
+        self.consumer_id: Optional[int] = None
+
+        probe = np.ndarray((_CONSUMERS_OFFSET,), dtype=np.int64, buffer=shm.buf)
+        if probe[_MAGIC] != MAGIC:
+            raise ValueError(f"프레임 링 세그먼트가 아닙니다: {shm.name}")
+        self.capacity = int(probe[_CAPACITY])
+        self.shape = (int(probe[_HEIGHT]), int(probe[_WIDTH]), int(probe[_CHANNELS]))
+        self.max_consumers = int(probe[_MAX_CONSUMERS])
+
+        header_len = self._header_len(self.capacity, self.max_consumers)
+        self._header = np.ndarray((header_len,), dtype=np.int64, buffer=shm.buf)
+        self._consumers = self._header[_CONSUMERS_OFFSET:_CONSUMERS_OFFSET + self.max_consumers * _CONSUMER_FIELDS]
+        self._consumers = self._consumers.reshape(self.max_consumers, _CONSUMER_FIELDS)
+        self._frame_indices = self._header[_CONSUMERS_OFFSET + self.max_consumers * _CONSUMER_FIELDS:]
+        self._slots = np.ndarray(
+            (self.capacity, *self.shape), dtype=np.uint8, buffer=shm.buf, offset=self._data_offset(header_len)
+        )
+
+    @staticmethod
+    def _header_len(capacity: int, max_consumers: int) -> int:
+        return _CONSUMERS_OFFSET + max_consumers * _CONSUMER_FIELDS + capacity
+
+    @staticmethod
+    def _data_offset(header_len: int) -> int:
+        # 프레임 데이터는 64바이트(캐시 라인) 경계에서 시작
+        return (header_len * 8 + 63) // 64 * 64
+
+    @classmethod
+    def create(
+        cls,
+        name: str,
+        shape: Tuple[int, int, int],
+        capacity: int = 32,
+        max_consumers: int = 4,
+        stale_after_sec: float = 30.0,
+    ) -> "SharedFrameRing":
+        """생산자 쪽 링을 만듭니다.
+
+        Args:
+            shape: 프레임 (height, width, channels). 모든 프레임이 같은 크기여야 하므로 보통 letterbox를 씁니다.
+            capacity: 슬롯 수. 메모리 사용량은 capacity * height * width * channels 바이트입니다.
+            stale_after_sec: heartbeat가 이만큼 끊긴 상대를 죽은 것으로 봅니다.
+        """
+        height, width, channels = shape
+        header_len = cls._header_len(capacity, max_consumers)
+        size = cls._data_offset(header_len) + capacity * height * width * channels
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            cls._remove_stale(name, stale_after_sec)
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+
+        header = np.ndarray((header_len,), dtype=np.int64, buffer=shm.buf)
+        header[:] = 0
+        header[[_CAPACITY, _HEIGHT, _WIDTH, _CHANNELS, _MAX_CONSUMERS]] = [capacity, height, width, channels, max_consumers]
+        header[_PRODUCER_HEARTBEAT] = _now_ns()
+        # MAGIC은 마지막에 기록해 attach하는 쪽이 초기화 중인 헤더를 읽지 않게 함
+        header[_MAGIC] = MAGIC
+        del header
+        ring = cls(shm, owner=True, stale_after_sec=stale_after_sec)
+        # 슬롯 페이지를 미리 할당해 publish 중 첫 쓰기의 page fault를 없앰
+        ring._slots.fill(0)
+        return ring
+
+    @classmethod
+    def attach(
+        cls, name: str, timeout: Optional[float] = None, stale_after_sec: float = 30.0
+    ) -> "SharedFrameRing":
+        """소비자로 링에 붙습니다. 생산자가 아직 create하지 않았으면 timeout까지 기다립니다.
+
+        등록 이후에 publish된 프레임부터 읽으므로, 생산자는 ``wait_for_consumers``로 기다린 뒤 시작하는 게 좋습니다.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        sleep = _MIN_SLEEP_SEC
+        while True:
+            try:
+                shm = shared_memory.SharedMemory(name=name)
+                if np.ndarray((1,), dtype=np.int64, buffer=shm.buf)[0] == MAGIC:
+                    break
+                shm.close()
+            except FileNotFoundError:
+                pass
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"프레임 링이 없습니다: {name}")
+            time.sleep(sleep)
+            sleep = min(sleep * 2, 0.05)
+
+        # Python 3.12 이하는 attach한 세그먼트도 resource_tracker가 프로세스 종료 시 unlink하므로 추적 해제
+        resource_tracker.unregister(shm._name, "shared_memory")
+        ring = cls(shm, owner=False, stale_after_sec=stale_after_sec)
+        ring._register()
+        return ring
+
+    # 생산자
+
+    def publish(self, frame: np.ndarray, frame_index: int = -1, timeout: Optional[float] = None):
+        """프레임을 다음 슬롯에 복사하고 소비자에게 공개합니다. 링이 가득 차면 자리가 날 때까지 기다립니다."""
+        if frame.shape != self.shape:
+            raise ValueError(f"프레임 크기가 링과 다릅니다: {frame.shape} != {self.shape}")
+        write_seq = int(self._header[_WRITE_SEQ])
+        self._wait(lambda: write_seq - self._min_read_seq() < self.capacity, timeout, self._heartbeat_producer)
+
+        slot = write_seq % self.capacity
+        np.copyto(self._slots[slot], frame)
+        self._frame_indices[slot] = frame_index
+        self._header[_WRITE_SEQ] = write_seq + 1
+        self._header[_PRODUCER_HEARTBEAT] = _now_ns()
+
+    def publish_all(self, frames: Iterable[Tuple[int, np.ndarray]], timeout: Optional[float] = None) -> int:
+        """``FrameDecoder.iter_frames``처럼 (frame_index, frame)을 반환하는 이터레이터를 모두 publish합니다.
+
+        이터레이터에서 예외가 나면 소비자가 알 수 있도록 링을 중단 상태로 만들고 다시 던집니다.
+        """
+        count = 0
+        try:
+            for frame_index, frame in frames:
+                self.publish(frame, frame_index, timeout)
+                count += 1
+        except BaseException:
+            self.abort()
+            raise
+        return count
+
+    def wait_for_consumers(self, num_consumers: int = 1, timeout: Optional[float] = None):
+        self._wait(lambda: self.num_consumers >= num_consumers, timeout, self._heartbeat_producer)
+
+    @property
+    def num_consumers(self) -> int:
+        return int(self._consumers[:, 0].sum())
+
+    def abort(self):
+        self._header[_STATE] = STATE_ABORTED
+
+    # 소비자
+
+    def __iter__(self) -> Iterator[Tuple[int, np.ndarray]]:
+        """(frame_index, 슬롯의 read-only view)를 순서대로 반환합니다.
+
+        view는 다음 프레임을 요청하면 생산자가 덮어쓸 수 있으므로 보관하려면 복사해야 합니다.
+        생산자가 close하면 남은 프레임을 모두 읽고 끝나고, 중단되거나 죽으면 ``RingClosedError``를 냅니다.
+        """
+        if self.consumer_id is None:
+            raise RuntimeError("attach로 만든 소비자 링에서만 읽을 수 있습니다")
+        consumer = self._consumers[self.consumer_id]
+        while True:
+            read_seq = int(consumer[1])
+            if not self._wait_readable(read_seq):
+                return
+            slot = read_seq % self.capacity
+            view = self._slots[slot]
+            view.flags.writeable = False
+            yield int(self._frame_indices[slot]), view
+            consumer[1] = read_seq + 1
+            consumer[2] = _now_ns()
+
+    def _wait_readable(self, read_seq: int) -> bool:
+        """read_seq 프레임이 공개될 때까지 기다립니다. 더 읽을 프레임이 없이 닫혔으면 False입니다."""
+        sleep = _MIN_SLEEP_SEC
+        while read_seq >= self._header[_WRITE_SEQ]:
+            state = self._header[_STATE]
+            if state == STATE_CLOSED and read_seq >= self._header[_WRITE_SEQ]:
+                return False
+            if state == STATE_ABORTED:
+                raise RingClosedError(f"생산자가 중단했습니다: {self.name}")
+            if _now_ns() - self._header[_PRODUCER_HEARTBEAT] > self.stale_after_ns:
+                self.unlink()
+                raise RingClosedError(f"생산자 heartbeat가 끊겼습니다: {self.name}")
+            self._consumers[self.consumer_id, 2] = _now_ns()
+            time.sleep(sleep)
+            sleep = min(sleep * 2, _MAX_SLEEP_SEC)
+        return True
+
+    # 공통
+
+    def close(self, timeout: Optional[float] = 10.0):
+        """생산자: 닫힘을 알리고 소비자가 남은 프레임을 읽을 때까지(최대 timeout) 기다린 뒤 unlink합니다.
+        소비자: 등록을 해제하고 매핑을 닫습니다.
+        """
+        if self.shm is None:
+            return
+        if self.owner:
+            if self._header[_STATE] == STATE_OPEN:
+                self._header[_STATE] = STATE_CLOSED
+            if self._header[_STATE] == STATE_CLOSED:
+                try:
+                    write_seq = int(self._header[_WRITE_SEQ])
+                    self._wait(lambda: self._min_read_seq() >= write_seq, timeout, self._heartbeat_producer)
+                except TimeoutError:
+                    pass
+        elif self.consumer_id is not None:
+            self._consumers[self.consumer_id] = 0
+            self.consumer_id = None
+
+        self._release_views()
+        try:
+            self.shm.close()
+        except BufferError:
+            # 호출자가 아직 프레임 view를 들고 있으면 매핑은 GC 때 해제됨
+            pass
+        self.shm = None
+        if self.owner:
+            self.unlink()
+
+    def unlink(self):
+        """세그먼트 이름을 지웁니다. 이미 붙어 있는 프로세스의 매핑은 그대로 유지됩니다."""
+        try:
+            # 새 핸들로 unlink해 resource_tracker 등록/해제 짝을 맞춤
+            shared_memory.SharedMemory(name=self.name).unlink()
+        except FileNotFoundError:
+            pass
+        try:
+            os.remove(self._lock_path(self.name))
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> "SharedFrameRing":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and self.owner:
+            self.abort()
+        self.close()
+
+    def _register(self):
+        # 여러 소비자가 동시에 빈 자리를 고르지 않도록 등록만 파일 락으로 직렬화
+        with open(self._lock_path(self.name), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            free = [i for i in range(self.max_consumers) if self._consumers[i, 0] == 0]
+            if not free:
+                raise RuntimeError(f"프레임 링의 소비자가 가득 찼습니다 (max_consumers={self.max_consumers})")
+            self.consumer_id = free[0]
+            self._consumers[self.consumer_id, 1] = self._header[_WRITE_SEQ]
+            self._consumers[self.consumer_id, 2] = _now_ns()
+            self._consumers[self.consumer_id, 0] = 1
+
+    @staticmethod
+    def _lock_path(name: str) -> str:
+        return os.path.join(tempfile.gettempdir(), f"{name.lstrip('/')}.lock")
+
+    def _min_read_seq(self) -> int:
+        """살아있는 소비자 중 가장 느린 read_seq. heartbeat가 끊긴 소비자는 등록 해제합니다."""
+        now = _now_ns()
+        write_seq = int(self._header[_WRITE_SEQ])
+        min_seq = write_seq
+        for consumer in self._consumers:
+            if consumer[0] == 0:
+                continue
+            if now - consumer[2] > self.stale_after_ns:
+                consumer[0] = 0
+                continue
+            min_seq = min(min_seq, int(consumer[1]))
+        return min_seq
+
+    def _heartbeat_producer(self):
+        self._header[_PRODUCER_HEARTBEAT] = _now_ns()
+
+    @staticmethod
+    def _wait(condition, timeout: Optional[float], on_wait=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        sleep = _MIN_SLEEP_SEC
+        while not condition():
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError("프레임 링 대기 시간이 초과되었습니다")
+            if on_wait is not None:
+                on_wait()
+            time.sleep(sleep)
+            sleep = min(sleep * 2, _MAX_SLEEP_SEC)
+
+    def _release_views(self):
+        # SharedMemory.close()는 buffer를 참조하는 배열이 남아 있으면 실패하므로 먼저 해제
+        self._header = self._consumers = self._frame_indices = self._slots = None
+
+    @classmethod
+    def _remove_stale(cls, name: str, stale_after_sec: float):
+        """같은 이름의 세그먼트가 죽은 생산자의 것이면 unlink합니다. 살아있는 링이면 FileExistsError입니다."""
+        shm = shared_memory.SharedMemory(name=name)
+        header = np.ndarray((_CONSUMERS_OFFSET,), dtype=np.int64, buffer=shm.buf)
+        stale = (
+            header[_MAGIC] != MAGIC
+            or header[_STATE] != STATE_OPEN
+            or _now_ns() - header[_PRODUCER_HEARTBEAT] > stale_after_sec * 1e9
+        )
+        del header
+        shm.close()
+        if not stale:
+            raise FileExistsError(f"사용 중인 프레임 링입니다: {name}")
+        shared_memory.SharedMemory(name=name).unlink()
+
+
+def publish_video_frames(
+    handler,
+    video_path: str,
+    frame_indices: Iterable[int],
+    video_info: dict,
+    task_id: str,
+    num_consumers: int = 1,
+    capacity: int = 32,
+    timeout: Optional[float] = 60.0,
+) -> int:
+    """handler(``VideoFrameHandler``)로 디코딩한 프레임을 JPEG로 저장하지 않고 같은 호스트의 소비자에게 넘깁니다.
+
+    ``frame_ring_name(task_id)`` 이름으로 ``handler.frame_shape(video_info)`` 크기의 링을 만들고
+    소비자 num_consumers개가 붙을 때까지 기다린 뒤 publish합니다. 소비자가 남은 프레임을 다 읽으면
+    링을 정리하고 publish한 프레임 수를 반환합니다.
+
+    공유 메모리는 이 모듈을 직접 import하는 쪽에서만 사용하도록 videoframe_handler에서 분리해 두었습니다.
+    """
+    with SharedFrameRing.create(frame_ring_name(task_id), handler.frame_shape(video_info), capacity) as ring:
+        ring.wait_for_consumers(num_consumers, timeout)
+        return ring.publish_all(handler.iter_frames(video_path, frame_indices), timeout)
+
+
+def iter_shared_frames(task_id: str, timeout: float = 60.0) -> Iterator[Tuple[int, np.ndarray]]:
+    """``publish_video_frames``로 넘기는 태스크의 프레임을 읽습니다.
+
+    (frame_index, 프레임 view)를 반환하며 view는 다음 프레임을 읽으면 덮어써질 수 있으므로
+    배치로 모으려면 복사해야 합니다. 링이 timeout 안에 생기지 않으면 TimeoutError입니다.
+    """
+    with SharedFrameRing.attach(frame_ring_name(task_id), timeout=timeout) as ring:
+        yield from ring
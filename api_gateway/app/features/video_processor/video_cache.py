@@ -0,0 +1,185 @@
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+import requests
+
+from app.features.video_processor.video_downloader import VercelVideoDownloader
+
+
+class VideoBlobCache:
+    """여러 태스크가 공유하는 content-addressed 비디오 캐시입니다.
+
+    비디오는 SHA-256 이름의 blob으로 ``{cache_dir}/blobs``에 한 번만 저장되고,
+    ``URL + ETag/크기`` 키로 다시 요청되면 다운로드 없이 태스크 디렉토리에 하드링크합니다.
+    URL이 달라도 내용이 같으면 같은 blob을 씁니다. 전체 크기가 max_bytes를 넘으면
+    가장 오래 사용하지 않은 blob부터(태스크가 하드링크로 쓰는 blob 제외) 삭제합니다. 인덱스는 여러 워커 프로세스가 함께 쓰므로
+    파일 잠금으로 보호합니다.
+
+    다운로드는 URL별 임시 디렉토리(``{cache_dir}/tmp/{sha256(url)}``)로 받으므로, 중단된 다운로드를
+    같은 URL로 다시 요청하면 다운로더가 남은 부분만 이어받습니다. 임시 디렉토리는 blob으로 옮긴 뒤 지우고,
+    tmp_max_age 동안 재개되지 않은 것은 다음 다운로드 때 지웁니다.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int, timeout: float = 30, tmp_max_age: float = 24 * 3600):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.tmp_max_age = tmp_max_age
+        self.blobs_dir = os.path.join(cache_dir, "blobs")
+        self.tmp_dir = os.path.join(cache_dir, "tmp")
+        self.locks_dir = os.path.join(cache_dir, "locks")
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.lock_path = os.path.join(cache_dir, ".lock")
+        os.makedirs(self.blobs_dir, exist_ok=True)
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        os.makedirs(self.locks_dir, exist_ok=True)
+
+    def fetch(self, url: str, download_path: str, downloader: VercelVideoDownloader) -> str:
+        """캐시에 있으면 하드링크하고, 없으면 다운로드해 캐시에 넣은 뒤 하드링크합니다.
+
+        Returns:
+            태스크 디렉토리에 생성된 비디오 파일 경로
+        """
+        url_key = self._url_key(url)
+        cached = self._link_cached(url_key, download_path)
+        if cached:
+            return cached
+
+        self._prune_tmp()
+        # 다운로드는 캐시 잠금 밖에서 URL별 임시 디렉토리로 받고, SHA-256은 받는 동안 계산.
+        # 같은 URL을 동시에 받지 않도록 URL별로 잠금
+        key = hashlib.sha256(url.encode()).hexdigest()
+        tmp_path = os.path.join(self.tmp_dir, key)
+        with self._locked(os.path.join(self.locks_dir, key)):
+            # 기다리는 동안 다른 워커가 받았을 수 있음
+            cached = self._link_cached(url_key, download_path)
+            if cached:
+                return cached
+
+            hasher = hashlib.sha256()
+            downloaded = downloader.download(url, tmp_path, hasher=hasher)
+            sha256 = hasher.hexdigest()
+            file_name = os.path.basename(downloaded)
+
+            with self._locked():
+                index = self._load_index()
+                if not os.path.exists(self._blob_path(sha256)):
+                    os.replace(downloaded, self._blob_path(sha256))
+                index["blobs"][sha256] = {
+                    "size": os.path.getsize(self._blob_path(sha256)),
+                    "file_name": file_name,
+                    "last_access": time.time(),
+                }
+                if url_key:
+                    index["urls"][url_key] = sha256
+                self._evict(index, keep=sha256)
+                self._save_index(index)
+                # 캐시 용량이 blob보다 작아 방금 받은 blob까지 지워지는 일이 없도록 링크까지 잠금 안에서 처리
+                target = self._link(sha256, file_name, download_path)
+            # blob으로 옮긴 뒤에만 지움. 다운로드가 실패하면 이어받을 수 있도록 남겨 둠
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            return target
+
+    def _link_cached(self, url_key: Optional[str], download_path: str) -> Optional[str]:
+        if not url_key:
+            return None
+        with self._locked():
+            index = self._load_index()
+            sha256 = index["urls"].get(url_key)
+            if not sha256 or not os.path.exists(self._blob_path(sha256)):
+                return None
+            index["blobs"][sha256]["last_access"] = time.time()
+            self._save_index(index)
+            return self._link(sha256, index["blobs"][sha256]["file_name"], download_path)
+
+    def _prune_tmp(self):
+        """tmp_max_age 동안 재개되지 않은 다운로드 임시 디렉토리를 지웁니다. 받는 중인 것(잠금)은 건너뜁니다."""
+        now = time.time()
+        for entry in os.scandir(self.tmp_dir):
+            try:
+                modified = max([entry.stat().st_mtime] + [f.stat().st_mtime for f in os.scandir(entry.path)])
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            if now - modified <= self.tmp_max_age:
+                continue
+            with open(os.path.join(self.locks_dir, entry.name), "w") as lock_file:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue
+                shutil.rmtree(entry.path, ignore_errors=True)
+
+    def _url_key(self, url: str) -> Optional[str]:
+        """URL과 ETag/크기로 캐시 키를 만듭니다. 둘 다 없으면 원본 변경을 감지할 수 없어 None입니다."""
+        try:
+            response = requests.head(url, allow_redirects=True, timeout=self.timeout)
+        except requests.RequestException:
+            return None
+        etag = response.headers.get("ETag")
+        size = response.headers.get("Content-Length")
+        if response.status_code >= 400 or not (etag or size):
+            return None
+        return f"{url}|{etag or ''}|{size or ''}"
+
+    def _evict(self, index: dict, keep: str):
+        """용량을 넘으면 오래 사용하지 않은 blob부터 삭제합니다.
+
+        태스크 디렉토리에 하드링크가 남아 있는 blob(st_nlink > 1)은 지워도 디스크 공간이
+        돌아오지 않으므로 용량에는 포함하되 삭제하지 않고, 태스크가 정리된 뒤에 삭제합니다.
+        """
+        total = sum(blob["size"] for blob in index["blobs"].values())
+        for sha256, blob in sorted(index["blobs"].items(), key=lambda item: item[1]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            if sha256 == keep:
+                continue
+            blob_path = self._blob_path(sha256)
+            if os.path.exists(blob_path):
+                if os.stat(blob_path).st_nlink > 1:
+                    continue
+                os.remove(blob_path)
+            del index["blobs"][sha256]
+            index["urls"] = {key: value for key, value in index["urls"].items() if value != sha256}
+            total -= blob["size"]
+
+    def _link(self, sha256: str, file_name: str, download_path: str) -> str:
+        os.makedirs(download_path, exist_ok=True)
+        target = os.path.join(download_path, file_name)
+        if os.path.exists(target):
+            os.remove(target)
+        try:
+            os.link(self._blob_path(sha256), target)
+        except OSError:
+            # 캐시와 태스크 디렉토리가 다른 볼륨이면 하드링크가 불가능하므로 복사
+            shutil.copyfile(self._blob_path(sha256), target)
+        return target
+
+    def _blob_path(self, sha256: str) -> str:
+        return os.path.join(self.blobs_dir, sha256)
+
+    @contextmanager
+    def _locked(self, lock_path: Optional[str] = None):
+        with open(lock_path or self.lock_path, "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load_index(self) -> dict:
+        if not os.path.exists(self.index_path):
+            return {"urls": {}, "blobs": {}}
+        with open(self.index_path) as f:
+            return json.load(f)
+
+    def _save_index(self, index: dict):
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, self.index_path)
@@ -0,0 +1,440 @@
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+from fractions import Fraction
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import ffmpeg
+
+from app.features.video_processor.frame_decoders import probe_output_geometry, select_ranges
+from app.features.video_processor.videoframe_handler import NaiveVideoFrameCurator
+
+
+CONVERSION_TRANSCODE = "transcode"
+CONVERSION_REMUX = "remux"
+
+# convert_for_stages가 변환 결과 디렉토리에 남기는 단계별 변환 정보
+CONVERSIONS_FILE = "conversions.json"
+
+
+@dataclass
+class ConversionGeometry:
+    """변환 전후의 해상도와 fps입니다.
+
+    변환본 좌표 (x, y)는 원본 좌표 (x / scale, y / scale)에, 변환본 프레임 인덱스 i는
+    원본 프레임 인덱스 round(i * source_fps / fps)에 대응합니다.
+    """
+
+    source_width: int
+    source_height: int
+    source_fps: float
+    width: int
+    height: int
+    fps: float
+
+    @classmethod
+    def probe(cls, source_file: str, output_file: str) -> "ConversionGeometry":
+        source_width, source_height, source_fps = probe_output_geometry(source_file)
+        width, height, fps = probe_output_geometry(output_file)
+        return cls(source_width, source_height, source_fps, width, height, fps)
+
+    @property
+    def scale(self) -> float:
+        return self.width / self.source_width if self.source_width else 1.0
+
+    def to_source_frame_index(self, frame_index: int) -> int:
+        if not self.fps or not self.source_fps:
+            return frame_index
+        return round(frame_index * self.source_fps / self.fps)
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "scale": self.scale}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ConversionGeometry":
+        return cls(**{key: data[key] for key in (
+            "source_width", "source_height", "source_fps", "width", "height", "fps"
+        )})
+
+
+@dataclass
+class ConversionResult:
+    output_file: str
+    mode: str  # CONVERSION_TRANSCODE 또는 CONVERSION_REMUX
+    geometry: Optional[ConversionGeometry] = None
+
+
+@dataclass
+class TranscodeProfile:
+    """변환 프로파일. 상한값이 None이면 원본을 유지합니다."""
+
+    name: str
+    max_long_side: Optional[int] = None  # 긴 변 최대 픽셀
+    max_fps: Optional[float] = None
+    audio: bool = True
+    preset: str = "fast"
+    crf: int = 18
+    gop_sec: Optional[float] = None  # 키프레임 간격(초). 짧을수록 seek가 빠름
+
+
+PROFILES: Dict[str, TranscodeProfile] = {
+    # 보관/전달용 원본 화질
+    "archive": TranscodeProfile("archive"),
+    # 라벨링 이미지 추출용: 라벨러가 보기에 충분한 해상도, 오디오 불필요
+    "labeling": TranscodeProfile(
+        "labeling", max_long_side=1280, max_fps=30, audio=False, preset="veryfast", crf=20, gop_sec=1.0
+    ),
+    # 키포인트 모델 입력은 640px를 넘지 않으므로 분석 단계는 640px로 충분
+    "analysis-640": TranscodeProfile(
+        "analysis-640", max_long_side=640, max_fps=30, audio=False, preset="veryfast", crf=23, gop_sec=1.0
+    ),
+}
+
+# 파이프라인 단계별 사용 프로파일
+STAGE_PROFILES: Dict[str, str] = {
+    "upload": "archive",
+    "frame_extraction": "labeling",
+    "inference": "analysis-640",
+}
+
+
+class FFmpegVideoConverter:
+    """ffmpeg로 비디오를 mp4(H.264/AAC)로 변환합니다.
+
+    입력이 이미 mp4 컨테이너의 H.264(yuv420p)/AAC이고 프로파일의 상한을 넘지 않으면
+    재인코딩 없이 스트림 복사(remux)로 faststart만 적용합니다.
+    """
+
+    remux_containers = {"mov", "mp4"}
+    remux_video_codecs = {"h264"}
+    remux_pix_fmts = {"yuv420p", "yuvj420p"}
+    remux_audio_codecs = {"aac"}
+
+    def __init__(self, profile: str = "archive"):
+        if profile not in PROFILES:
+            raise ValueError(f"지원하지 않는 변환 프로파일입니다: {profile} (지원: {', '.join(PROFILES)})")
+        self.profile = PROFILES[profile]
+
+    def output_options(self) -> dict:
+        profile = self.profile
+        options = {
+            "vcodec": "libx264",
+            "pix_fmt": "yuv420p",
+            "preset": profile.preset,
+            "crf": profile.crf,
+            "movflags": "faststart",
+        }
+        if profile.audio:
+            options["acodec"] = "aac"
+        else:
+            options["an"] = None
+        scale = self.scale_args()
+        if scale:
+            options["vf"] = f"scale=w='{scale['w']}':h='{scale['h']}'"
+        if profile.max_fps:
+            # fps 필터와 달리 원본 fps가 더 낮으면 그대로 둠
+            options["fpsmax"] = profile.max_fps
+        if profile.gop_sec:
+            options["force_key_frames"] = f"expr:gte(t,n_forced*{profile.gop_sec})"
+        return options
+
+    def scale_args(self) -> Optional[dict]:
+        """프로파일의 긴 변 상한을 ffmpeg scale 필터 인자로 반환합니다. 상한이 없으면 None입니다."""
+        side = self.profile.max_long_side
+        if not side:
+            return None
+        # 긴 변만 제한하고 비율 유지, libx264를 위해 짝수로 맞춤. 원본보다 키우지 않음
+        return {
+            "w": f"if(gte(iw,ih),trunc(min(iw,{side})/2)*2,-2)",
+            "h": f"if(gte(iw,ih),-2,trunc(min(ih,{side})/2)*2)",
+        }
+
+    def output_file_name(self, video_path: str) -> str:
+        """archive는 원본 파일명을 유지하고, 다른 프로파일은 ``{이름}_{프로파일}.mp4``로 저장합니다."""
+        if self.profile.name == "archive":
+            return os.path.basename(video_path)
+        stem = os.path.splitext(os.path.basename(video_path))[0]
+        return f"{stem}_{self.profile.name}.mp4"
+
+    def convert(self, video_path: str, output_path: str) -> ConversionResult:
+        return self.convert_file(video_path, os.path.join(output_path, self.output_file_name(video_path)))
+
+    def convert_file(self, video_path: str, output_file: str) -> ConversionResult:
+        os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+        if self.is_remuxable(ffmpeg.probe(video_path)):
+            (
+                ffmpeg.input(video_path)
+                .output(output_file, c="copy", movflags="faststart")
+                .overwrite_output()
+                .run(capture_stdout=True, capture_stderr=True)
+            )
+            return ConversionResult(output_file, CONVERSION_REMUX)
+
+        (
+            ffmpeg.input(video_path)
+            .output(output_file, **self.output_options())
+            .overwrite_output()
+            .run(capture_stdout=True, capture_stderr=True)
+        )
+        return ConversionResult(output_file, CONVERSION_TRANSCODE)
+
+    def convert_and_sample(
+        self, video_path: str, output_path: str, frames_path: str, num_frames: int, jpeg_qscale: int = 2
+    ) -> Tuple[ConversionResult, List[int]]:
+        """변환과 프레임 샘플링을 ffmpeg 한 번의 디코딩으로 처리합니다.
+
+        filter_complex로 디코딩한 영상을 split해 한쪽은 mp4로 인코딩하고, 다른 쪽은
+        select 필터로 샘플 프레임만 골라 ``frame_%04d.jpg``(0부터)로 저장합니다.
+        샘플 인덱스는 probe한 프레임 수로 ``NaiveVideoFrameCurator``와 같은 간격으로 미리 계산합니다.
+        remux가 가능하면 mp4는 스트림 복사하고 디코딩은 샘플링에만 사용합니다.
+
+        균등 간격 샘플링만 지원하므로 video_processor 워커는 변환 프로파일과 함께 naive 큐레이션의
+        원본 크기 jpg 저장을 요청받았을 때만 이 경로를 사용합니다.
+
+        Returns:
+            (변환 결과, 저장한 프레임의 원본 프레임 인덱스 리스트)
+        """
+        probe = ffmpeg.probe(video_path, count_packets=None)
+        frame_indices = NaiveVideoFrameCurator(num_frames).select_indices(self._frame_count(probe))
+        if not frame_indices:
+            raise ValueError(f"프레임 수를 확인할 수 없습니다: {video_path}")
+
+        output_file = os.path.join(output_path, self.output_file_name(video_path))
+        os.makedirs(output_path, exist_ok=True)
+        os.makedirs(frames_path, exist_ok=True)
+
+        source = ffmpeg.input(video_path)
+        remux = self.is_remuxable(probe)
+        if remux:
+            converted = ffmpeg.output(source, output_file, c="copy", movflags="faststart")
+            sample_stream = source.video
+        else:
+            split = source.video.split()
+            video, sample_stream = split[0], split[1]
+            scale = self.scale_args()
+            if scale:
+                video = video.filter("scale", **scale)
+            # 스케일은 그래프 안에서 처리하므로 -vf 옵션은 제외
+            options = self.output_options()
+            options.pop("vf", None)
+            streams = [video, source["a?"]] if self.profile.audio else [video]
+            converted = ffmpeg.output(*streams, output_file, **options)
+
+        # n은 디코딩 순서의 프레임 번호. vfr로 선택된 프레임만 내보냄
+        select_expr = "+".join(f"between(n,{first},{last})" for first, last in select_ranges(frame_indices))
+        sampled = ffmpeg.output(
+            sample_stream.filter("select", select_expr),
+            os.path.join(frames_path, "frame_%04d.jpg"),
+            start_number=0,
+            fps_mode="vfr",
+            **{"q:v": jpeg_qscale},
+        )
+
+        ffmpeg.merge_outputs(converted, sampled).overwrite_output().run(capture_stdout=True, capture_stderr=True)
+        mode = CONVERSION_REMUX if remux else CONVERSION_TRANSCODE
+        return ConversionResult(output_file, mode), frame_indices
+
+    @staticmethod
+    def _frame_count(probe: dict) -> int:
+        """nb_frames가 없는 컨테이너(mkv, webm 등)는 count_packets로 센 패킷 수를 사용합니다."""
+        for stream in probe.get("streams", []):
+            if stream.get("codec_type") == "video":
+                return int(stream.get("nb_frames") or stream.get("nb_read_packets") or 0)
+        return 0
+
+    def is_remuxable(self, probe: dict) -> bool:
+        """ffprobe 결과로 재인코딩 없이 스트림 복사만으로 충분한지 판단합니다."""
+        # e.g. format_name: "mov,mp4,m4a,3gp,3g2,mj2"
+        containers = set(probe.get("format", {}).get("format_name", "").split(","))
+        if not containers & self.remux_containers:
+            return False
+
+        video_streams = [s for s in probe.get("streams", []) if s.get("codec_type") == "video"]
+        audio_streams = [s for s in probe.get("streams", []) if s.get("codec_type") == "audio"]
+        other_streams = [s for s in probe.get("streams", []) if s.get("codec_type") not in ("video", "audio")]
+        if len(video_streams) != 1 or other_streams:
+            return False
+
+        video = video_streams[0]
+        if video.get("codec_name") not in self.remux_video_codecs or video.get("pix_fmt") not in self.remux_pix_fmts:
+            return False
+        if not all(s.get("codec_name") in self.remux_audio_codecs for s in audio_streams):
+            return False
+        return self._within_profile(video, has_audio=bool(audio_streams))
+
+    def _within_profile(self, video: dict, has_audio: bool) -> bool:
+        """원본이 프로파일의 해상도/fps/오디오 조건을 이미 만족하는지 확인합니다.
+
+        키프레임 간격은 스트림 복사로 바꿀 수 없으므로 gop_sec가 있는 프로파일은 항상 재인코딩합니다.
+        """
+        profile = self.profile
+        if profile.gop_sec or (has_audio and not profile.audio):
+            return False
+        if profile.max_long_side and max(video.get("width", 0), video.get("height", 0)) > profile.max_long_side:
+            return False
+        if profile.max_fps:
+            try:
+                fps = Fraction(video.get("avg_frame_rate") or video.get("r_frame_rate") or "0/1")
+            except (ValueError, ZeroDivisionError):
+                return False
+            if fps > profile.max_fps:
+                return False
+        return True
+
+    def convert_stream(
+        self, chunks: Iterable[bytes], output_file: str, tee_path: Optional[str] = None
+    ) -> ConversionResult:
+        """바이트 스트림을 ffmpeg stdin으로 바로 넘겨, 다운로드와 변환을 동시에 진행합니다.
+
+        tee_path를 지정하면 원본도 함께 저장합니다. moov atom이 파일 끝에 있는 mp4처럼
+        seek 없이 읽을 수 없는 입력이면 ffmpeg가 실패하는데, 이때 저장된 원본이 있으면
+        원본 파일로 다시 변환합니다.
+
+        video_processor 워커는 STREAM_CONVERT=true일 때 다운로드 단계에서 이 경로로 첫 변환 단계를 처리하고,
+        검증 단계에서 원본과 변환본을 모두 검증한 뒤 변환본을 재사용합니다 (``convert_for_stages`` 참고).
+
+        Args:
+            chunks: 다운로드 응답의 바이트 청크
+            output_file: 변환 결과 파일 경로
+            tee_path: 원본을 함께 저장할 경로 (None이면 저장하지 않음)
+        """
+        os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+        process = (
+            ffmpeg.input("pipe:")
+            .output(output_file, **self.output_options())
+            .overwrite_output()
+            .run_async(pipe_stdin=True, pipe_stderr=True)
+        )
+
+        # stderr 버퍼가 가득 차 ffmpeg가 멈추지 않도록 별도 스레드에서 비움
+        stderr_chunks = []
+        stderr_reader = threading.Thread(
+            target=lambda: stderr_chunks.extend(iter(lambda: process.stderr.read(65536), b"")),
+            daemon=True,
+        )
+        stderr_reader.start()
+
+        ffmpeg_alive = True
+        tee = open(tee_path, "wb") if tee_path else None
+        try:
+            for data in chunks:
+                if tee is not None:
+                    tee.write(data)
+                if ffmpeg_alive:
+                    try:
+                        process.stdin.write(data)
+                    except BrokenPipeError:
+                        # ffmpeg가 먼저 종료되어도 원본은 끝까지 받아 재시도에 사용
+                        ffmpeg_alive = False
+                        if tee is None:
+                            break
+        finally:
+            if tee is not None:
+                tee.close()
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+            process.wait()
+            stderr_reader.join()
+
+        if process.returncode == 0:
+            return ConversionResult(output_file, CONVERSION_TRANSCODE)
+        if tee_path is not None:
+            # 원본 파일은 seek 가능하므로 일반 변환으로 재시도
+            return self.convert_file(tee_path, output_file)
+        raise ffmpeg.Error("ffmpeg", b"", b"".join(stderr_chunks))
+
+
+def convert_stream_for_stage(
+    chunks: Iterable[bytes], original_file: str, output_path: str, stage: str
+) -> ConversionResult:
+    """다운로드 중인 바이트 청크를 stage 프로파일로 바로 변환하고, 원본은 original_file에 함께 저장합니다."""
+    if stage not in STAGE_PROFILES:
+        raise ValueError(f"알 수 없는 파이프라인 단계입니다: {stage} (지원: {', '.join(STAGE_PROFILES)})")
+    converter = FFmpegVideoConverter(STAGE_PROFILES[stage])
+    output_file = os.path.join(output_path, converter.output_file_name(original_file))
+    return converter.convert_stream(chunks, output_file, tee_path=original_file)
+
+
+def convert_for_stages(
+    video_path: str,
+    output_path: str,
+    stages: Iterable[str],
+    keep_original: bool = True,
+    converted: Optional[Dict[str, ConversionResult]] = None,
+) -> Dict[str, ConversionResult]:
+    """파이프라인 단계별 프로파일(STAGE_PROFILES)로 변환하고 {단계: ConversionResult}를 반환합니다.
+
+    같은 프로파일을 쓰는 단계는 한 번만 변환합니다. 단계별 결과와 원본 대비 해상도/fps는
+    ``{output_path}/conversions.json``에 남겨 추론/라벨 좌표를 원본으로 되돌릴 때 사용합니다.
+
+    keep_original이 False여도 원본을 대신할 archive 변환본(upload 단계)이 있을 때만 원본을 삭제합니다.
+
+    Args:
+        converted: 이미 변환된 {단계: ConversionResult} (예: ``convert_stream_for_stage``). 다시 변환하지 않습니다.
+    """
+    results_by_profile: Dict[str, ConversionResult] = {}
+    results: Dict[str, ConversionResult] = {}
+    for stage in stages:
+        if stage not in STAGE_PROFILES:
+            raise ValueError(f"알 수 없는 파이프라인 단계입니다: {stage} (지원: {', '.join(STAGE_PROFILES)})")
+        profile = STAGE_PROFILES[stage]
+        if profile not in results_by_profile:
+            if converted and stage in converted:
+                result = converted[stage]
+            else:
+                result = FFmpegVideoConverter(profile).convert(video_path, output_path)
+            result.geometry = ConversionGeometry.probe(video_path, result.output_file)
+            results_by_profile[profile] = result
+        results[stage] = results_by_profile[profile]
+
+    archive = results_by_profile.get("archive")
+    remove_original = (
+        not keep_original
+        and archive is not None
+        and os.path.abspath(archive.output_file) != os.path.abspath(video_path)
+    )
+    _save_conversions(output_path, video_path, results, original_kept=not remove_original)
+    if remove_original:
+        os.remove(video_path)
+    return results
+
+
+def _save_conversions(output_path: str, video_path: str, results: Dict[str, ConversionResult], original_kept: bool):
+    conversions = {
+        "original_video_path": video_path,
+        "original_kept": original_kept,
+        "stages": {
+            stage: {
+                "profile": STAGE_PROFILES[stage],
+                "output_file": result.output_file,
+                "mode": result.mode,
+                "geometry": result.geometry.to_dict() if result.geometry else None,
+            }
+            for stage, result in results.items()
+        },
+    }
+    os.makedirs(output_path, exist_ok=True)
+    with open(os.path.join(output_path, CONVERSIONS_FILE), "w") as f:
+        json.dump(conversions, f, ensure_ascii=False, indent=2)
+
+
+def load_conversions(output_path: str) -> Optional[dict]:
+    """convert_for_stages가 남긴 변환 정보를 읽습니다. 없으면 None입니다."""
+    try:
+        with open(os.path.join(output_path, CONVERSIONS_FILE)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def find_conversion(video_file: str, stage: str) -> Optional[ConversionResult]:
+    """video_file이 stage용 변환본이면 같은 디렉토리의 conversions.json에서 변환 정보를 찾습니다."""
+    conversions = load_conversions(os.path.dirname(video_file)) or {}
+    entry = conversions.get("stages", {}).get(stage)
+    if not entry or os.path.abspath(entry["output_file"]) != os.path.abspath(video_file):
+        return None
+    geometry = ConversionGeometry.from_dict(entry["geometry"]) if entry.get("geometry") else None
+    return ConversionResult(entry["output_file"], entry["mode"], geometry)
@@ -1,7 +1,13 @@
 from abc import ABC, abstractmethod
 import requests
 from urllib.parse import urlparse, unquote
+import json
 import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional, Tuple
 from tqdm import tqdm
 
 from app.utils import sanitize_filename
@@ -14,9 +20,19 @@ class VideoDownloader(ABC):
     
 
 class VercelVideoDownloader(VideoDownloader):
-    def download(self, url: str, download_path: str):
-        response = requests.get(url, stream=True)
-        
+    chunk_size = 1024 * 1024
+    # 연결/읽기 타임아웃(초). None이면 서버가 응답하지 않을 때 무한히 기다림
+    timeout: Optional[float] = None
+
+    def download(self, url: str, download_path: str, hasher=None):
+        """
+        Args:
+            hasher: hashlib 객체를 넘기면 받는 동안 내용 해시를 계산합니다.
+        """
+        response = requests.get(url, stream=True, timeout=self.timeout)
+        # 오류 응답 본문을 비디오로 저장하지 않음
+        response.raise_for_status()
+
         os.makedirs(download_path, exist_ok=True)
         file_name = self._file_name_from_vercel_response(url, response)
         download_full_name = os.path.join(download_path, file_name)
@@ -30,12 +46,20 @@ class VercelVideoDownloader(VideoDownloader):
                 unit_scale=True,
                 unit_divisor=1024,
             )
-            for data in response.iter_content(chunk_size=1024):
+            for data in response.iter_content(chunk_size=self.chunk_size):
                 size = file.write(data)
+                if hasher is not None:
+                    hasher.update(data)
                 bar.update(size)
             bar.close()
         return download_full_name
 
+    def stream(self, url: str) -> Tuple[str, Iterator[bytes]]:
+        """파일로 저장하지 않고 (파일명, 응답 바이트 청크 이터레이터)를 반환합니다."""
+        response = requests.get(url, stream=True, timeout=self.timeout)
+        response.raise_for_status()
+        file_name = self._file_name_from_vercel_response(url, response)
+        return file_name, response.iter_content(chunk_size=self.chunk_size)
 
     def _file_name_from_vercel_response(self, 
                                         url: str, 
@@ -50,5 +74,184 @@ class VercelVideoDownloader(VideoDownloader):
             parsed_url = urlparse(url)
             file_name = os.path.basename(parsed_url.path)
             return sanitize_filename(unquote(file_name))
-        
-            
+
+
+class RangedVideoDownloader(VercelVideoDownloader):
+    """HTTP Range 요청을 여러 연결로 동시에 보내 받는 다운로더입니다.
+
+    미리 크기를 잡아 둔 ``{파일명}.part``에 청크별로 오프셋 쓰기를 하고, 완료된 청크는
+    ``{파일명}.part.json`` 상태 파일에 기록합니다. 워커가 재시작되어도 같은 URL/크기/ETag면
+    남은 청크만 다시 받습니다. 서버가 Range를 지원하지 않으면 단일 연결 다운로드로 전환합니다.
+
+    실패한 청크는 retry_backoff, 2배, 4배... 초 간격으로 max_retries번까지 다시 받습니다.
+    """
+
+    def __init__(self, num_connections: int = 4, range_chunk_size: int = 8 * 1024 * 1024,
+                 max_retries: int = 3, timeout: float = 30, retry_backoff: float = 0.5):
+        self.num_connections = num_connections
+        self.range_chunk_size = range_chunk_size
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.retry_backoff = retry_backoff
+        self._local = threading.local()
+
+    def download(self, url: str, download_path: str, hasher=None):
+        os.makedirs(download_path, exist_ok=True)
+
+        # 첫 바이트만 요청해 Range 지원 여부와 전체 크기를 확인
+        probe = requests.get(url, stream=True, headers={"Range": "bytes=0-0"}, timeout=self.timeout)
+        probe.close()
+        probe.raise_for_status()
+        total_size = self._total_size_from_content_range(probe.headers.get("Content-Range"))
+        if probe.status_code != 206 or not total_size:
+            return super().download(url, download_path, hasher=hasher)
+
+        file_name = self._file_name_from_vercel_response(url, probe)
+        download_full_name = os.path.join(download_path, file_name)
+        part_path = f"{download_full_name}.part"
+        state_path = f"{part_path}.json"
+
+        state = self._load_state(state_path, url, total_size, probe.headers.get("ETag"))
+        if state is None or not os.path.exists(part_path):
+            state = {
+                "url": url,
+                "size": total_size,
+                "etag": probe.headers.get("ETag"),
+                "chunk_size": self.range_chunk_size,
+                "completed": [],
+            }
+            with open(part_path, "wb") as f:
+                f.truncate(total_size)
+            self._save_state(state_path, state)
+
+        chunk_size = state["chunk_size"]
+        num_chunks = (total_size + chunk_size - 1) // chunk_size
+        completed = set(state["completed"])
+        remaining = [i for i in range(num_chunks) if i not in completed]
+
+        lock = threading.Lock()
+        bar = tqdm(
+            total=total_size,
+            initial=total_size - sum(self._chunk_length(i, chunk_size, total_size) for i in remaining),
+            unit="B",
+            unit_scale=True,
+            unit_divisor=1024,
+        )
+
+        # 청크는 순서 없이 도착하므로 앞에서부터 이어서 완료된 청크까지만 해시에 반영.
+        # 방금 쓴 청크는 페이지 캐시에 있으므로 다운로드가 끝난 뒤 파일 전체를 다시 읽지 않음
+        hash_lock = threading.Lock()
+        next_hash_chunk = [0]
+
+        def update_hash(blocking: bool):
+            if hasher is None or not hash_lock.acquire(blocking=blocking):
+                return
+            try:
+                with open(part_path, "rb") as f:
+                    while next_hash_chunk[0] < num_chunks:
+                        with lock:
+                            if next_hash_chunk[0] not in completed:
+                                break
+                        chunk_id = next_hash_chunk[0]
+                        self._hash_range(f, hasher, chunk_id * chunk_size,
+                                         self._chunk_length(chunk_id, chunk_size, total_size))
+                        next_hash_chunk[0] += 1
+            finally:
+                hash_lock.release()
+
+        def fetch(chunk_id: int):
+            self._fetch_chunk(url, part_path, chunk_id, chunk_size, total_size, bar)
+            with lock:
+                completed.add(chunk_id)
+                state["completed"].append(chunk_id)
+                self._save_state(state_path, state)
+            # 다른 스레드가 해시 중이면 그 스레드가 이어서 처리하므로 기다리지 않음
+            update_hash(blocking=False)
+
+        with ThreadPoolExecutor(max_workers=self.num_connections) as executor:
+            for future in [executor.submit(fetch, chunk_id) for chunk_id in remaining]:
+                future.result()
+        bar.close()
+        update_hash(blocking=True)
+
+        os.replace(part_path, download_full_name)
+        os.remove(state_path)
+        return download_full_name
+
+    def _fetch_chunk(self, url: str, part_path: str, chunk_id: int, chunk_size: int,
+                     total_size: int, bar: tqdm):
+        start = chunk_id * chunk_size
+        end = start + self._chunk_length(chunk_id, chunk_size, total_size) - 1
+
+        for attempt in range(self.max_retries):
+            offset = start
+            try:
+                with self._session().get(url, stream=True, timeout=self.timeout,
+                                         headers={"Range": f"bytes={start}-{end}"}) as response:
+                    if response.status_code != 206:
+                        raise IOError(f"Range 요청이 거부되었습니다: status={response.status_code}")
+
+                    fd = os.open(part_path, os.O_WRONLY)
+                    try:
+                        for data in response.iter_content(chunk_size=self.chunk_size):
+                            os.pwrite(fd, data, offset)
+                            offset += len(data)
+                            bar.update(len(data))
+                    finally:
+                        os.close(fd)
+
+                if offset != end + 1:
+                    raise IOError(f"청크 {chunk_id} 크기 불일치: {offset - start} bytes")
+                return
+            except (requests.RequestException, IOError):
+                # 실패한 시도에서 받은 바이트는 다시 받으므로 진행률에서 뺌
+                bar.update(start - offset)
+                if attempt == self.max_retries - 1:
+                    raise
+                time.sleep(self.retry_backoff * 2 ** attempt)
+
+    def _hash_range(self, f, hasher, start: int, length: int):
+        f.seek(start)
+        while length > 0:
+            data = f.read(min(self.chunk_size, length))
+            if not data:
+                raise IOError(f"파일이 예상보다 짧습니다: offset={f.tell()}")
+            hasher.update(data)
+            length -= len(data)
+
+    def _session(self) -> requests.Session:
+        # requests.Session은 스레드 간 공유가 안전하지 않으므로 스레드별로 생성
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    @staticmethod
+    def _chunk_length(chunk_id: int, chunk_size: int, total_size: int) -> int:
+        return min(chunk_size, total_size - chunk_id * chunk_size)
+
+    @staticmethod
+    def _total_size_from_content_range(content_range: Optional[str]) -> Optional[int]:
+        # e.g. "bytes 0-0/12345"
+        match = re.match(r"bytes\s+\d+-\d+/(\d+)", content_range or "")
+        return int(match.group(1)) if match else None
+
+    @staticmethod
+    def _load_state(state_path: str, url: str, total_size: int, etag: Optional[str]) -> Optional[dict]:
+        """이어받기 가능한 상태 파일이면 반환하고, 원본이 바뀌었으면 None을 반환합니다."""
+        if not os.path.exists(state_path):
+            return None
+        try:
+            with open(state_path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get("url") != url or state.get("size") != total_size or state.get("etag") != etag:
+            return None
+        return state
+
+    @staticmethod
+    def _save_state(state_path: str, state: dict):
+        tmp_path = f"{state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, state_path)
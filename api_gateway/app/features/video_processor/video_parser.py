@@ -1,8 +1,14 @@
 from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
 
 import cv2
+import ffmpeg
+import hashlib
+import json
 import os
 
+from app.features.video_processor.frame_decoders import parse_frame_rate
+
 
 class VideoParser(ABC):
     @abstractmethod
@@ -12,6 +18,9 @@ class VideoParser(ABC):
         반환 예시:
         {
             "frame_count": int,
+            "fps": float,
+            "width": int,
+            "height": int,
             "video_type": str,
             "duration_sec": float,
             "camera_angle": Optional[str],
@@ -34,6 +43,8 @@ class OpenCVVideoParser(VideoParser):
 
         frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
         fps = cap.get(cv2.CAP_PROP_FPS)
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         duration_sec = frame_count / fps if fps else None
         
         # FOURCC 코드 추출 및 문자열 변환
@@ -43,12 +54,189 @@ class OpenCVVideoParser(VideoParser):
 
         cap.release()
 
-        # TODO: 카메라 앵글, 퀄리티는 추후 구현
+        # 카메라 앵글, 퀄리티는 VideoQualityEstimator가 샘플 프레임으로 채움
         return {
             "frame_count": frame_count,
+            "fps": fps,
             "codec": codec,
             "video_type": ext,
             "duration_sec": duration_sec,
+            "width": width,
+            "height": height,
+            "camera_angle": None,
+            "video_quality": None,
+        }
+
+
+def file_content_hash(video_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """파일 전체 내용의 SHA-256입니다. 같은 내용이면 경로가 달라도 같은 값입니다."""
+    hasher = hashlib.sha256()
+    with open(video_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def file_identity(video_path: str) -> str:
+    """(장치, inode, 크기, mtime) 문자열입니다. 파일 내용이 바뀌면 mtime이 바뀌어 다른 값이 됩니다."""
+    stat = os.stat(video_path)
+    return f"{stat.st_dev:x}-{stat.st_ino:x}-{stat.st_size}-{stat.st_mtime_ns}"
+
+
+class FFprobeVideoParser(VideoParser):
+    """ffprobe로 스트림 메타데이터를 정확하게 읽는 파서입니다.
+
+    ``read_packets``면 비디오 패킷을 모두 읽어(디코딩 없이 demux만) 프레임 수와 키프레임 위치를
+    정확히 구합니다. 가변 프레임레이트(VFR) 영상은 헤더의 프레임 수/fps가 틀리는 경우가 많아
+    fps도 프레임 수/길이로 다시 계산합니다.
+
+    결과는 파일 전체 내용의 SHA-256을 키로 메모리와 cache_dir(지정 시)에 저장되므로,
+    같은 파일은 여러 단계나 재시도에서도 한 번만 probe합니다. 해시는 (장치, inode, 크기, mtime)별로
+    기억해 두므로 같은 파일(하드링크 포함)은 한 번만 전체를 읽습니다.
+    """
+
+    def __init__(self, read_packets: bool = True, cache_dir: Optional[str] = None):
+        self.read_packets = read_packets
+        self.cache_dir = cache_dir
+        self._cache: Dict[str, dict] = {}
+        self._hashes: Dict[str, str] = {}  # file_identity -> file_content_hash
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def extract_info(self, video_path: str) -> dict:
+        """
+        OpenCVVideoParser 결과에 더해 다음 정보를 반환합니다.
+        {
+            "width": int, "height": int,   # 저장된 해상도 (회전 적용 전)
+            "rotation": int,               # 재생 시 시계 방향 회전 (0, 90, 180, 270)
+            "pix_fmt": str,
+            "bit_rate": Optional[int],
+            "keyframes": Optional[List[int]],  # 키프레임의 프레임 인덱스 (read_packets일 때)
+        }
+        """
+        if not os.path.exists(video_path):
+            raise ValueError(f"Cannot open video file: {video_path}")
+
+        cache_key = f"{self._content_hash(video_path)}-{'packets' if self.read_packets else 'header'}"
+        info = self._load_cached(cache_key)
+        if info is None:
+            info = self._probe(video_path)
+            self._save_cached(cache_key, info)
+
+        # 확장자는 내용이 같아도 달라질 수 있으므로 캐시하지 않음
+        _, ext = os.path.splitext(video_path)
+        return {**info, "video_type": ext.lower().replace('.', '')}
+
+    def _probe(self, video_path: str) -> dict:
+        options = {"select_streams": "v:0"}
+        if self.read_packets:
+            options["show_entries"] = "packet=pts,flags"
+        try:
+            probe = ffmpeg.probe(video_path, **options)
+        except ffmpeg.Error as e:
+            raise ValueError(f"Cannot open video file: {video_path}") from e
+        if not probe.get("streams"):
+            raise ValueError(f"No video stream: {video_path}")
+
+        stream = probe["streams"][0]
+        duration_sec = self._float(stream.get("duration")) or self._float(probe.get("format", {}).get("duration"))
+
+        keyframes = None
+        if self.read_packets:
+            frame_count, keyframes = self._frames_from_packets(probe.get("packets", []))
+        else:
+            frame_count = int(stream.get("nb_frames") or 0)
+        fps = parse_frame_rate(stream.get("avg_frame_rate")) or parse_frame_rate(stream.get("r_frame_rate"))
+        if self.read_packets and frame_count and duration_sec:
+            fps = frame_count / duration_sec
+        if not frame_count and fps and duration_sec:
+            # nb_frames가 없는 컨테이너(mkv, webm)에서 헤더만 읽은 경우의 추정값
+            frame_count = int(round(duration_sec * fps))
+
+        bit_rate = stream.get("bit_rate") or probe.get("format", {}).get("bit_rate")
+        return {
+            "frame_count": frame_count,
+            "fps": fps,
+            "codec": stream.get("codec_name"),
+            "duration_sec": duration_sec,
+            "width": stream.get("width"),
+            "height": stream.get("height"),
+            "rotation": self._rotation(stream),
+            "pix_fmt": stream.get("pix_fmt"),
+            "bit_rate": int(bit_rate) if bit_rate else None,
+            "keyframes": keyframes,
             "camera_angle": None,
             "video_quality": None,
-        }
\ No newline at end of file
+        }
+
+    @staticmethod
+    def _frames_from_packets(packets: List[dict]):
+        """패킷은 디코딩 순서이므로 pts로 정렬해 표시 순서의 키프레임 인덱스를 구합니다."""
+        order = sorted(
+            range(len(packets)),
+            key=lambda i: (packets[i].get("pts") is None, packets[i].get("pts") or 0, i),
+        )
+        keyframes = [
+            frame_index for frame_index, i in enumerate(order) if "K" in packets[i].get("flags", "")
+        ]
+        return len(packets), keyframes
+
+    @staticmethod
+    def _rotation(stream: dict) -> int:
+        rotation = stream.get("tags", {}).get("rotate")
+        for side_data in stream.get("side_data_list", []):
+            if "rotation" in side_data:
+                # displaymatrix의 rotation은 반시계 방향 기준
+                rotation = -float(side_data["rotation"])
+        return int(round(float(rotation or 0))) % 360
+
+    @staticmethod
+    def _float(value) -> Optional[float]:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+    def _content_hash(self, video_path: str) -> str:
+        identity = file_identity(video_path)
+        if identity in self._hashes:
+            return self._hashes[identity]
+        hash_path = os.path.join(self.cache_dir, "files", identity) if self.cache_dir else None
+        content_hash = None
+        if hash_path and os.path.exists(hash_path):
+            with open(hash_path) as f:
+                content_hash = f.read().strip()
+        if not content_hash:
+            content_hash = file_content_hash(video_path)
+            if hash_path:
+                os.makedirs(os.path.dirname(hash_path), exist_ok=True)
+                tmp_path = f"{hash_path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w") as f:
+                    f.write(content_hash)
+                os.replace(tmp_path, hash_path)
+        self._hashes[identity] = content_hash
+        return content_hash
+
+    def _load_cached(self, cache_key: str) -> Optional[dict]:
+        if cache_key in self._cache:
+            return self._cache[cache_key]
+        if not self.cache_dir:
+            return None
+        try:
+            with open(os.path.join(self.cache_dir, f"{cache_key}.json")) as f:
+                info = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self._cache[cache_key] = info
+        return info
+
+    def _save_cached(self, cache_key: str, info: dict):
+        self._cache[cache_key] = info
+        if not self.cache_dir:
+            return
+        cache_path = os.path.join(self.cache_dir, f"{cache_key}.json")
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(info, f)
+        os.replace(tmp_path, cache_path)
+
@@ -0,0 +1,244 @@
+import abc
+import json
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.entities.video import CameraAngle, VideoQuality
+from app.features.video_processor.frame_decoders import OpenCVFrameDecoder
+from app.features.video_processor.videoframe_handler import NaiveVideoFrameCurator, VideoFrameHandler
+
+
+# BGR -> 휘도 (ITU-R BT.601)
+LUMA_WEIGHTS = np.array([0.114, 0.587, 0.299], dtype=np.float32)
+
+
+@dataclass
+class FrameStatistics:
+    """샘플 프레임들의 픽셀 통계. 프레임별 값의 중앙값이라 일부 프레임의 장면 전환에 덜 민감합니다."""
+
+    brightness: float  # 평균 휘도 (0~255)
+    highlight: float  # 휘도 95 퍼센타일. 이 값도 낮으면 화면 전체가 어두움
+    shadow: float  # 휘도 5 퍼센타일. 이 값도 높으면 화면 전체가 날아감
+    contrast: float  # 휘도 표준편차
+    sharpness: float  # 라플라시안 분산. 흐리거나 초점이 안 맞으면 작음
+    edge_ratio: float  # 세로 방향 gradient / 가로 방향 gradient. 수평선이 많은 정면 뷰에서 큼
+    vertical_asymmetry: float  # (위 1/3 평균 - 아래 1/3 평균) / 평균 휘도
+    center_ratio: float  # 가운데 영역 평균 / 전체 평균 휘도
+
+    @classmethod
+    def from_frames(cls, frames: Sequence[np.ndarray]) -> "FrameStatistics":
+        """같은 크기의 BGR 프레임들을 (N, H, W)로 쌓아 프레임 루프 없이 계산합니다."""
+        luma = np.stack(frames).astype(np.float32) @ LUMA_WEIGHTS
+        num_frames, height, width = luma.shape
+        flat = luma.reshape(num_frames, -1)
+        mean = flat.mean(axis=1)
+        safe_mean = np.maximum(mean, 1.0)
+        shadow, highlight = np.percentile(flat, [5, 95], axis=1)
+
+        laplacian = (
+            luma[:, 1:-1, :-2] + luma[:, 1:-1, 2:] + luma[:, :-2, 1:-1] + luma[:, 2:, 1:-1]
+            - 4 * luma[:, 1:-1, 1:-1]
+        )
+        gradient_x = np.abs(np.diff(luma, axis=2)).mean(axis=(1, 2))
+        gradient_y = np.abs(np.diff(luma, axis=1)).mean(axis=(1, 2))
+
+        third = max(1, height // 3)
+        top, bottom = luma[:, :third].mean(axis=(1, 2)), luma[:, -third:].mean(axis=(1, 2))
+        center = luma[:, height // 4:height - height // 4, width // 4:width - width // 4].mean(axis=(1, 2))
+
+        return cls(
+            brightness=float(np.median(mean)),
+            highlight=float(np.median(highlight)),
+            shadow=float(np.median(shadow)),
+            contrast=float(np.median(flat.std(axis=1))),
+            sharpness=float(np.median(laplacian.var(axis=(1, 2)))),
+            edge_ratio=float(np.median(gradient_y / np.maximum(gradient_x, 1e-3))),
+            vertical_asymmetry=float(np.median((top - bottom) / safe_mean)),
+            center_ratio=float(np.median(center / safe_mean)),
+        )
+
+    def features(self) -> List[float]:
+        """카메라 앵글 분류기 입력. 스케일이 비슷하도록 정규화합니다."""
+        return [
+            self.brightness / 255,
+            self.contrast / 128,
+            self.edge_ratio,
+            self.vertical_asymmetry,
+            self.center_ratio,
+        ]
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class CameraAngleClassifier(abc.ABC):
+    @abc.abstractmethod
+    def predict(self, statistics: FrameStatistics) -> Optional[CameraAngle]:
+        pass
+
+
+class HeuristicCameraAngleClassifier(CameraAngleClassifier):
+    """라벨 데이터 없이 쓰는 기본 규칙입니다.
+
+    정면 뷰는 바닥/벽 경계 같은 수평 구조가 많아 세로 방향 gradient가 크고, 그 외에는 탑 뷰로 봅니다.
+    바닥 뷰는 픽셀 통계만으로 구분하기 어려워 ``NearestCentroidCameraAngleClassifier``를 학습해 사용합니다.
+    """
+
+    def __init__(self, front_edge_ratio: float = 1.3):
+        self.front_edge_ratio = front_edge_ratio
+
+    def predict(self, statistics: FrameStatistics) -> Optional[CameraAngle]:
+        if statistics.edge_ratio >= self.front_edge_ratio:
+            return CameraAngle.FRONT
+        return CameraAngle.TOP
+
+
+class NearestCentroidCameraAngleClassifier(CameraAngleClassifier):
+    """앵글별 ``FrameStatistics.features()`` 평균(centroid)에 가장 가까운 앵글을 고릅니다.
+
+    라벨이 붙은 비디오 몇 개로 ``fit``하고 ``save``한 JSON을 CAMERA_ANGLE_MODEL로 지정해 사용합니다.
+    """
+
+    def __init__(self, centroids: Dict[str, List[float]], scale: Optional[List[float]] = None):
+        self.centroids = {CameraAngle(angle): np.asarray(c, dtype=np.float64) for angle, c in centroids.items()}
+        self.scale = np.asarray(scale, dtype=np.float64) if scale is not None else None
+
+    @classmethod
+    def fit(cls, statistics: Sequence[FrameStatistics], angles: Sequence[str]) -> "NearestCentroidCameraAngleClassifier":
+        features = np.array([s.features() for s in statistics], dtype=np.float64)
+        labels = np.array([CameraAngle(angle).value for angle in angles])
+        # 특성별 표준편차로 나눠 거리 계산 시 한 특성이 지배하지 않도록 함
+        scale = np.maximum(features.std(axis=0), 1e-6)
+        centroids = {angle: features[labels == angle].mean(axis=0).tolist() for angle in np.unique(labels)}
+        return cls(centroids, scale.tolist())
+
+    @classmethod
+    def load(cls, path: str) -> "NearestCentroidCameraAngleClassifier":
+        with open(path) as f:
+            model = json.load(f)
+        return cls(model["centroids"], model.get("scale"))
+
+    def save(self, path: str):
+        with open(path, "w") as f:
+            json.dump({
+                "centroids": {angle.value: c.tolist() for angle, c in self.centroids.items()},
+                "scale": self.scale.tolist() if self.scale is not None else None,
+            }, f, indent=2)
+
+    def predict(self, statistics: FrameStatistics) -> Optional[CameraAngle]:
+        if not self.centroids:
+            return None
+        features = np.asarray(statistics.features(), dtype=np.float64)
+        scale = self.scale if self.scale is not None else 1.0
+        return min(self.centroids, key=lambda angle: np.linalg.norm((features - self.centroids[angle]) / scale))
+
+
+# 품질 미달 사유
+REASON_LOW_RESOLUTION = "low_resolution"
+REASON_TOO_DARK = "too_dark"
+REASON_TOO_BRIGHT = "too_bright"
+REASON_LOW_CONTRAST = "low_contrast"
+REASON_BLURRY = "blurry"
+REASON_WRONG_ANGLE = "wrong_angle"
+REASON_NO_FRAMES = "no_frames"
+
+
+@dataclass
+class QualityEstimate:
+    camera_angle: Optional[CameraAngle]
+    video_quality: VideoQuality
+    reasons: List[str] = field(default_factory=list)
+    statistics: Optional[FrameStatistics] = None
+
+    @property
+    def qualified(self) -> bool:
+        return self.video_quality == VideoQuality.QUALIFIED
+
+    def to_video_info(self) -> dict:
+        """``VideoParser.extract_info`` 결과의 camera_angle, video_quality 형식"""
+        return {
+            "camera_angle": self.camera_angle.value if self.camera_angle else None,
+            "video_quality": self.video_quality.value,
+        }
+
+
+class VideoQualityEstimator:
+    """몇 장의 축소 프레임으로 카메라 앵글과 학습/추론에 쓸 수 있는 품질인지 추정합니다.
+
+    해상도는 비디오 메타데이터로, 나머지는 ``FrameStatistics``로 판단합니다.
+    모든 프레임을 한 배열로 쌓아 numpy로 계산하므로 샘플 디코딩 외의 비용은 수 ms 수준입니다.
+    """
+
+    def __init__(
+        self,
+        num_samples: int = 8,
+        sample_size: int = 160,
+        min_short_side: int = 240,
+        min_highlight: float = 50.0,
+        max_shadow: float = 235.0,
+        min_contrast: float = 8.0,
+        min_sharpness: float = 20.0,
+        allowed_angles: Optional[Sequence[str]] = None,
+        angle_classifier: Optional[CameraAngleClassifier] = None,
+    ):
+        """
+        Args:
+            num_samples, sample_size: ``estimate``에서 디코딩할 프레임 수와 긴 변 크기
+            min_short_side: 원본 해상도의 짧은 변 최소값
+            min_highlight: 휘도 95 퍼센타일이 이보다 낮으면 너무 어두움
+            max_shadow: 휘도 5 퍼센타일이 이보다 높으면 너무 밝음
+            min_contrast: 휘도 표준편차 최소값
+            min_sharpness: sample_size로 줄인 프레임의 라플라시안 분산 최소값
+            allowed_angles: 허용하는 카메라 앵글 (None이면 모두 허용)
+            angle_classifier: 기본값은 ``HeuristicCameraAngleClassifier``
+        """
+        self.num_samples = num_samples
+        self.sample_size = sample_size
+        self.min_short_side = min_short_side
+        self.min_highlight = min_highlight
+        self.max_shadow = max_shadow
+        self.min_contrast = min_contrast
+        self.min_sharpness = min_sharpness
+        self.allowed_angles = {CameraAngle(angle) for angle in allowed_angles} if allowed_angles else None
+        self.angle_classifier = angle_classifier or HeuristicCameraAngleClassifier()
+
+    def estimate(self, video_path: str, video_info: dict) -> QualityEstimate:
+        """비디오에서 균등 간격으로 ``num_samples``장을 축소 디코딩해 추정합니다."""
+        handler = VideoFrameHandler(decoder=OpenCVFrameDecoder(target_size=self.sample_size, letterbox=False))
+        frame_indices = NaiveVideoFrameCurator(self.num_samples).select_indices(video_info["frame_count"])
+        frames = handler.extract_indices(video_path, frame_indices)
+        return self.estimate_frames(frames, video_info.get("width"), video_info.get("height"))
+
+    def estimate_frames(
+        self, frames: Sequence[np.ndarray], width: Optional[int] = None, height: Optional[int] = None
+    ) -> QualityEstimate:
+        """이미 디코딩한 샘플 프레임(예: ``ValidationResult.frames``)으로 추정합니다.
+
+        Args:
+            width, height: 원본 해상도. 없으면 해상도 검사를 건너뜁니다.
+        """
+        reasons = []
+        if width and height and min(width, height) < self.min_short_side:
+            reasons.append(REASON_LOW_RESOLUTION)
+        if not frames:
+            return QualityEstimate(None, VideoQuality.UNQUALIFIED, reasons + [REASON_NO_FRAMES])
+
+        statistics = FrameStatistics.from_frames(frames)
+        if statistics.highlight < self.min_highlight:
+            reasons.append(REASON_TOO_DARK)
+        if statistics.shadow > self.max_shadow:
+            reasons.append(REASON_TOO_BRIGHT)
+        if statistics.contrast < self.min_contrast:
+            reasons.append(REASON_LOW_CONTRAST)
+        elif statistics.sharpness < self.min_sharpness:
+            # 대비가 낮으면 라플라시안도 작으므로 흐림은 따로 판단하지 않음
+            reasons.append(REASON_BLURRY)
+
+        camera_angle = self.angle_classifier.predict(statistics)
+        if self.allowed_angles is not None and camera_angle not in self.allowed_angles:
+            reasons.append(REASON_WRONG_ANGLE)
+
+        video_quality = VideoQuality.UNQUALIFIED if reasons else VideoQuality.QUALIFIED
+        return QualityEstimate(camera_angle, video_quality, reasons, statistics)
@@ -1,25 +1,70 @@
 import os
-import shutil
-from glob import glob
+from abc import ABC, abstractmethod
+from typing import Optional
 
-class LocalUploader:
-    """Simple uploader that copies files or directories to a destination."""
+from app.features.video_processor.file_transfer import FileTransfer, TransferManifest
 
-    def _ensure_dir(self, dest: str):
-        os.makedirs(dest, exist_ok=True)
 
+class BaseUploader(ABC):
+    """비디오, 프레임, 추론 결과 파일을 업로드 저장소에 올립니다. 반환값은 업로드된 위치입니다."""
+
+    @abstractmethod
     def upload_video(self, file_path: str, dest_dir: str) -> str:
-        self._ensure_dir(dest_dir)
-        return shutil.copy(file_path, dest_dir)
+        pass
 
-    def upload_frames(self, frames_dir: str, dest_dir: str) -> str:
-        self._ensure_dir(dest_dir)
-        for frame in glob(os.path.join(frames_dir, '*')):
-            shutil.copy(frame, dest_dir)
-        return dest_dir
+    @abstractmethod
+    def upload_frames(self, frames_dir: str, dest_dir: str, manifest_path: Optional[str] = None) -> str:
+        pass
 
     def upload_csv(self, file_path: str, dest_dir: str) -> str:
         return self.upload_video(file_path, dest_dir)
 
     def upload_json(self, file_path: str, dest_dir: str) -> str:
         return self.upload_video(file_path, dest_dir)
+
+
+class LocalUploader(BaseUploader):
+    """Simple uploader that copies files or directories to a destination.
+
+    전송은 ``FileTransfer``가 담당하므로 같은 볼륨이면 hardlink, 아니면 커널 내 복사를 사용합니다.
+    """
+
+    def __init__(self, transfer: Optional[FileTransfer] = None, root: str = ""):
+        """
+        Args:
+            root: dest_dir 앞에 붙일 디렉토리 (``S3Uploader``의 prefix에 해당)
+        """
+        self.transfer = transfer or FileTransfer()
+        self.root = root
+        # 마지막 upload_frames의 전송 결과 (파일별 크기, 체크섬, 전송 방식)
+        self.last_manifest: Optional[TransferManifest] = None
+
+    def _ensure_dir(self, dest: str):
+        os.makedirs(dest, exist_ok=True)
+
+    def upload_video(self, file_path: str, dest_dir: str) -> str:
+        dest_dir = os.path.join(self.root, dest_dir)
+        self._ensure_dir(dest_dir)
+        return self.transfer.transfer_file(file_path, dest_dir).destination
+
+    def upload_frames(self, frames_dir: str, dest_dir: str, manifest_path: Optional[str] = None) -> str:
+        """frames_dir의 파일을 dest_dir로 동시에 전송합니다. manifest_path를 주면 전송 manifest를 저장합니다."""
+        dest_dir = os.path.join(self.root, dest_dir)
+        self.last_manifest = self.transfer.transfer_dir(frames_dir, dest_dir)
+        if manifest_path:
+            self.last_manifest.save(manifest_path)
+        return dest_dir
+
+
+def get_uploader() -> BaseUploader:
+    """UPLOAD_BACKEND(local|s3) 환경 변수에 맞는 업로더를 만듭니다."""
+    if os.getenv("UPLOAD_BACKEND", "local") == "s3":
+        from app.features.video_processor.s3_uploader import S3Uploader
+
+        return S3Uploader(
+            bucket=os.getenv("S3_BUCKET"),
+            prefix=os.getenv("S3_PREFIX", ""),
+            endpoint_url=os.getenv("S3_ENDPOINT_URL") or None,
+            max_concurrency=int(os.getenv("S3_UPLOAD_CONCURRENCY", 8)),
+        )
+    return LocalUploader(root=f"{os.getenv('DATA_STORAGE_PATH')}/uploads")
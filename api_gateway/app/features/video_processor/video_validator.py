@@ -0,0 +1,251 @@
+import importlib.util
+import os
+import struct
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import cv2
+import ffmpeg
+import numpy as np
+
+from app.features.video_processor.frame_decoders import Letterbox
+
+
+# 검증 실패 사유 (task.failed 이벤트의 reason으로 그대로 전달)
+REASON_EMPTY_FILE = "empty_file"
+REASON_TRUNCATED_CONTAINER = "truncated_container"
+REASON_MISSING_MOOV = "missing_moov"
+REASON_PROBE_FAILED = "probe_failed"
+REASON_NO_VIDEO_STREAM = "no_video_stream"
+REASON_IMPLAUSIBLE_DURATION = "implausible_duration"
+REASON_TRUNCATED_STREAM = "truncated_stream"
+REASON_UNDECODABLE_FRAMES = "undecodable_frames"
+REASON_NO_KEYFRAMES = "no_keyframes"
+
+
+@dataclass
+class ValidationResult:
+    valid: bool
+    reason: Optional[str] = None
+    detail: str = ""
+    duration_sec: Optional[float] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    # 샘플 시점(초)별 디코딩 성공 여부
+    samples: Dict[float, bool] = field(default_factory=dict)
+    # 디코딩한 샘플 프레임 (긴 변을 sample_size로 줄인 BGR). 품질 추정에 재사용
+    frames: List[np.ndarray] = field(default_factory=list, repr=False)
+
+    def to_dict(self) -> dict:
+        return {
+            "valid": self.valid,
+            "reason": self.reason,
+            "detail": self.detail,
+            "duration_sec": self.duration_sec,
+            "width": self.width,
+            "height": self.height,
+            "samples": {str(t): ok for t, ok in self.samples.items()},
+        }
+
+
+def scan_mp4_boxes(video_path: str) -> Optional[List[str]]:
+    """MP4/MOV 최상위 box 타입을 순서대로 반환합니다. ftyp로 시작하지 않으면 None입니다.
+
+    box 헤더만 읽고 본문은 건너뛰므로 파일 크기와 관계없이 몇 번의 read로 끝납니다.
+    box 크기가 파일 끝을 넘으면 마지막 타입 뒤에 "<truncated>"를 붙입니다.
+    """
+    file_size = os.path.getsize(video_path)
+    boxes = []
+    with open(video_path, "rb") as f:
+        offset = 0
+        while offset + 8 <= file_size:
+            f.seek(offset)
+            size, box_type = struct.unpack(">I4s", f.read(8))
+            box_type = box_type.decode("latin-1")
+            if not boxes and box_type != "ftyp":
+                return None
+            if size == 1:
+                # 64비트 largesize
+                size = struct.unpack(">Q", f.read(8))[0]
+            elif size == 0:
+                # 파일 끝까지 이어지는 box
+                size = file_size - offset
+            boxes.append(box_type)
+            if size < 8 or offset + size > file_size:
+                boxes.append("<truncated>")
+                break
+            offset += size
+    return boxes or None
+
+
+class VideoValidator:
+    """다운로드 직후 손상되거나 잘린 비디오를 빠르게 걸러냅니다.
+
+    컨테이너 구조(moov box), ffprobe의 길이, 타임라인 전체에 흩어진 몇 개 시점의
+    키프레임 디코딩을 확인합니다. 각 시점은 직전 키프레임으로 seek해 한 프레임만 디코딩하므로
+    일반적인 파일에서 1초보다 훨씬 짧게 끝납니다.
+    """
+
+    def __init__(
+        self,
+        num_samples: int = 5,
+        min_duration_sec: float = 0.5,
+        max_duration_sec: float = 6 * 60 * 60,
+        end_tolerance_sec: float = 2.0,
+        sample_size: int = 160,
+    ):
+        """
+        Args:
+            num_samples: 디코딩을 확인할 시점 수 (타임라인을 균등하게 나눈 구간의 가운데)
+            min_duration_sec, max_duration_sec: 허용하는 비디오 길이
+            end_tolerance_sec: 마지막 패킷 시각이 길이보다 이만큼 이상 짧으면 잘린 파일로 판단
+            sample_size: 결과에 담을 샘플 프레임의 긴 변 크기
+        """
+        self.num_samples = num_samples
+        self.min_duration_sec = min_duration_sec
+        self.max_duration_sec = max_duration_sec
+        self.end_tolerance_sec = end_tolerance_sec
+        self.sample_size = sample_size
+
+    def validate(self, video_path: str) -> ValidationResult:
+        if not os.path.exists(video_path) or os.path.getsize(video_path) == 0:
+            return ValidationResult(False, REASON_EMPTY_FILE, video_path)
+
+        boxes = scan_mp4_boxes(video_path)
+        if boxes is not None:
+            if "<truncated>" in boxes:
+                return ValidationResult(False, REASON_TRUNCATED_CONTAINER, f"boxes: {boxes}")
+            if "moov" not in boxes:
+                return ValidationResult(False, REASON_MISSING_MOOV, f"boxes: {boxes}")
+
+        try:
+            probe = ffmpeg.probe(video_path, select_streams="v:0")
+        except ffmpeg.Error as e:
+            stderr = e.stderr.decode(errors="replace").strip() if e.stderr else ""
+            return ValidationResult(False, REASON_PROBE_FAILED, stderr.splitlines()[-1] if stderr else "")
+        if not probe.get("streams"):
+            return ValidationResult(False, REASON_NO_VIDEO_STREAM)
+
+        duration_sec = self._duration(probe)
+        if duration_sec is None or not self.min_duration_sec <= duration_sec <= self.max_duration_sec:
+            return ValidationResult(
+                False, REASON_IMPLAUSIBLE_DURATION, f"duration: {duration_sec}", duration_sec=duration_sec
+            )
+
+        timestamps = [
+            round(duration_sec * (i + 0.5) / self.num_samples, 3) for i in range(self.num_samples)
+        ]
+        if importlib.util.find_spec("av") is not None:
+            # 헤더의 길이는 그대로인데 뒷부분이 잘린 파일은 seek가 앞쪽 키프레임으로 돌아가 디코딩은 성공하므로
+            # 마지막 패킷 시각을 따로 확인
+            last_time = self._last_packet_time(video_path, duration_sec)
+            if last_time is not None and last_time < duration_sec - self.end_tolerance_sec:
+                return ValidationResult(
+                    False, REASON_TRUNCATED_STREAM, f"last packet at {last_time:.3f} sec",
+                    duration_sec=duration_sec,
+                )
+            samples, keyframes, frames = self._decode_samples_pyav(video_path, timestamps)
+        else:
+            # OpenCV는 키프레임 여부를 알려주지 않으므로 디코딩 성공만 확인
+            samples, frames = self._decode_samples_opencv(video_path, timestamps)
+            keyframes = None
+
+        failed = [t for t, ok in samples.items() if not ok]
+        if failed:
+            return ValidationResult(
+                False, REASON_UNDECODABLE_FRAMES, f"failed at {failed} sec",
+                duration_sec=duration_sec, samples=samples,
+            )
+        if keyframes == 0:
+            return ValidationResult(False, REASON_NO_KEYFRAMES, duration_sec=duration_sec, samples=samples)
+        stream = probe["streams"][0]
+        return ValidationResult(
+            True, duration_sec=duration_sec, width=stream.get("width"), height=stream.get("height"),
+            samples=samples, frames=frames,
+        )
+
+    @staticmethod
+    def _duration(probe: dict) -> Optional[float]:
+        for value in (probe["streams"][0].get("duration"), probe.get("format", {}).get("duration")):
+            try:
+                if value is not None and float(value) > 0:
+                    return float(value)
+            except ValueError:
+                continue
+        return None
+
+    @staticmethod
+    def _last_packet_time(video_path: str, duration_sec: float) -> Optional[float]:
+        """끝 부분 직전 키프레임으로 seek한 뒤 디코딩 없이 패킷만 읽어 마지막 비디오 패킷의 끝 시각을 반환합니다."""
+        import av
+
+        try:
+            container = av.open(video_path)
+        except (av.error.FFmpegError, OSError):
+            return None
+
+        last_time = None
+        try:
+            stream = container.streams.video[0]
+            start_pts = stream.start_time or 0
+            container.seek(
+                start_pts + int(max(duration_sec - 1.0, 0) / stream.time_base),
+                stream=stream, backward=True, any_frame=False,
+            )
+            for packet in container.demux(stream):
+                if packet.pts is None:
+                    continue
+                end_pts = packet.pts - start_pts + (packet.duration or 0)
+                last_time = max(last_time or 0.0, float(end_pts * stream.time_base))
+        except (av.error.FFmpegError, OSError):
+            pass
+        finally:
+            container.close()
+        return last_time
+
+    def _decode_samples_pyav(self, video_path: str, timestamps: List[float]):
+        """각 시점 직전 키프레임으로 seek해 첫 프레임을 디코딩합니다. (시점별 성공 여부, 키프레임 수, 프레임)"""
+        import av
+
+        samples = {t: False for t in timestamps}
+        keyframes = 0
+        frames = []
+        try:
+            container = av.open(video_path)
+        except (av.error.FFmpegError, OSError):
+            return samples, keyframes, frames
+
+        try:
+            stream = container.streams.video[0]
+            start_pts = stream.start_time or 0
+            for t in timestamps:
+                try:
+                    container.seek(
+                        start_pts + int(t / stream.time_base), stream=stream, backward=True, any_frame=False
+                    )
+                    frame = next(container.decode(stream), None)
+                except (av.error.FFmpegError, OSError):
+                    continue
+                if frame is not None and frame.width > 0 and frame.height > 0:
+                    samples[t] = True
+                    keyframes += int(frame.key_frame)
+                    width, height = Letterbox.fit(frame.width, frame.height, self.sample_size, pad=False).resized_size
+                    frames.append(frame.to_ndarray(format="bgr24", width=width, height=height, interpolation="AREA"))
+        finally:
+            container.close()
+        return samples, keyframes, frames
+
+    def _decode_samples_opencv(self, video_path: str, timestamps: List[float]):
+        samples = {}
+        frames = []
+        cap = cv2.VideoCapture(video_path)
+        try:
+            for t in timestamps:
+                cap.set(cv2.CAP_PROP_POS_MSEC, t * 1000)
+                ret, frame = cap.read()
+                samples[t] = bool(ret) and frame is not None and frame.size > 0
+                if samples[t]:
+                    frames.append(Letterbox.fit(frame.shape[1], frame.shape[0], self.sample_size, pad=False).apply(frame))
+        finally:
+            cap.release()
+        return samples, frames
@@ -0,0 +1,346 @@
+import json
+from bisect import bisect_left
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from app.features.video_processor.videoframe_handler import (
+    Curator,
+    NaiveVideoFrameCurator,
+    StreamingFrameCurator,
+)
+
+
+def to_thumbnail(frame: np.ndarray, size: int = 16) -> np.ndarray:
+    """프레임을 size x size 흑백 썸네일(uint8)로 축소합니다."""
+    if frame.ndim == 3 and frame.shape[2] == 3:
+        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    elif frame.ndim == 3:
+        frame = frame[:, :, 0]
+    return cv2.resize(frame, (size, size), interpolation=cv2.INTER_AREA)
+
+
+def _sq_distances(embeddings: np.ndarray, sq_norms: np.ndarray, center: np.ndarray) -> np.ndarray:
+    # |x - c|^2 = |x|^2 - 2x·c + |c|^2 로 계산해 (N, d) 임시 배열을 만들지 않음
+    return np.maximum(sq_norms - 2 * (embeddings @ center) + center @ center, 0)
+
+
+def farthest_point_sampling(embeddings: np.ndarray, k: int) -> List[int]:
+    """서로 가장 멀리 떨어진 k개 임베딩의 위치를 반환합니다.
+
+    첫 점은 평균에서 가장 먼 점이고, 이후에는 이미 고른 점들과의 최소 거리가 가장 큰 점을
+    고릅니다.
+    """
+    n = len(embeddings)
+    if k >= n:
+        return list(range(n))
+    if k <= 0:
+        return []
+
+    sq_norms = np.einsum("ij,ij->i", embeddings, embeddings)
+    selected = [int(np.argmax(_sq_distances(embeddings, sq_norms, embeddings.mean(axis=0))))]
+    min_distances = _sq_distances(embeddings, sq_norms, embeddings[selected[0]])
+    # 이미 고른 점은 거리를 음수로 두어 같은 프레임만 남아도 중복 선택하지 않음
+    min_distances[selected[0]] = -1
+    for _ in range(k - 1):
+        position = int(np.argmax(min_distances))
+        selected.append(position)
+        min_distances = np.minimum(min_distances, _sq_distances(embeddings, sq_norms, embeddings[position]))
+        min_distances[position] = -1
+    return selected
+
+
+def kmeans_pp_sampling(embeddings: np.ndarray, k: int, rng: np.random.Generator) -> List[int]:
+    """k-means++ 시딩 방식으로 k개 임베딩의 위치를 반환합니다.
+
+    이미 고른 점과의 최소 거리 제곱에 비례하는 확률로 다음 점을 뽑으므로,
+    farthest point sampling보다 이상치(노이즈 프레임)에 덜 민감합니다.
+    """
+    n = len(embeddings)
+    if k >= n:
+        return list(range(n))
+    if k <= 0:
+        return []
+
+    sq_norms = np.einsum("ij,ij->i", embeddings, embeddings)
+    selected = [int(rng.integers(n))]
+    min_distances = _sq_distances(embeddings, sq_norms, embeddings[selected[0]])
+    for _ in range(k - 1):
+        total = min_distances.sum()
+        if total <= 0:
+            # 남은 프레임이 모두 이미 고른 프레임과 같으면 아직 고르지 않은 프레임에서 균등하게 뽑음
+            remaining = np.setdiff1d(np.arange(n), selected)
+            position = int(rng.choice(remaining))
+        else:
+            position = int(rng.choice(n, p=min_distances / total))
+        selected.append(position)
+        min_distances = np.minimum(min_distances, _sq_distances(embeddings, sq_norms, embeddings[position]))
+    return selected
+
+
+class DiversityFrameCurator(StreamingFrameCurator):
+    """
+    흑백 썸네일 임베딩이 서로 가장 다른 num_frames개 frame을 추출
+
+    정지 구간처럼 비슷한 프레임이 반복되는 구간에서는 적게, 장면 변화가 많은 구간에서는
+    많이 뽑힙니다. 프레임마다 썸네일만 남기므로 10만 프레임 비디오도
+    (10만, thumbnail_size^2) 크기의 배열 하나로 처리합니다.
+    """
+
+    def __init__(
+        self,
+        num_frames: int,
+        thumbnail_size: int = 16,
+        method: str = "farthest",
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            num_frames: 추출할 프레임 수
+            thumbnail_size: 썸네일 한 변의 픽셀 수
+            method: "farthest" (farthest point sampling) 또는 "kmeans++"
+            seed: "kmeans++" 샘플링 시드
+        """
+        if method not in ("farthest", "kmeans++"):
+            raise ValueError(f"Unsupported diversity method: {method}")
+        self.num_frames = num_frames
+        self.thumbnail_size = thumbnail_size
+        self.method = method
+        self.seed = seed
+
+    def select_stream(self, frames: Iterable[Tuple[int, np.ndarray]]) -> List[int]:
+        frame_indices = []
+        thumbnails = []
+        for frame_index, frame in frames:
+            frame_indices.append(frame_index)
+            thumbnails.append(to_thumbnail(frame, self.thumbnail_size))
+
+        if not thumbnails:
+            return []
+
+        return sorted(frame_indices[i] for i in self.select_thumbnails(np.stack(thumbnails)))
+
+    def select_thumbnails(self, thumbnails: np.ndarray) -> List[int]:
+        """(N, H, W) 썸네일 배열에서 고른 위치를 반환합니다."""
+        embeddings = thumbnails.reshape(len(thumbnails), -1).astype(np.float32) / 255.0
+        # 조명 변화보다 구도 변화를 보도록 프레임별 평균 밝기를 제거
+        embeddings -= embeddings.mean(axis=1, keepdims=True)
+
+        if self.method == "kmeans++":
+            return kmeans_pp_sampling(embeddings, self.num_frames, np.random.default_rng(self.seed))
+        return farthest_point_sampling(embeddings, self.num_frames)
+
+
+class MotionFrameCurator(StreamingFrameCurator):
+    """
+    움직임이 많은 frame일수록 높은 확률로 num_frames개 frame을 추출
+
+    축소한 흑백 프레임의 직전 프레임 대비 평균 절대 차이를 움직임 점수로 쓰고,
+    최근 window개 점수의 평균으로 평활화합니다. 메모리에는 직전 썸네일과 점수 버퍼만
+    남기므로 비디오 길이와 관계없이 프레임 몇 장 분량만 사용합니다.
+    """
+
+    def __init__(
+        self,
+        num_frames: int,
+        thumbnail_size: int = 64,
+        window: int = 5,
+        idle_weight: float = 0.1,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            num_frames: 추출할 프레임 수
+            thumbnail_size: 움직임 계산용 썸네일 한 변의 픽셀 수
+            window: 점수 평활화에 쓰는 최근 프레임 수
+            idle_weight: 정지 구간도 일부 뽑히도록 모든 프레임에 더하는 가중치 (평균 점수 대비 비율)
+            seed: 샘플링 시드
+        """
+        self.num_frames = num_frames
+        self.thumbnail_size = thumbnail_size
+        self.window = window
+        self.idle_weight = idle_weight
+        self.seed = seed
+
+    def motion_scores(self, frames: Iterable[Tuple[int, np.ndarray]]) -> Tuple[List[int], np.ndarray]:
+        """프레임을 한 번 순회하며 (frame_index 리스트, 움직임 점수 배열)을 반환합니다."""
+        frame_indices = []
+        scores = []
+        recent = deque(maxlen=self.window)
+        previous = None
+        for frame_index, frame in frames:
+            thumbnail = to_thumbnail(frame, self.thumbnail_size).astype(np.int16)
+            if previous is not None:
+                recent.append(float(np.abs(thumbnail - previous).mean()))
+            previous = thumbnail
+
+            frame_indices.append(frame_index)
+            scores.append(sum(recent) / len(recent) if recent else 0.0)
+        return frame_indices, np.asarray(scores, dtype=np.float64)
+
+    def select_stream(self, frames: Iterable[Tuple[int, np.ndarray]]) -> List[int]:
+        frame_indices, scores = self.motion_scores(frames)
+        if len(frame_indices) <= self.num_frames:
+            return frame_indices
+
+        weights = scores + self.idle_weight * (scores.mean() or 1.0)
+        rng = np.random.default_rng(self.seed)
+        positions = rng.choice(len(frame_indices), size=self.num_frames, replace=False, p=weights / weights.sum())
+        return sorted(frame_indices[i] for i in positions)
+
+
+def sharpness_scores(thumbnails: np.ndarray) -> np.ndarray:
+    """(B, H, W) 흑백 배치의 Laplacian 분산을 계산합니다. 값이 작을수록 흐린 프레임입니다."""
+    x = thumbnails.astype(np.float32)
+    laplacian = (
+        x[:, :-2, 1:-1] + x[:, 2:, 1:-1] + x[:, 1:-1, :-2] + x[:, 1:-1, 2:] - 4 * x[:, 1:-1, 1:-1]
+    )
+    return laplacian.var(axis=(1, 2))
+
+
+def exposure_scores(thumbnails: np.ndarray, clip_bins: int = 4) -> np.ndarray:
+    """(B, H, W) 흑백 배치의 노출 점수(0~1)를 계산합니다.
+
+    32구간 히스토그램에서 양 끝 clip_bins개 구간(너무 어둡거나 밝은 픽셀)을 제외한
+    픽셀 비율입니다. 배치 전체의 히스토그램을 bincount 한 번으로 계산합니다.
+    """
+    batch_size = len(thumbnails)
+    bins = (thumbnails.reshape(batch_size, -1) >> 3).astype(np.int64)
+    bins += 32 * np.arange(batch_size)[:, None]
+    histograms = np.bincount(bins.ravel(), minlength=32 * batch_size).reshape(batch_size, 32)
+    clipped = histograms[:, :clip_bins].sum(axis=1) + histograms[:, -clip_bins:].sum(axis=1)
+    return 1.0 - clipped / histograms.sum(axis=1)
+
+
+class QualityFrameCurator(StreamingFrameCurator):
+    """
+    흐리거나 노출이 맞지 않는 frame을 제외하고 num_frames개 frame을 균등하게 추출
+
+    후보 프레임 중 균등한 위치를 목표로 잡고, 목표 프레임이 기준 미달이면 가장 가까운
+    기준 통과 프레임으로 대체합니다. 통과 프레임이 부족하면 점수가 높은 순으로 채워
+    요청 프레임 수를 맞춥니다. 프레임별 점수는 ``scores``에 기록됩니다.
+    """
+
+    def __init__(
+        self,
+        num_frames: int,
+        min_sharpness: float = 20.0,
+        min_exposure: float = 0.6,
+        thumbnail_size: int = 128,
+        batch_size: int = 64,
+    ):
+        """
+        Args:
+            num_frames: 추출할 프레임 수
+            min_sharpness: 썸네일 Laplacian 분산 기준값
+            min_exposure: 노출 점수 기준값 (0~1)
+            thumbnail_size: 점수 계산용 썸네일 한 변의 픽셀 수
+            batch_size: 한 번에 점수를 계산할 썸네일 수
+        """
+        self.num_frames = num_frames
+        self.min_sharpness = min_sharpness
+        self.min_exposure = min_exposure
+        self.thumbnail_size = thumbnail_size
+        self.batch_size = batch_size
+        self.scores: Dict[int, Dict[str, float]] = {}
+
+    def score_stream(self, frames: Iterable[Tuple[int, np.ndarray]]) -> Tuple[List[int], np.ndarray, np.ndarray]:
+        """프레임을 한 번 순회하며 (frame_index 리스트, sharpness 배열, exposure 배열)을 반환합니다."""
+        frame_indices = []
+        sharpness = []
+        exposure = []
+        batch = []
+        for frame_index, frame in frames:
+            frame_indices.append(frame_index)
+            batch.append(to_thumbnail(frame, self.thumbnail_size))
+            if len(batch) == self.batch_size:
+                thumbnails = np.stack(batch)
+                sharpness.append(sharpness_scores(thumbnails))
+                exposure.append(exposure_scores(thumbnails))
+                batch = []
+        if batch:
+            thumbnails = np.stack(batch)
+            sharpness.append(sharpness_scores(thumbnails))
+            exposure.append(exposure_scores(thumbnails))
+
+        if not frame_indices:
+            return [], np.empty(0), np.empty(0)
+        return frame_indices, np.concatenate(sharpness), np.concatenate(exposure)
+
+    def select_stream(self, frames: Iterable[Tuple[int, np.ndarray]]) -> List[int]:
+        frame_indices, sharpness, exposure = self.score_stream(frames)
+        passed = (sharpness >= self.min_sharpness) & (exposure >= self.min_exposure)
+
+        targets = NaiveVideoFrameCurator(self.num_frames).select_indices(len(frame_indices))
+        used = np.zeros(len(frame_indices), dtype=bool)
+        available = np.flatnonzero(passed).tolist()
+        positions = []
+        for target in targets:
+            position = self._nearest_passed(target, available)
+            if position is not None:
+                used[position] = True
+                positions.append(position)
+
+        # 통과 프레임이 부족하면 남은 프레임 중 점수가 높은 순으로 채움
+        if len(positions) < len(targets):
+            quality = sharpness / max(self.min_sharpness, 1e-6) * exposure
+            for position in np.argsort(-quality):
+                if len(positions) == len(targets):
+                    break
+                if not used[position]:
+                    used[position] = True
+                    positions.append(int(position))
+
+        self.scores = {
+            frame_index: {
+                "sharpness": float(sharpness[i]),
+                "exposure": float(exposure[i]),
+                "passed": bool(passed[i]),
+                "selected": bool(used[i]),
+            }
+            for i, frame_index in enumerate(frame_indices)
+        }
+        return sorted(frame_indices[i] for i in positions)
+
+    @staticmethod
+    def _nearest_passed(target: int, available: List[int]) -> Optional[int]:
+        """target에서 가장 가까운 기준 통과 위치를 available(정렬된 미선택 위치)에서 꺼냅니다.
+
+        거리가 같으면 뒤쪽 위치를 고릅니다.
+        """
+        i = bisect_left(available, target)
+        if i > 0 and (i == len(available) or target - available[i - 1] < available[i] - target):
+            i -= 1
+        if i == len(available):
+            return None
+        return available.pop(i)
+
+    def save_scores(self, path: str):
+        """프레임별 점수와 기준값을 JSON으로 저장합니다. 기준값 튜닝에 사용합니다."""
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "min_sharpness": self.min_sharpness,
+                    "min_exposure": self.min_exposure,
+                    "frames": {str(frame_index): score for frame_index, score in self.scores.items()},
+                },
+                f,
+            )
+
+
+# 프레임 추출 요청의 curation 값과 큐레이터 매핑
+FRAME_CURATORS = {
+    "naive": NaiveVideoFrameCurator,
+    "diversity": DiversityFrameCurator,
+    "motion": MotionFrameCurator,
+    "quality": QualityFrameCurator,
+}
+
+
+def build_frame_curator(curation: str, num_frames: int) -> Curator:
+    """curation 이름에 해당하는 큐레이터를 생성합니다."""
+    if curation not in FRAME_CURATORS:
+        raise ValueError(f"Unsupported frame curation: {curation}")
+    return FRAME_CURATORS[curation](num_frames)
@@ -1,9 +1,19 @@
 import abc
-from typing import List
+import itertools
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from pathlib import Path
 
-# import cv2
+import cv2
 import numpy as np
+from actverse_common.frame_archive import FrameArchiveWriter
+
+from app.features.video_processor.frame_decoders import FrameDecoder, Letterbox, OpenCVFrameDecoder
 
 
 class VideoFrameCurator(abc.ABC):
@@ -11,27 +21,110 @@ class VideoFrameCurator(abc.ABC):
     def curate(self, frames: List[np.ndarray]) -> List[np.ndarray]:
         pass
 
+    def select(self, frames: List[np.ndarray]) -> List[int]:
+        """curate 결과가 입력 리스트의 몇 번째 프레임인지 반환합니다.
+
+        기본 구현은 반환된 배열 객체를 입력과 대조합니다. 새 배열을 만들어 반환하는
+        큐레이터는 이 메서드를 재정의해야 합니다.
+        """
+        positions = {id(frame): i for i, frame in enumerate(frames)}
+        return [positions[id(frame)] for frame in self.curate(frames)]
+
+
+class FrameIndexCurator(abc.ABC):
+    """디코딩 없이 비디오 메타데이터만으로 프레임 인덱스를 고르는 큐레이터입니다."""
+
+    @abc.abstractmethod
+    def plan(self, video_info: dict, frame_indices: List[int]) -> List[int]:
+        """후보 프레임 인덱스 중 남길 인덱스를 반환합니다.
+
+        Args:
+            video_info: ``VideoParser.extract_info`` 결과 (frame_count, fps, duration_sec 등)
+            frame_indices: 이전 단계에서 남은 후보 프레임 인덱스 (오름차순)
+        """
+        pass
+
+
+class StreamingFrameCurator(VideoFrameCurator):
+    """프레임을 한 번 순회하며 인덱스를 고르는 픽셀 기반 큐레이터입니다.
+
+    ``VideoFrameHandler.extract_curated``에서는 디코딩 중인 프레임을 그대로 받아
+    전체 프레임을 메모리에 올리지 않고, 프레임 리스트에도 그대로 적용할 수 있습니다.
+    """
+
+    @abc.abstractmethod
+    def select_stream(self, frames: Iterable[Tuple[int, np.ndarray]]) -> List[int]:
+        """``(frame_index, frame)``을 한 번 순회하고 남길 frame_index를 오름차순으로 반환합니다."""
+        pass
+
+    def select(self, frames: List[np.ndarray]) -> List[int]:
+        return self.select_stream(enumerate(frames))
+
+    def curate(self, frames: List[np.ndarray]) -> List[np.ndarray]:
+        return [frames[i] for i in self.select(frames)]
+
+
+Curator = Union[VideoFrameCurator, FrameIndexCurator]
 
-class CompositeCurator(VideoFrameCurator):
-    """여러 필터를 하나의 필터로 결합하는 컴포지트 필터 클래스입니다."""
 
-    def __init__(self, filters: List[VideoFrameCurator] = None):
+class CompositeCurator(VideoFrameCurator, FrameIndexCurator):
+    """여러 필터를 하나의 필터로 결합하는 컴포지트 필터 클래스입니다.
+
+    등록 순서와 관계없이 ``FrameIndexCurator`` 단계를 먼저 (등록 순서대로) 적용하고,
+    그 다음 픽셀 기반 단계를 등록 순서대로 적용합니다. 비디오에 적용하는
+    ``VideoFrameHandler.extract_curated``와 프레임 리스트에 적용하는 ``select``/``curate``가
+    같은 순서를 쓰므로, 인덱스 단계는 항상 디코딩 전에 실행됩니다.
+    """
+
+    def __init__(self, filters: List[Curator] = None):
         self.filters = filters or []
 
-    def add_curation(self, video_filter: VideoFrameCurator) -> "CompositeCurator":
+    def add_curation(self, video_filter: Curator) -> "CompositeCurator":
         """필터를 추가하고 자신을 반환하여 메서드 체이닝을 지원합니다."""
         self.filters.append(video_filter)
         return self
 
+    @property
+    def leaf_curators(self) -> List[Curator]:
+        """중첩된 CompositeCurator를 펼친 필터 목록입니다."""
+        leaves = []
+        for video_filter in self.filters:
+            if isinstance(video_filter, CompositeCurator):
+                leaves.extend(video_filter.leaf_curators)
+            else:
+                leaves.append(video_filter)
+        return leaves
+
+    @property
+    def index_curators(self) -> List[FrameIndexCurator]:
+        return [f for f in self.leaf_curators if isinstance(f, FrameIndexCurator)]
+
+    @property
+    def pixel_curators(self) -> List[VideoFrameCurator]:
+        return [f for f in self.leaf_curators if not isinstance(f, FrameIndexCurator)]
+
+    def plan(self, video_info: dict, frame_indices: Optional[List[int]] = None) -> List[int]:
+        """인덱스 기반 필터만 순차적으로 적용해 디코딩할 프레임 인덱스를 반환합니다."""
+        if frame_indices is None:
+            frame_indices = list(range(video_info["frame_count"]))
+        for index_curator in self.index_curators:
+            frame_indices = index_curator.plan(video_info, frame_indices)
+        return frame_indices
+
     def curate(self, frames: List[np.ndarray]) -> List[np.ndarray]:
         """모든 필터를 순차적으로 적용합니다."""
-        result = frames
-        for video_filter in self.filters:
-            result = video_filter.curate(result)
-        return result
+        return [frames[i] for i in self.select(frames)]
 
+    def select(self, frames: List[np.ndarray]) -> List[int]:
+        # 메타데이터 없이 리스트에 적용할 때는 프레임 수만 전달합니다.
+        positions = self.plan({"frame_count": len(frames)})
+        for pixel_curator in self.pixel_curators:
+            selected = pixel_curator.select([frames[i] for i in positions])
+            positions = [positions[i] for i in selected]
+        return positions
 
-class NaiveVideoFrameCurator(VideoFrameCurator):
+
+class NaiveVideoFrameCurator(VideoFrameCurator, FrameIndexCurator):
     """
     num_frames만큼 frame을 균등하게 추출
     """
@@ -40,27 +133,153 @@ class NaiveVideoFrameCurator(VideoFrameCurator):
         self.num_frames = num_frames
 
     def curate(self, frames: List[np.ndarray]) -> List[np.ndarray]:
-        filtered_frames = []
+        return [frames[i] for i in self.select(frames)]
+
+    def select(self, frames: List[np.ndarray]) -> List[int]:
+        return self.select_indices(len(frames))
+
+    def plan(self, video_info: dict, frame_indices: List[int]) -> List[int]:
+        return [frame_indices[i] for i in self.select_indices(len(frame_indices))]
 
+    def select_indices(self, total_frames: int) -> List[int]:
+        """전체 프레임 수만 보고 추출할 프레임 인덱스를 계산합니다.
+
+        디코딩 전에 인덱스를 정할 수 있으므로 ``VideoFrameHandler.iter_frames``와
+        함께 쓰면 필요한 프레임만 디코딩합니다.
+        """
         # 요청된 프레임 수가 원본 프레임 수보다 많으면 원본 프레임 수로 제한
-        actual_num_frames = min(self.num_frames, len(frames))
+        actual_num_frames = min(self.num_frames, total_frames)
 
         # 프레임이 없거나 요청 프레임 수가 0이면 빈 리스트 반환
-        if not frames or actual_num_frames <= 0:
+        if total_frames <= 0 or actual_num_frames <= 0:
             return []
 
         # 균등한 간격 계산
-        interval = max(1, len(frames) // actual_num_frames)
-        frame_index = 0
+        interval = max(1, total_frames // actual_num_frames)
+        return list(range(0, total_frames, interval))[:actual_num_frames]
 
-        while frame_index < len(frames) and len(filtered_frames) < actual_num_frames:
-            filtered_frames.append(frames[frame_index])
-            frame_index += interval
 
-        return filtered_frames
+# 저장 포맷별 확장자와 cv2.imencode 품질 파라미터
+IMAGE_FORMATS = {
+    "jpg": (".jpg", cv2.IMWRITE_JPEG_QUALITY),
+    "webp": (".webp", cv2.IMWRITE_WEBP_QUALITY),
+    "png": (".png", None),
+}
+
+
+@dataclass
+class FrameSaveResult:
+    output_path: str
+    num_frames: int
+    bytes_written: int
+    elapsed_sec: float
+
+    @property
+    def frames_per_sec(self) -> float:
+        return self.num_frames / self.elapsed_sec if self.elapsed_sec > 0 else 0.0
+
+
+@dataclass
+class FrameBatch:
+    """``save_batches``가 저장을 마친 배치 하나. files는 output_path 기준 파일명입니다."""
+    batch_index: int
+    start_index: int
+    files: List[str]
+    save_result: FrameSaveResult
+
+
+class FrameRetainer:
+    """스트리밍 큐레이터에 넘기는 프레임을 max_bytes 안에서 보관합니다.
+
+    용량을 넘으면 보관 간격을 두 배로 늘리고(보관된 프레임 중 간격에 맞지 않는 것은 버림)
+    이후에도 그 간격의 프레임만 보관하므로, 비디오 길이와 관계없이 전체 구간에 고르게 남습니다.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.stride = 1
+        self.nbytes = 0
+        self._frames: Dict[int, Tuple[int, np.ndarray]] = {}  # frame_index -> (순회 위치, 프레임)
+
+    def wrap(self, frames: Iterable[Tuple[int, np.ndarray]]) -> Iterator[Tuple[int, np.ndarray]]:
+        for position, (frame_index, frame) in enumerate(frames):
+            if self.max_bytes > 0 and position % self.stride == 0:
+                self._frames[frame_index] = (position, frame)
+                self.nbytes += frame.nbytes
+                self._shrink()
+            yield frame_index, frame
+
+    def pop(self, frame_indices: Iterable[int]) -> Dict[int, np.ndarray]:
+        """frame_indices 중 보관된 프레임을 반환하고 나머지는 버립니다."""
+        retained = {i: self._frames[i][1] for i in frame_indices if i in self._frames}
+        self._frames = {}
+        self.nbytes = 0
+        return retained
+
+    def _shrink(self):
+        while self.nbytes > self.max_bytes:
+            if len(self._frames) <= 1:
+                # 프레임 한 장도 담을 수 없으면 보관하지 않음
+                self._frames = {}
+                self.nbytes = 0
+                self.max_bytes = 0
+                return
+            self.stride *= 2
+            for frame_index, (position, frame) in list(self._frames.items()):
+                if position % self.stride:
+                    del self._frames[frame_index]
+                    self.nbytes -= frame.nbytes
 
 
 class VideoFrameHandler:
+    def __init__(
+        self,
+        seek_threshold: int = 120,
+        decoder: Optional[FrameDecoder] = None,
+        target_size: Optional[int] = None,
+        letterbox: bool = True,
+        retain_max_bytes: int = 0,
+    ):
+        """
+        Args:
+            seek_threshold: 다음 대상 프레임까지의 간격이 이 값보다 크면 grab 대신 seek합니다.
+                seek는 직전 키프레임부터 다시 디코딩하므로 GOP 길이 정도가 적당합니다.
+            decoder: 프레임 디코딩 백엔드 (기본값: OpenCV). ``frame_decoders.select_frame_decoder`` 참고
+            target_size: 기본 디코더에서 긴 변을 줄일 크기. decoder를 넘기면 decoder의 설정을 따릅니다.
+            letterbox: target_size x target_size 정사각형으로 패딩할지 여부
+            retain_max_bytes: ``StreamingFrameCurator``가 점수를 매기며 디코딩한 프레임을 보관할 최대 크기.
+                선택된 프레임이 보관되어 있으면 다시 디코딩하지 않습니다 (``FrameRetainer`` 참고).
+                기본값 0은 보관하지 않고 선택된 프레임만 다시 디코딩합니다.
+        """
+        self.seek_threshold = seek_threshold
+        self.retain_max_bytes = retain_max_bytes
+        self.decoder = decoder or OpenCVFrameDecoder(
+            seek_threshold=seek_threshold, target_size=target_size, letterbox=letterbox
+        )
+
+    def letterbox_for(self, video_info: dict) -> Optional[Letterbox]:
+        """디코더의 리사이즈 설정을 이 비디오에 적용했을 때의 변환 정보입니다.
+
+        저장된 프레임의 좌표를 원본 비디오 좌표로 되돌릴 때 사용하며, 리사이즈하지 않으면 None입니다.
+        """
+        width, height = video_info.get("width"), video_info.get("height")
+        if not width or not height:
+            return None
+        # 디코더는 회전 메타데이터를 적용한 프레임을 반환하므로 90도 회전이면 가로세로를 바꿈
+        if video_info.get("rotation", 0) % 180:
+            width, height = height, width
+        return self.decoder.letterbox_for(width, height)
+
+    def frame_shape(self, video_info: dict) -> Tuple[int, int, int]:
+        """디코더가 반환할 프레임의 (height, width, channels). 공유 메모리 링의 슬롯 크기로 사용합니다."""
+        letterbox = self.letterbox_for(video_info)
+        if letterbox is not None:
+            return letterbox.height, letterbox.width, 3
+        width, height = video_info["width"], video_info["height"]
+        if video_info.get("rotation", 0) % 180:
+            width, height = height, width
+        return height, width, 3
+
     def extract(self, video_path: str) -> List[np.ndarray]:
         cap = cv2.VideoCapture(video_path)
 
@@ -77,11 +296,95 @@ class VideoFrameHandler:
 
         return frames
 
+    def iter_frames(
+        self, video_path: str, frame_indices: Iterable[int]
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+        """지정한 인덱스의 프레임만 ``(frame_index, frame)`` 형태로 하나씩 반환합니다.
+
+        실제 디코딩은 ``self.decoder``(기본값: ``OpenCVFrameDecoder``)가 담당합니다.
+        """
+        return self.decoder.iter_frames(video_path, frame_indices)
+
+    def extract_indices(self, video_path: str, frame_indices: Iterable[int]) -> List[np.ndarray]:
+        """지정한 인덱스의 프레임만 디코딩해 리스트로 반환합니다."""
+        return [frame for _, frame in self.iter_frames(video_path, frame_indices)]
+
     def curate(
         self, frames: List[np.ndarray], frame_curator: VideoFrameCurator, prediction=None
     ) -> List[np.ndarray]:
         return frame_curator.curate(frames)
 
+    def extract_curated(
+        self, video_path: str, frame_curator: Curator, video_info: dict
+    ) -> Tuple[List[int], List[np.ndarray]]:
+        """인덱스 기반 큐레이션을 먼저 적용하고, 남은 프레임만 디코딩해 픽셀 기반 큐레이션을 적용합니다.
+
+        앞쪽의 ``StreamingFrameCurator`` 단계는 디코딩 중인 프레임을 바로 받으므로
+        프레임 리스트를 만들지 않고, 그 외의 픽셀 기반 단계부터 프레임을 메모리에 올립니다.
+
+        Returns:
+            (선택된 프레임 인덱스 리스트, 프레임 리스트)
+        """
+        frame_indices, pixel_curators = self._plan(frame_curator, video_info)
+
+        frames = None
+        # 스트리밍 단계에서 디코딩한 프레임 중 보관된 것은 다시 디코딩하지 않음
+        retained: Dict[int, np.ndarray] = {}
+        for pixel_curator in pixel_curators:
+            if frames is None and isinstance(pixel_curator, StreamingFrameCurator):
+                retainer = FrameRetainer(self.retain_max_bytes)
+                frame_indices = pixel_curator.select_stream(retainer.wrap(self.iter_frames(video_path, frame_indices)))
+                retained = retainer.pop(frame_indices)
+                continue
+
+            if frames is None:
+                frame_indices, frames = self._decode(video_path, frame_indices, retained)
+            positions = pixel_curator.select(frames)
+            frame_indices = [frame_indices[i] for i in positions]
+            frames = [frames[i] for i in positions]
+
+        if frames is None:
+            frame_indices, frames = self._decode(video_path, frame_indices, retained)
+        return frame_indices, frames
+
+    def iter_curated(
+        self, video_path: str, frame_curator: Curator, video_info: dict
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+        """``extract_curated``와 같은 결과를 ``(frame_index, frame)``으로 하나씩 반환합니다.
+
+        인덱스 기반 큐레이션만 있으면 디코딩되는 대로 바로 반환하므로, 저장/업로드를 디코딩과
+        겹칠 수 있습니다. 픽셀 기반 큐레이션이 있으면 전체 선택이 끝난 뒤에 반환합니다.
+        """
+        frame_indices, pixel_curators = self._plan(frame_curator, video_info)
+        if not pixel_curators:
+            return self.iter_frames(video_path, frame_indices)
+        return zip(*self.extract_curated(video_path, frame_curator, video_info))
+
+    def _plan(self, frame_curator: Curator, video_info: dict) -> Tuple[List[int], List[VideoFrameCurator]]:
+        """인덱스 기반 큐레이션을 적용한 프레임 인덱스와 남은 픽셀 기반 큐레이터를 반환합니다."""
+        frame_indices = list(range(video_info["frame_count"]))
+        if isinstance(frame_curator, CompositeCurator):
+            index_curators, pixel_curators = frame_curator.index_curators, frame_curator.pixel_curators
+        elif isinstance(frame_curator, FrameIndexCurator):
+            index_curators, pixel_curators = [frame_curator], []
+        else:
+            index_curators, pixel_curators = [], [frame_curator]
+
+        for index_curator in index_curators:
+            frame_indices = index_curator.plan(video_info, frame_indices)
+        return frame_indices, pixel_curators
+
+    def _decode(
+        self, video_path: str, frame_indices: List[int], retained: Optional[Dict[int, np.ndarray]] = None
+    ) -> Tuple[List[int], List[np.ndarray]]:
+        """frame_indices의 프레임을 반환합니다. retained에 있는 프레임은 디코딩하지 않습니다."""
+        decoded = dict(retained or {})
+        missing = [frame_index for frame_index in frame_indices if frame_index not in decoded]
+        if missing:
+            decoded.update(self.iter_frames(video_path, missing))
+        frame_indices = [frame_index for frame_index in frame_indices if frame_index in decoded]
+        return frame_indices, [decoded[frame_index] for frame_index in frame_indices]
+
     def save(self, frames: List[np.ndarray], output_path: str):
         """저장된 프레임들을 개별 이미지 파일로 저장합니다.
 
@@ -111,5 +414,247 @@ class VideoFrameHandler:
 
         return str(output_dir)
 
+    def save_parallel(
+        self,
+        frames: Iterable[np.ndarray],
+        output_path: str,
+        max_workers: Optional[int] = None,
+        image_format: str = "jpg",
+        quality: int = 95,
+        start_index: int = 0,
+    ) -> FrameSaveResult:
+        """프레임을 스레드 풀에서 병렬로 인코딩해 저장합니다.
+
+        cv2 인코딩은 GIL을 해제하므로 스레드만으로 병렬화됩니다. 대기 중인 작업 수를
+        ``max_workers * 2``로 제한해, 제너레이터를 넘기면 메모리에는 그만큼의 프레임만 남습니다.
+
+        Args:
+            frames: 저장할 프레임 (리스트 또는 이터레이터)
+            output_path: 저장할 디렉토리 경로
+            max_workers: 인코딩 스레드 수 (기본값: CPU 코어 수)
+            image_format: "jpg", "webp", "png" 중 하나
+            quality: jpg/webp 품질 (0~100), png에서는 무시
+            start_index: 첫 프레임의 파일 번호
+        """
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"Unsupported image format: {image_format}")
+        extension, quality_flag = IMAGE_FORMATS[image_format]
+        params = [quality_flag, int(quality)] if quality_flag is not None else []
+
+        output_dir = Path(output_path)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        max_workers = max_workers or os.cpu_count() or 1
+        max_pending = max_workers * 2
+
+        started = time.perf_counter()
+        num_frames = 0
+        bytes_written = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = set()
+            for i, frame in enumerate(frames, start=start_index):
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    bytes_written += sum(future.result() for future in done)
+
+                frame_path = output_dir / f"frame_{i:04d}{extension}"
+                pending.add(executor.submit(self._encode_and_write, frame, frame_path, extension, params))
+                num_frames += 1
+
+            bytes_written += sum(future.result() for future in wait(pending).done)
+
+        if num_frames == 0:
+            raise ValueError("No frames to save")
+
+        return FrameSaveResult(
+            output_path=str(output_dir),
+            num_frames=num_frames,
+            bytes_written=bytes_written,
+            elapsed_sec=time.perf_counter() - started,
+        )
+
+    def save_archive(
+        self,
+        frames: Iterable[np.ndarray],
+        output_path: str,
+        max_workers: Optional[int] = None,
+        image_format: str = "jpg",
+        quality: int = 95,
+        start_index: int = 0,
+        shard_max_frames: int = 1000,
+        writer: Optional[FrameArchiveWriter] = None,
+    ) -> FrameSaveResult:
+        """프레임을 개별 파일 대신 tar 샤드(``actverse_common.frame_archive``)에 저장합니다.
+
+        인코딩은 ``save_parallel``처럼 스레드 풀에서 하고, 샤드에는 순서대로 추가합니다.
+        파일명은 ``save_parallel``과 같아 ``FrameArchive.materialize``로 풀면 같은 디렉토리가 됩니다.
+
+        Args:
+            shard_max_frames: 샤드 하나에 넣을 프레임 수
+            writer: 이어서 쓸 writer (``save_batches``에서 사용). 넘기면 닫지 않습니다.
+        """
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"Unsupported image format: {image_format}")
+        extension, quality_flag = IMAGE_FORMATS[image_format]
+        params = [quality_flag, int(quality)] if quality_flag is not None else []
+
+        archive_writer = writer or FrameArchiveWriter(output_path, shard_max_frames=shard_max_frames)
+        max_workers = max_workers or os.cpu_count() or 1
+        max_pending = max_workers * 2
+
+        started = time.perf_counter()
+        num_frames = 0
+        bytes_written = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # 완료 순서와 관계없이 저장 순서대로 샤드에 추가
+            pending = deque()
+
+            def append_oldest():
+                name, future = pending.popleft()
+                data = future.result()
+                archive_writer.add(name, data)
+                return len(data)
+
+            for i, frame in enumerate(frames, start=start_index):
+                if len(pending) >= max_pending:
+                    bytes_written += append_oldest()
+                pending.append((f"frame_{i:04d}{extension}", executor.submit(self._encode, frame, extension, params)))
+                num_frames += 1
+
+            while pending:
+                bytes_written += append_oldest()
+
+        if writer is None:
+            archive_writer.close()
+        if num_frames == 0:
+            raise ValueError("No frames to save")
+
+        return FrameSaveResult(
+            output_path=str(output_path),
+            num_frames=num_frames,
+            bytes_written=bytes_written,
+            elapsed_sec=time.perf_counter() - started,
+        )
+
+    def save_batches(
+        self,
+        frames: Iterable[np.ndarray],
+        output_path: str,
+        batch_size: int,
+        image_format: str = "jpg",
+        archive: bool = False,
+        **save_options,
+    ) -> Iterator[FrameBatch]:
+        """프레임을 ``batch_size``장씩 ``save_parallel``로 저장하고, 배치 저장이 끝날 때마다 반환합니다.
+
+        제너레이터를 넘기면 다음 배치를 디코딩하기 전에 호출자가 저장된 파일을 바로 넘겨줄 수 있습니다.
+        파일 번호는 배치를 이어서 매기므로 전체를 ``save_parallel``로 저장한 것과 같습니다.
+
+        Args:
+            archive: True면 ``save_archive``로 배치마다 샤드 하나씩 저장합니다.
+                배치를 반환할 때는 샤드와 인덱스가 기록된 상태입니다.
+            save_options: ``save_parallel``에 그대로 전달 (max_workers, quality)
+
+        Raises:
+            ValueError: batch_size가 0 이하이거나 지원하지 않는 image_format이면 프레임을 읽기 전에 발생
+        """
+        if batch_size <= 0:
+            raise ValueError(f"batch_size must be positive: {batch_size}")
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"Unsupported image format: {image_format}")
+        return self._iter_batches(frames, output_path, batch_size, image_format, archive, save_options)
+
+    def _iter_batches(
+        self,
+        frames: Iterable[np.ndarray],
+        output_path: str,
+        batch_size: int,
+        image_format: str,
+        archive: bool,
+        save_options: dict,
+    ) -> Iterator[FrameBatch]:
+        extension, _ = IMAGE_FORMATS[image_format]
+        writer = FrameArchiveWriter(output_path, shard_max_frames=batch_size) if archive else None
+
+        frames = iter(frames)
+        start_index = 0
+        for batch_index in itertools.count():
+            batch = list(itertools.islice(frames, batch_size))
+            if not batch:
+                break
+            if writer is not None:
+                save_result = self.save_archive(
+                    batch, output_path, image_format=image_format, start_index=start_index, writer=writer,
+                    **save_options,
+                )
+                writer.close_shard()
+            else:
+                save_result = self.save_parallel(
+                    batch, output_path, image_format=image_format, start_index=start_index, **save_options
+                )
+            yield FrameBatch(
+                batch_index=batch_index,
+                start_index=start_index,
+                files=[f"frame_{i:04d}{extension}" for i in range(start_index, start_index + len(batch))],
+                save_result=save_result,
+            )
+            start_index += len(batch)
+
+        if writer is not None:
+            writer.close()
+        if start_index == 0:
+            raise ValueError("No frames to save")
+
+    def save_manifest(
+        self,
+        frame_indices: List[int],
+        output_path: str,
+        image_format: str = "jpg",
+        start_index: int = 0,
+        source_frame_indices: Optional[List[int]] = None,
+        **metadata,
+    ) -> str:
+        """저장된 이미지 파일과 원본 비디오 프레임 인덱스의 대응을 ``frames_manifest.json``으로 저장합니다.
+
+        파일명은 ``save_parallel``과 같은 규칙(``frame_{번호:04d}{확장자}``)을 따릅니다.
+        metadata는 그대로 manifest 최상위에 기록됩니다 (예: extraction_mode).
+        변환본에서 추출했으면 source_frame_indices로 변환 전 원본의 프레임 인덱스를 함께 기록합니다.
+        """
+        extension, _ = IMAGE_FORMATS[image_format]
+        frames = [
+            {"file": f"frame_{i:04d}{extension}", "frame_index": int(frame_index)}
+            for i, frame_index in enumerate(frame_indices, start=start_index)
+        ]
+        if source_frame_indices is not None:
+            for frame, source_frame_index in zip(frames, source_frame_indices):
+                frame["source_frame_index"] = int(source_frame_index)
+        manifest = {**metadata, "frames": frames}
+        manifest_path = os.path.join(output_path, "frames_manifest.json")
+        with open(manifest_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        return manifest_path
+
+    @staticmethod
+    def _encode(frame: np.ndarray, extension: str, params: List[int]) -> bytes:
+        # 프레임이 흑백인 경우 컬러로 변환
+        if len(frame.shape) == 2 or frame.shape[2] == 1:
+            frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+
+        ok, encoded = cv2.imencode(extension, frame, params)
+        if not ok:
+            raise ValueError("Failed to encode frame")
+        return encoded.tobytes()
+
+    @classmethod
+    def _encode_and_write(cls, frame: np.ndarray, frame_path: Path, extension: str, params: List[int]) -> int:
+        try:
+            data = cls._encode(frame, extension, params)
+        except ValueError:
+            raise ValueError(f"Failed to encode frame: {frame_path}")
+
+        with open(frame_path, "wb") as f:
+            f.write(data)
+        return len(data)
+
     def overlay_keypoints(self, frames, keypoints):
         pass
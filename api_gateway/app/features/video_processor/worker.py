@@ -1,13 +1,33 @@
+import itertools
 import json
 import os
 import time
 import logging
 import pika
-from typing import Dict, Any
+from typing import Any, Dict, Optional
 from datetime import datetime
 
-from app.features.video_processor.video_downloader import VercelVideoDownloader
-from app.features.video_processor.videoframe_handler import VideoFrameHandler, NaiveVideoFrameCurator
+from app.features.video_processor.video_downloader import RangedVideoDownloader
+from app.features.video_processor.video_cache import VideoBlobCache
+from app.features.video_processor.video_converter import (
+    ConversionResult,
+    FFmpegVideoConverter,
+    convert_for_stages,
+    convert_stream_for_stage,
+    find_conversion,
+)
+from app.features.video_processor.frame_cache import CachedFrameDecoder
+from app.features.video_processor.frame_decoders import build_frame_decoder
+from app.features.video_processor.keyframe_extractor import KeyframeExtractor
+from app.features.video_processor.videoframe_handler import FrameSaveResult, VideoFrameHandler
+from app.features.video_processor.videoframe_curator import QualityFrameCurator, build_frame_curator
+from app.features.video_processor.video_parser import FFprobeVideoParser, OpenCVVideoParser
+from app.features.video_processor.video_validator import VideoValidator
+from app.features.video_processor.video_quality_estimator import (
+    NearestCentroidCameraAngleClassifier,
+    VideoQualityEstimator,
+)
+from app.features.video_processor.segmented_extractor import SegmentedVideoFrameHandler
 from actverse_common.logging import (
     setup_logger, 
     log_event_received, 
@@ -17,8 +37,12 @@ from actverse_common.logging import (
 from actverse_common.events import (
     EVENT_VIDEO_DOWNLOAD_REQUESTED,
     EVENT_VIDEO_DOWNLOADED,
+    EVENT_VIDEO_VALIDATION_REQUESTED,
+    EVENT_VIDEO_VALIDATED,
     EVENT_FRAMES_EXTRACTION_REQUESTED,
-    EVENT_FRAMES_EXTRACTED
+    EVENT_FRAMES_EXTRACTED,
+    EVENT_FRAMES_BATCH_EXTRACTED,
+    EVENT_TASK_FAILED
 )
 from actverse_common.messaging import (
     publish_event, 
@@ -32,11 +56,97 @@ load_dotenv()
 # 로깅 설정                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    
 logger = setup_logger(service_name="video_processor")
 
-vercel_downloader = VercelVideoDownloader()
+video_downloader = RangedVideoDownloader(num_connections=int(os.getenv("DOWNLOAD_CONNECTIONS", 4)))
+
+
+def get_video_cache():
+    """태스크 간 공유하는 비디오 캐시. VIDEO_CACHE_MAX_BYTES가 0이면 사용하지 않습니다."""
+    max_bytes = int(os.getenv("VIDEO_CACHE_MAX_BYTES", 20 * 1024 ** 3))
+    if max_bytes <= 0:
+        return None
+    return VideoBlobCache(f"{os.getenv('DATA_STORAGE_PATH')}/cache/videos", max_bytes)
+
+
+_video_parser = None
+
+
+def get_video_parser():
+    """VIDEO_PARSER=ffprobe(기본값)|opencv. ffprobe 결과는 {DATA_STORAGE_PATH}/cache/probe에 캐시됩니다."""
+    global _video_parser
+    if _video_parser is None:
+        if os.getenv("VIDEO_PARSER", "ffprobe") == "opencv":
+            _video_parser = OpenCVVideoParser()
+        else:
+            _video_parser = FFprobeVideoParser(cache_dir=f"{os.getenv('DATA_STORAGE_PATH')}/cache/probe")
+    return _video_parser
+
+
+def get_transcode_stages():
+    return [stage for stage in os.getenv("TRANSCODE_STAGES", "").split(",") if stage]
+
+
+def get_stream_convert_stage():
+    """STREAM_CONVERT=true면 다운로드하면서 바로 변환할 단계(TRANSCODE_STAGES의 첫 단계)를 반환합니다."""
+    stages = get_transcode_stages()
+    if os.getenv("STREAM_CONVERT", "false").lower() != "true" or not stages:
+        return None
+    return stages[0]
+
+
+def _validated_streamed_conversions(data: Dict[str, Any], duration_sec: Optional[float]) -> Dict[str, ConversionResult]:
+    """다운로드 단계에서 스트림으로 변환한 결과 중 검증을 통과한 것만 반환합니다.
+
+    변환본이 손상되었거나 원본보다 짧으면(파이프 입력이 중간에 끊긴 경우 등) 지우고,
+    convert_for_stages가 원본 파일로 다시 변환하도록 합니다.
+    """
+    validator = VideoValidator(num_samples=int(os.getenv("VALIDATION_SAMPLES", 5)))
+    converted = {}
+    for stage, entry in (data.get("streamed_conversions") or {}).items():
+        result = ConversionResult(entry["output_file"], entry["mode"])
+        check = validator.validate(result.output_file)
+        same_length = duration_sec is None or (
+            check.duration_sec is not None and abs(check.duration_sec - duration_sec) <= 1.0
+        )
+        if check.valid and same_length:
+            converted[stage] = result
+            continue
+        logger.warning(f"스트림 변환본 검증 실패, 원본 파일로 다시 변환: {result.output_file} ({check.reason})")
+        if os.path.exists(result.output_file):
+            os.remove(result.output_file)
+    return converted
+
+
+def _merge_save_results(total: FrameSaveResult, batch: FrameSaveResult) -> FrameSaveResult:
+    """배치별 저장 결과를 합칩니다. total이 None이면 batch를 그대로 반환합니다."""
+    if total is None:
+        return batch
+    return FrameSaveResult(
+        output_path=total.output_path,
+        num_frames=total.num_frames + batch.num_frames,
+        bytes_written=total.bytes_written + batch.bytes_written,
+        elapsed_sec=total.elapsed_sec + batch.elapsed_sec,
+    )
+
+_quality_estimator = None
+
+
+def get_quality_estimator():
+    """CAMERA_ANGLE_MODEL이 있으면 학습된 앵글 분류기를, 없으면 기본 규칙을 사용합니다."""
+    global _quality_estimator
+    if _quality_estimator is None:
+        model_path = os.getenv("CAMERA_ANGLE_MODEL")
+        allowed_angles = [angle for angle in os.getenv("ALLOWED_CAMERA_ANGLES", "").split(",") if angle]
+        _quality_estimator = VideoQualityEstimator(
+            min_short_side=int(os.getenv("MIN_VIDEO_SHORT_SIDE", 240)),
+            allowed_angles=allowed_angles or None,
+            angle_classifier=NearestCentroidCameraAngleClassifier.load(model_path) if model_path else None,
+        )
+    return _quality_estimator
 
 # 구독할 이벤트
 SUBSCRIBE_EVENTS = [
     EVENT_VIDEO_DOWNLOAD_REQUESTED,  # 비디오 다운로드 요청 이벤트 구독
+    EVENT_VIDEO_VALIDATION_REQUESTED,  # 비디오 검증 요청 이벤트 구독
     EVENT_FRAMES_EXTRACTION_REQUESTED  # 프레임 추출 요청 이벤트 구독
 ]
 
@@ -49,7 +159,23 @@ def process_video_download_request(data: Dict[str, Any]):
     download_path = data.get("download_path", f"/app/data_storage/videos/{task_id}")
     
     try:
-        downloaded_file_name = vercel_downloader.download(original_video_path, download_path)
+        streamed_conversions = {}
+        stream_stage = get_stream_convert_stage()
+        video_cache = get_video_cache()
+        if stream_stage is not None:
+            # 다운로드와 첫 단계 변환을 동시에 진행. 원본도 함께 저장해 검증과 나머지 단계 변환에 사용
+            file_name, chunks = video_downloader.stream(original_video_path)
+            downloaded_file_name = os.path.join(download_path, file_name)
+            os.makedirs(download_path, exist_ok=True)
+            result = convert_stream_for_stage(
+                chunks, downloaded_file_name, os.path.join(download_path, "converted"), stream_stage
+            )
+            streamed_conversions[stream_stage] = {"output_file": result.output_file, "mode": result.mode}
+        elif video_cache is not None:
+            downloaded_file_name = video_cache.fetch(original_video_path, download_path, video_downloader)
+        else:
+            downloaded_file_name = video_downloader.download(original_video_path, download_path)
+
         
         
         # 메타데이터 저장
@@ -68,6 +194,8 @@ def process_video_download_request(data: Dict[str, Any]):
             "user_id": user_id,
             "downloaded_video_path": downloaded_file_name,
             "original_video_path": original_video_path,
+            "download_path": download_path,
+            "streamed_conversions": streamed_conversions,
             "status": "completed"
         })
         
@@ -77,39 +205,278 @@ def process_video_download_request(data: Dict[str, Any]):
         return False
 
 
+def process_video_validation_request(data: Dict[str, Any]):
+    """비디오 검증 요청 이벤트 처리
+
+    손상되거나 잘린 비디오는 변환/프레임 추출 전에 사유와 함께 태스크를 실패시키고,
+    통과한 비디오만 단계별 프로파일로 변환해 다음 단계로 넘깁니다.
+    """
+    task_id = data.get("task_id")
+    user_id = data.get("user_id")
+    downloaded_video_path = data.get("downloaded_video_path")
+    download_path = data.get("download_path", os.path.dirname(downloaded_video_path or ""))
+
+    try:
+        result = VideoValidator(num_samples=int(os.getenv("VALIDATION_SAMPLES", 5))).validate(downloaded_video_path)
+        if not result.valid:
+            logger.warning(f"비디오 검증 실패: {downloaded_video_path}, 사유: {result.reason} {result.detail}")
+            publish_event(logger, EVENT_TASK_FAILED, {
+                "task_id": task_id,
+                "user_id": user_id,
+                "step": "video_validation",
+                "reason": result.reason,
+                "detail": result.detail,
+            })
+            return True
+
+        # 검증에서 디코딩한 샘플 프레임으로 카메라 앵글과 품질 추정
+        estimate = get_quality_estimator().estimate_frames(result.frames, result.width, result.height)
+        logger.info(
+            f"비디오 품질 추정: {estimate.video_quality.value}, 앵글: {estimate.to_video_info()['camera_angle']}, "
+            f"사유: {estimate.reasons}"
+        )
+        # 기본값은 기록만 하고 통과. 규칙 기반 추정이 충분히 검증되면 QUALITY_GATE=true로 차단
+        if not estimate.qualified and os.getenv("QUALITY_GATE", "false").lower() == "true":
+            publish_event(logger, EVENT_TASK_FAILED, {
+                "task_id": task_id,
+                "user_id": user_id,
+                "step": "video_validation",
+                "reason": "unqualified_video",
+                "detail": ",".join(estimate.reasons),
+                **estimate.to_video_info(),
+            })
+            return True
+
+        # 단계별 프로파일로 미리 변환 (예: 프레임 추출은 labeling, 추론은 analysis-640)
+        converted_video_paths = {}
+        conversion_geometry = {}
+        conversion_mode = None
+        transcode_stages = get_transcode_stages()
+        if transcode_stages:
+            results = convert_for_stages(
+                downloaded_video_path,
+                os.path.join(download_path, "converted"),
+                transcode_stages,
+                keep_original=os.getenv("KEEP_ORIGINAL_VIDEO", "true").lower() == "true",
+                converted=_validated_streamed_conversions(data, result.duration_sec),
+            )
+            converted_video_paths = {stage: result.output_file for stage, result in results.items()}
+            # Video.conversion_mode에는 보관용(upload) 변환 경로를, 없으면 첫 단계의 경로를 기록
+            conversion_mode = results.get("upload", results[transcode_stages[0]]).mode
+            conversion_geometry = {
+                stage: result.geometry.to_dict() for stage, result in results.items() if result.geometry
+            }
+            logger.info(f"단계별 변환 완료: {converted_video_paths}")
+            if not os.path.exists(downloaded_video_path):
+                # 원본을 지웠으면 이후 단계는 원본 대신 archive 변환본을 사용
+                downloaded_video_path = results["upload"].output_file
+
+        publish_event(logger, EVENT_VIDEO_VALIDATED, {
+            "task_id": task_id,
+            "user_id": user_id,
+            "downloaded_video_path": downloaded_video_path,
+            "original_video_path": data.get("original_video_path"),
+            "converted_video_paths": converted_video_paths,
+            "conversion_geometry": conversion_geometry,
+            "conversion_mode": conversion_mode,
+            "duration_sec": result.duration_sec,
+            **estimate.to_video_info(),
+            "quality_reasons": estimate.reasons,
+            "status": "completed"
+        })
+        return True
+    except Exception as e:
+        logger.error(f"비디오 검증 처리 중 오류: {str(e)}")
+        return False
+
+
 def process_frames_extraction_request(data: Dict[str, Any]):
     """프레임 추출 요청 이벤트 처리"""
     logger.info(f"프레임 추출 요청 이벤트 처리: {data}")
     
     task_id = data.get("task_id")
-    downloaded_video_path = data.get("downloaded_video_path")
+    # 프레임 추출용으로 변환된 비디오가 있으면 사용
+    downloaded_video_path = data.get("converted_video_paths", {}).get(
+        "frame_extraction", data.get("downloaded_video_path")
+    )
     num_frames = data.get("num_frames", int(os.getenv("NUM_FRAMES", 30)))
+    curation = data.get("curation", os.getenv("FRAME_CURATION", "naive"))
+    # exact: 큐레이션 후 정확한 인덱스의 프레임, keyframe: 키프레임만 디코딩하는 빠른 미리보기
+    extraction_mode = data.get("extraction_mode", "exact")
+    # 긴 변을 모델 입력 크기로 줄여 저장 (0이면 원본 크기)
+    target_size = int(data.get("target_size", os.getenv("FRAME_TARGET_SIZE", 0))) or None
     user_id = data.get("user_id")
 
     try:
         # frame 추출 경로도 actverse-api에서 지정한 값으로 설정
         frames_path = f"{os.getenv('DATA_STORAGE_PATH')}/frames/{task_id}"
-        video_frame_handler = VideoFrameHandler()
-        frame_curator = NaiveVideoFrameCurator(num_frames)
+        video_info = get_video_parser().extract_info(downloaded_video_path)
 
-        # 프레임 추출
-        frames = video_frame_handler.extract(downloaded_video_path)
-        logger.info(f"프레임 추출 중: {downloaded_video_path} -> {frames_path}, 요청 프레임 수: {num_frames}")
+        # 코덱/컨테이너에 맞는 디코더 선택 (FRAME_DECODER=auto|opencv|pyav|ffmpeg)
+        frame_decoder = build_frame_decoder(
+            os.getenv("FRAME_DECODER", "auto"),
+            video_info.get("codec"),
+            video_info.get("video_type"),
+            target_size=target_size,
+            letterbox=os.getenv("FRAME_LETTERBOX", "true").lower() == "true",
+        )
+        if os.getenv("FRAME_CACHE", "false").lower() == "true":
+            # 디코딩한 프레임을 공유 캐시에 채워 같은 비디오를 다시 추출할 때 디코딩 없이 읽음
+            frame_decoder = CachedFrameDecoder(
+                f"{os.getenv('DATA_STORAGE_PATH')}/cache/frames",
+                frame_decoder,
+                max_bytes=int(os.getenv("FRAME_CACHE_MAX_BYTES", 8 * 1024 ** 3)),
+                frame_count=video_info.get("frame_count"),
+            )
+        num_processes = int(os.getenv("FRAME_EXTRACTION_PROCESSES", 1))
+        retain_max_bytes = int(os.getenv("FRAME_RETAIN_MAX_BYTES", 0))
+        if num_processes > 1:
+            video_frame_handler = SegmentedVideoFrameHandler(
+                num_processes=num_processes,
+                decoder=frame_decoder,
+                retain_max_bytes=retain_max_bytes,
+                max_spill_bytes=int(os.getenv("FRAME_SPILL_MAX_BYTES", 1024 ** 3)),
+            )
+        else:
+            video_frame_handler = VideoFrameHandler(decoder=frame_decoder, retain_max_bytes=retain_max_bytes)
+        frame_curator = build_frame_curator(curation, num_frames)
+        image_format = os.getenv("FRAME_IMAGE_FORMAT", "jpg")
+        manifest_metadata = {"extraction_mode": extraction_mode}
+        letterbox = video_frame_handler.letterbox_for(video_info)
+        if letterbox is not None:
+            # 라벨 좌표를 원본 비디오 좌표로 되돌릴 때 사용
+            manifest_metadata["letterbox"] = letterbox.to_dict()
+        # 변환본(labeling)에서 추출하면 letterbox와 frame_index는 변환본 기준이므로 원본 대응 정보를 함께 기록
+        conversion = find_conversion(downloaded_video_path, "frame_extraction")
+        if conversion is not None and conversion.geometry is not None:
+            manifest_metadata["conversion"] = conversion.geometry.to_dict()
 
-        # video frame curation 적용
-        curated_frames = video_frame_handler.curate(frames, frame_curator)
+        # 배치 크기를 주면 배치 단위로 저장하고 바로 이벤트를 발행해 라벨링 업로드가 추출과 겹치게 함
+        batch_size = int(data.get("batch_size", os.getenv("FRAME_BATCH_SIZE", 0)))
+        # archive: 개별 이미지 파일 대신 tar 샤드 + 인덱스(frames_index.json)로 저장
+        frame_storage = os.getenv("FRAME_STORAGE", "files")
+        save_options = {
+            "max_workers": int(os.getenv("FRAME_SAVE_WORKERS", os.cpu_count() or 1)),
+            "image_format": image_format,
+            "quality": int(os.getenv("FRAME_IMAGE_QUALITY", 95)),
+        }
 
-        # 프레임 저장
-        video_frame_handler.save(curated_frames, frames_path)
-        
-        
+        # 변환 프로파일을 함께 요청하면 변환본을 만듦 (예: 업로드용 archive).
+        # 입력이 단계별 변환본일 수 있으므로 입력 옆의 별도 디렉토리에 저장
+        transcode_profile = data.get("transcode_profile", os.getenv("FRAME_TRANSCODE_PROFILE")) or None
+        converted_path = os.path.join(os.path.dirname(downloaded_video_path), "transcoded")
+        converted_video_path = None
+        single_pass = transcode_profile is not None and (
+            curation == "naive" and extraction_mode == "exact" and target_size is None and image_format == "jpg"
+            and frame_storage == "files" and batch_size <= 0
+        )
+
+        if single_pass:
+            # 균등 샘플링이면 변환과 프레임 샘플링을 ffmpeg 한 번의 디코딩으로 처리
+            logger.info(f"변환({transcode_profile})과 프레임 샘플링을 함께 처리: {downloaded_video_path} -> {frames_path}")
+            started = time.time()
+            conversion_result, frame_indices = FFmpegVideoConverter(transcode_profile).convert_and_sample(
+                downloaded_video_path, converted_path, frames_path, num_frames
+            )
+            converted_video_path = conversion_result.output_file
+            # 프레임 수가 probe 값보다 적으면 뒤쪽 샘플은 저장되지 않음
+            saved_files = [os.path.join(frames_path, f"frame_{i:04d}.jpg") for i in range(len(frame_indices))]
+            saved_files = list(itertools.takewhile(os.path.exists, saved_files))
+            frame_indices = frame_indices[:len(saved_files)]
+            save_result = FrameSaveResult(
+                output_path=frames_path,
+                num_frames=len(saved_files),
+                bytes_written=sum(os.path.getsize(path) for path in saved_files),
+                elapsed_sec=time.time() - started,
+            )
+        else:
+            if transcode_profile is not None:
+                converted_video_path = FFmpegVideoConverter(transcode_profile).convert(
+                    downloaded_video_path, converted_path
+                ).output_file
+            if extraction_mode == "keyframe":
+                # 미리보기용: 키프레임만 디코딩 (큐레이션은 적용하지 않음)
+                logger.info(f"키프레임 추출 중: {downloaded_video_path} -> {frames_path}, 요청 프레임 수: {num_frames}")
+                keyframe_indices, keyframe_frames, keyframes_only = KeyframeExtractor(video_frame_handler).extract(
+                    downloaded_video_path, num_frames, video_info
+                )
+                decoded = zip(keyframe_indices, keyframe_frames)
+                manifest_metadata["keyframes_only"] = keyframes_only
+                if not keyframes_only:
+                    logger.info("키프레임이 요청 프레임 수보다 적어 균등 간격 seek 디코딩으로 전환했습니다.")
+            else:
+                # 인덱스 기반 큐레이션으로 디코딩할 프레임을 먼저 결정하고, 선택된 프레임만 디코딩
+                logger.info(
+                    f"프레임 추출 중: {downloaded_video_path} -> {frames_path}, 요청 프레임 수: {num_frames}, "
+                    f"큐레이션: {curation}, 디코더: {frame_decoder.name}"
+                )
+                decoded = video_frame_handler.iter_curated(downloaded_video_path, frame_curator, video_info)
+
+            frame_indices = []
+
+            def curated_frames():
+                for frame_index, frame in decoded:
+                    frame_indices.append(frame_index)
+                    yield frame
+
+            if batch_size > 0:
+                save_result = None
+                for batch in video_frame_handler.save_batches(
+                    curated_frames(), frames_path, batch_size, archive=frame_storage == "archive", **save_options
+                ):
+                    save_result = _merge_save_results(save_result, batch.save_result)
+                    publish_event(logger, EVENT_FRAMES_BATCH_EXTRACTED, {
+                        "task_id": task_id,
+                        "user_id": user_id,
+                        "frames_path": frames_path,
+                        "batch_index": batch.batch_index,
+                        "files": batch.files,
+                        "frame_indices": frame_indices[batch.start_index:batch.start_index + len(batch.files)],
+                        "num_saved": batch.start_index + len(batch.files),
+                        "num_frames": num_frames,
+                        "frame_storage": frame_storage,
+                    })
+            elif frame_storage == "archive":
+                save_result = video_frame_handler.save_archive(curated_frames(), frames_path, **save_options)
+            else:
+                # 프레임 병렬 저장
+                save_result = video_frame_handler.save_parallel(curated_frames(), frames_path, **save_options)
+        logger.info(
+            f"프레임 저장 완료: {save_result.num_frames}장, "
+            f"{save_result.frames_per_sec:.1f} frames/sec, {save_result.bytes_written} bytes"
+        )
+
+        # 이미지 파일별 원본 프레임 인덱스 기록
+        source_frame_indices = None
+        if "conversion" in manifest_metadata:
+            source_frame_indices = [conversion.geometry.to_source_frame_index(i) for i in frame_indices]
+        manifest_path = video_frame_handler.save_manifest(
+            frame_indices,
+            frames_path,
+            image_format=image_format,
+            source_frame_indices=source_frame_indices,
+            **manifest_metadata,
+        )
+
+        # 품질 필터의 프레임별 점수는 기준값 튜닝용으로 함께 저장
+        if extraction_mode != "keyframe" and isinstance(frame_curator, QualityFrameCurator):
+            frame_curator.save_scores(os.path.join(frames_path, "frame_scores.json"))
         
         # 프레임 추출 완료 이벤트 발행
         publish_event(logger, EVENT_FRAMES_EXTRACTED, {
             "task_id": task_id,
             "user_id": user_id,
             "frames_path": frames_path,
-            "num_frames": num_frames,
+            # 큐레이션/짧은 비디오로 요청 수보다 적게 저장될 수 있으므로 실제 저장한 수를 발행
+            "num_frames": save_result.num_frames,
+            "num_requested_frames": num_frames,
+            "frames_per_sec": save_result.frames_per_sec,
+            "bytes_written": save_result.bytes_written,
+            "extraction_mode": extraction_mode,
+            "manifest_path": manifest_path,
+            "frame_storage": frame_storage,
+            "converted_video_path": converted_video_path,
+            "num_batches": (save_result.num_frames + batch_size - 1) // batch_size if batch_size > 0 else 0,
             "status": "completed"
         })
         
@@ -133,6 +500,8 @@ def callback(ch, method, properties, body):
         success = False
         if event_type == EVENT_VIDEO_DOWNLOAD_REQUESTED:
             success = process_video_download_request(data)
+        elif event_type == EVENT_VIDEO_VALIDATION_REQUESTED:
+            success = process_video_validation_request(data)
         elif event_type == EVENT_FRAMES_EXTRACTION_REQUESTED:
             success = process_frames_extraction_request(data)
         else:
@@ -26,6 +26,7 @@ async def get_task_status(task_id: str = Path(...)):
         # 단계별 한글 이름 매핑
         step_names = {
             "video_download": "비디오 다운로드",
+            "video_validation": "비디오 검증",
             "frame_extraction": "프레임 추출",
             "labeling": "라벨링",
             "model_training": "모델 학습",
@@ -55,7 +56,9 @@ async def get_task_status(task_id: str = Path(...)):
             response["steps"][step_names.get(step_name, step_name)] = {
                 "status": status_names.get(step_info["status"], step_info["status"]),
                 "started_at": step_info["started_at"],
-                "finished_at": step_info["finished_at"]
+                "finished_at": step_info["finished_at"],
+                "progress": step_info["progress"],
+                "error": step_info["error"]
             }
             
         return response
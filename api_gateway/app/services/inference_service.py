@@ -1,13 +1,22 @@
+from app.features.video_processor.video_uploader import BaseUploader, get_uploader
 
 
-def upload_csv(data):
-    pass
 
-def upload_json(data):
-    pass
+
+def upload_csv(data: dict, uploader: BaseUploader = None) -> str:
+    """추론 결과 csv 압축 파일(data["prediction_csv_path"])을 results/{task_id}에 업로드한다."""
+    uploader = uploader or get_uploader()
+    return uploader.upload_csv(data["prediction_csv_path"], f"results/{data['task_id']}")
+
+def upload_json(data: dict, uploader: BaseUploader = None) -> str:
+    """추론 결과 json(data["prediction_path"])을 results/{task_id}에 업로드한다."""
+    uploader = uploader or get_uploader()
+    return uploader.upload_json(data["prediction_path"], f"results/{data['task_id']}")
     
-def upload_overlaid_video(data):
-    pass
+def upload_overlaid_video(data: dict, uploader: BaseUploader = None) -> str:
+    """keypoint를 덧그린 결과 비디오(data["result_video_file"])를 results/{task_id}에 업로드한다."""
+    uploader = uploader or get_uploader()
+    return uploader.upload_video(str(data["result_video_file"]), f"results/{data['task_id']}")
     
 def run(data):
     print('run inference')
@@ -4,10 +4,13 @@ import time
 import os
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from app.entities import Task, TaskStep, Base
+from app.entities import Task, TaskStep, Base, Video
+from app.entities.migrations import add_missing_columns
 from actverse_common.logging import setup_logger
 from actverse_common.events import (EVENT_VIDEO_DOWNLOAD_REQUESTED, EVENT_VIDEO_DOWNLOADED,
                                EVENT_FRAMES_EXTRACTION_REQUESTED, EVENT_FRAMES_EXTRACTED,
+                               EVENT_FRAMES_BATCH_EXTRACTED,
+                               EVENT_VIDEO_VALIDATION_REQUESTED, EVENT_VIDEO_VALIDATED, EVENT_TASK_FAILED,
                                EVENT_LABELING_REQUESTED, EVENT_LABELING_COMPLETED,
                                EVENT_MODEL_TRAINING_REQUESTED, EVENT_MODEL_TRAINING_COMPLETED,
                                EVENT_MODEL_DEPLOYMENT_REQUESTED, EVENT_MODEL_DEPLOYMENT_COMPLETED,
@@ -20,6 +23,7 @@ import datetime
 # 단계별 예상 소요 시간(초)
 STEP_DURATIONS = {
     "video_download": 60,
+    "video_validation": 5,
     "frame_extraction": 120,
     "labeling": 300,
     "model_training": 600,
@@ -31,8 +35,11 @@ STEP_DURATIONS = {
 EVENT_TO_STEP = {
     EVENT_VIDEO_DOWNLOAD_REQUESTED: "video_download",
     EVENT_VIDEO_DOWNLOADED: "video_download",
+    EVENT_VIDEO_VALIDATION_REQUESTED: "video_validation",
+    EVENT_VIDEO_VALIDATED: "video_validation",
     EVENT_FRAMES_EXTRACTION_REQUESTED: "frame_extraction",
     EVENT_FRAMES_EXTRACTED: "frame_extraction",
+    EVENT_FRAMES_BATCH_EXTRACTED: "frame_extraction",
     EVENT_LABELING_REQUESTED: "labeling",
     EVENT_LABELING_COMPLETED: "labeling",
     EVENT_MODEL_TRAINING_REQUESTED: "model_training",
@@ -46,6 +53,7 @@ EVENT_TO_STEP = {
 # 단계 완료 이벤트
 COMPLETION_EVENTS = {
     EVENT_VIDEO_DOWNLOADED,
+    EVENT_VIDEO_VALIDATED,
     EVENT_FRAMES_EXTRACTED,
     EVENT_LABELING_COMPLETED,
     EVENT_MODEL_TRAINING_COMPLETED,
@@ -56,6 +64,7 @@ COMPLETION_EVENTS = {
 # 워크플로우 정의 (순서)
 WORKFLOW_STEPS = [
     "video_download",
+    "video_validation",
     "frame_extraction",
     "labeling",
     "model_training",
@@ -127,6 +136,10 @@ class TaskTracker:
     
     def create_tables(self):
         Base.metadata.create_all(self.engine)
+        # 기존 DB의 task_steps/videos 테이블에 새로 추가된 컬럼 (progress, error, conversion_mode 등)
+        added = add_missing_columns(self.engine, Base.metadata)
+        if added:
+            logger.info(f"테이블 컬럼 추가: {', '.join(added)}")
     
     def _get_producer_channel(self):
         """메시지 발행용 채널 가져오기 - 매번 새 연결 생성"""
@@ -196,8 +209,8 @@ class TaskTracker:
                 queue_name = 'workflow_worker'
                 consumer_channel.queue_declare(queue=queue_name, durable=True)
                 
-                # 워크플로우에 정의된 이벤트만 구독
-                for event_type in EVENT_TO_STEP.keys():
+                # 워크플로우에 정의된 이벤트와 실패 이벤트만 구독
+                for event_type in [*EVENT_TO_STEP.keys(), EVENT_TASK_FAILED]:
                     consumer_channel.queue_bind(
                         exchange='events',
                         queue=queue_name,
@@ -302,8 +315,10 @@ class TaskTracker:
         if not task_id or not user_id:
             return
             
-        # 이벤트에 해당하는 단계 확인
+        # 이벤트에 해당하는 단계 확인 (실패 이벤트는 실패한 단계를 data의 step으로 전달)
         step = EVENT_TO_STEP.get(event_type)
+        if event_type == EVENT_TASK_FAILED:
+            step = data.get("step")
         if not step:
             return
             
@@ -332,10 +347,17 @@ class TaskTracker:
                 )
                 session.add(current_step)
             
+            if event_type == EVENT_TASK_FAILED:
+                current_step.status = "failed"
+                current_step.finished_at = datetime.datetime.utcnow()
+                current_step.error = data.get("reason")
+                task.status = "failed"
             # 완료 이벤트면 상태 업데이트
-            if event_type in COMPLETION_EVENTS:
+            elif event_type in COMPLETION_EVENTS:
                 current_step.status = "completed"
                 current_step.finished_at = datetime.datetime.utcnow()
+                if current_step.progress is not None:
+                    current_step.progress = 1.0
                 
                 # 다음 단계 계산
                 current_idx = WORKFLOW_STEPS.index(step)
@@ -343,12 +365,37 @@ class TaskTracker:
                     task.status = "processing"
                 else:
                     task.status = "completed"
+            elif event_type == EVENT_FRAMES_BATCH_EXTRACTED:
+                # 배치 이벤트는 저장된 프레임 수로 단계 진행도만 갱신 (완료 뒤에 늦게 도착해도 되돌리지 않음)
+                if current_step.status != "completed" and data.get("num_frames"):
+                    progress = min(1.0, data.get("num_saved", 0) / data["num_frames"])
+                    current_step.progress = max(current_step.progress or 0.0, progress)
+                    task.status = "processing"
             else:
                 current_step.status = "processing"
                 task.status = "processing"
+
+            # 검증 단계의 품질 추정과 변환 경로는 통과/차단과 관계없이 Video에 기록
+            if step == "video_validation" and ("video_quality" in data or data.get("conversion_mode")):
+                self._save_video_estimate(session, task_id, data)
             
             session.commit()
 
+    def _save_video_estimate(self, session, task_id, data):
+        """검증 이벤트의 카메라 앵글/품질 추정값과 변환 경로(remux/transcode)를 Video에 저장합니다.
+        Video가 없으면 만듭니다."""
+        video = session.query(Video).filter(Video.task_id == task_id).first()
+        if video is None:
+            video = Video(id=task_id, task_id=task_id)
+            session.add(video)
+        if "video_quality" in data:
+            video.camera_angle = data.get("camera_angle")
+            video.video_quality = data.get("video_quality")
+        if data.get("duration_sec") is not None:
+            video.duration_sec = data["duration_sec"]
+        if data.get("conversion_mode"):
+            video.conversion_mode = data["conversion_mode"]
+
     def _update_progress_and_time(self, task):
         """진행도 및 남은 시간 계산"""
         if task.status == "completed":
@@ -397,7 +444,9 @@ class TaskTracker:
                 step_status[step.step_name] = {
                     "status": step.status,
                     "started_at": step.started_at.isoformat() if step.started_at else None,
-                    "finished_at": step.finished_at.isoformat() if step.finished_at else None
+                    "finished_at": step.finished_at.isoformat() if step.finished_at else None,
+                    "progress": step.progress,
+                    "error": step.error
                 }
             
             return {
@@ -2,8 +2,11 @@ import os
 import ffmpeg
 
 from app.features.video_processor.video_downloader import VercelVideoDownloader
+from app.features.video_processor.video_converter import FFmpegVideoConverter, convert_for_stages
 from app.features.video_processor.videoframe_handler import VideoFrameHandler, NaiveVideoFrameCurator
-from app.features.video_processor.video_parser import OpenCVVideoParser
+from app.features.video_processor.video_parser import FFprobeVideoParser
+from app.features.video_processor.video_quality_estimator import VideoQualityEstimator
+from app.features.video_processor.video_uploader import BaseUploader, get_uploader
 from app.entities import Video
 from app.repositories.base_repository import BaseRepository
 
@@ -13,49 +16,78 @@ def download_video(url: str, download_path: str):
     return downloader.download(url, download_path)
 
 
-def extract_frames(video_path: str, output_path: str):
+def _video_parser() -> FFprobeVideoParser:
+    """video_processor 워커와 같은 ffprobe 파서. DATA_STORAGE_PATH가 있으면 probe 캐시를 공유한다."""
+    storage_path = os.getenv("DATA_STORAGE_PATH")
+    return FFprobeVideoParser(cache_dir=f"{storage_path}/cache/probe" if storage_path else None)
+
+
+def extract_frames(video_path: str, output_path: str, num_frames: int = 30):
     handler = VideoFrameHandler()
-    frames = handler.extract(video_path)
-    
-    curator = NaiveVideoFrameCurator()
-    curated_frames = handler.curate(frames, curator)
+    video_info = _video_parser().extract_info(video_path)
+
+    curator = NaiveVideoFrameCurator(num_frames)
+    _, curated_frames = handler.extract_curated(video_path, curator, video_info)
     
     handler.save(curated_frames, output_path)
 
     
-def convert_video(video_path: str, output_path: str):
+def convert_video(video_path: str, output_path: str, task_id: str = None, repository: BaseRepository = None,
+                  profile: str = "archive"):
     """
     주어진 비디오 파일을 mp4(H.264/AAC)로 변환한다.
+    이미 mp4 컨테이너의 H.264/AAC면 재인코딩 없이 remux만 한다.
+
+    task_id와 repository를 넘기면 어떤 경로(remux/transcode)로 변환했는지 Video에 기록한다.
+    profile은 video_converter.PROFILES 참고 (archive, labeling, analysis-640)
 
     ffmpeg-python 필요: pip install ffmpeg-python
     """
     import sys
-    output_file = os.path.join(output_path, os.path.basename(video_path))
 
     try:
-        (
-            ffmpeg.input(video_path)
-            .output(
-                output_file,
-                vcodec="libx264",
-                acodec="aac",
-                preset="fast",
-                crf=18,
-                movflags="faststart",
-            )
-            .overwrite_output()
-            .run(capture_stdout=True, capture_stderr=True)
-        )
+        result = FFmpegVideoConverter(profile).convert(video_path, output_path)
+    except ffmpeg.Error as e:
+        print("ffmpeg error:", file=sys.stderr)
+        print(e.stderr.decode('utf8'), file=sys.stderr)
+        raise
+
+    if task_id is not None and repository is not None:
+        video = repository.get(task_id)
+        if video is not None:
+            video.conversion_mode = result.mode
+            repository.add(video)
+
+    return result
+
+
+def convert_video_for_stages(video_path: str, output_path: str, stages, keep_original: bool = True):
+    """
+    파이프라인 단계별 프로파일(STAGE_PROFILES)로 변환하고 {단계: ConversionResult}를 반환한다.
+    """
+    import sys
+
+    try:
+        return convert_for_stages(video_path, output_path, stages, keep_original)
     except ffmpeg.Error as e:
         print("ffmpeg error:", file=sys.stderr)
         print(e.stderr.decode('utf8'), file=sys.stderr)
         raise
 
 
+def upload_video(data: dict, uploader: BaseUploader = None) -> str:
+    """
+    변환한 비디오(data["video_path"])를 업로드 저장소의 videos/{task_id}에 올리고 위치를 반환한다.
+    저장소는 UPLOAD_BACKEND(local|s3)로 정한다. S3 multipart 업로드는 중단된 지점부터 재개된다.
+    """
+    uploader = uploader or get_uploader()
+    return uploader.upload_video(data["video_path"], f"videos/{data['task_id']}")
+
+
 def parse_video_info(task_id: str, video_path: str, repository: BaseRepository):
-    video_parser = OpenCVVideoParser()
-    video_info = video_parser.extract_info(video_path)
-    # TODO: 카메라 앵글 파악, 비디오 퀄리티 파악
+    video_info = _video_parser().extract_info(video_path)
+    # 샘플 프레임 몇 장으로 카메라 앵글, 비디오 퀄리티 추정
+    video_info.update(VideoQualityEstimator().estimate(video_path, video_info).to_video_info())
 
     # 비디오 정보 ORM 객체 생성
     video = Video(
@@ -0,0 +1,119 @@
+"""디코더 -> 소비자 프레임 전달 방식 비교 스크립트
+
+같은 호스트에서 video_processor가 디코딩한 프레임을 model_inference가 받는 두 방식을 비교합니다.
+
+- disk: 생산자가 JPEG로 인코딩해 파일로 저장하고, 소비자가 파일을 읽어 디코딩 (현재 방식)
+- shm: 생산자가 ``SharedFrameRing``에 복사하고, 소비자가 NumPy view로 바로 읽음
+
+디코딩 비용을 빼고 전달 비용만 보기 위해 생산자는 미리 디코딩한 프레임을 반복해서 보냅니다.
+소비자는 프레임마다 일부 픽셀을 읽기만 해서, 측정값이 소비자의 연산량이 아닌 전달 비용을 반영하게 합니다.
+
+사용법 (api_gateway 디렉토리에서):
+    python -m scripts.benchmark_frame_handoff --video ./tmp/avi_sample.avi --frames 300 --size 640
+"""
+import argparse
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import uuid
+
+import cv2
+import numpy as np
+
+from app.features.video_processor.frame_decoders import OpenCVFrameDecoder
+from app.features.video_processor.shared_frame_ring import SharedFrameRing
+
+context = multiprocessing.get_context("fork")
+
+
+def touch(frame: np.ndarray) -> int:
+    return int(frame[::4, ::4, 0].max())
+
+
+def load_frames(video_path: str, num_frames: int, target_size: int):
+    decoder = OpenCVFrameDecoder(target_size=target_size)
+    frames = [frame for _, frame in decoder.iter_frames(video_path, range(30))]
+    return [frames[i % len(frames)] for i in range(num_frames)]
+
+
+def run_disk(frames, frames_dir: str) -> float:
+    done = os.path.join(frames_dir, "done")
+
+    def consume(results):
+        checksum, i = 0.0, 0
+        while True:
+            path = os.path.join(frames_dir, f"frame_{i:04d}.jpg")
+            if os.path.exists(path):
+                checksum += touch(cv2.imread(path))
+                i += 1
+            elif os.path.exists(done) and not os.path.exists(path):
+                break
+            else:
+                time.sleep(0.0005)
+        results.put(i)
+
+    results = context.Queue()
+    consumer = context.Process(target=consume, args=(results,))
+    consumer.start()
+    started = time.perf_counter()
+    for i, frame in enumerate(frames):
+        # 소비자가 쓰다 만 파일을 읽지 않도록 임시 이름으로 쓴 뒤 rename
+        temp_path = os.path.join(frames_dir, f".frame_{i:04d}.jpg")
+        cv2.imwrite(temp_path, frame)
+        os.replace(temp_path, os.path.join(frames_dir, f"frame_{i:04d}.jpg"))
+    open(done, "w").close()
+    assert results.get() == len(frames)
+    elapsed = time.perf_counter() - started
+    consumer.join()
+    return elapsed
+
+
+def run_shm(frames, capacity: int) -> float:
+    name = f"actverse-bench-{uuid.uuid4().hex[:8]}"
+
+    def consume(results):
+        checksum, count = 0.0, 0
+        with SharedFrameRing.attach(name, timeout=10) as ring:
+            for _, frame in ring:
+                checksum += touch(frame)
+                count += 1
+        results.put(count)
+
+    results = context.Queue()
+    consumer = context.Process(target=consume, args=(results,))
+    consumer.start()
+    with SharedFrameRing.create(name, frames[0].shape, capacity=capacity) as ring:
+        ring.wait_for_consumers(1, timeout=10)
+        started = time.perf_counter()
+        ring.publish_all(enumerate(frames))
+    assert results.get() == len(frames)
+    elapsed = time.perf_counter() - started
+    consumer.join()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--video", default="./tmp/avi_sample.avi")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--size", type=int, default=640, help="letterbox 크기 (모델 입력 크기)")
+    parser.add_argument("--capacity", type=int, default=32)
+    parser.add_argument("--tmp-dir", default=None, help="disk 방식 저장 위치 (공유 볼륨에서 측정하려면 지정)")
+    args = parser.parse_args()
+
+    frames = load_frames(args.video, args.frames, args.size)
+    frames_dir = tempfile.mkdtemp(prefix="handoff-", dir=args.tmp_dir)
+    try:
+        results = {"disk": run_disk(frames, frames_dir), "shm": run_shm(frames, args.capacity)}
+    finally:
+        shutil.rmtree(frames_dir, ignore_errors=True)
+
+    print(f"{len(frames)} frames, {frames[0].shape}")
+    for method, elapsed in results.items():
+        print(f"{method:>5}: {elapsed:.3f} sec, {len(frames) / elapsed:.0f} frames/sec")
+
+
+if __name__ == "__main__":
+    main()
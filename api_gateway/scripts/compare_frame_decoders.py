@@ -0,0 +1,111 @@
+"""프레임 디코더 백엔드 비교 스크립트
+
+ffmpeg testsrc2로 코덱/컨테이너별 테스트 비디오를 만들고, 각 디코더로
+전체 프레임 순차 디코딩과 균등 샘플링(seek) 디코딩의 처리량과 메모리를 측정합니다.
+측정마다 새 프로세스를 띄워 최대 RSS가 앞선 측정의 영향을 받지 않도록 합니다.
+
+사용법 (api_gateway 디렉토리에서):
+    python -m scripts.compare_frame_decoders --duration 20 --size 1280x720
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import ffmpeg
+
+from app.features.video_processor.frame_decoders import FRAME_DECODERS, select_frame_decoder
+from app.features.video_processor.videoframe_handler import NaiveVideoFrameCurator
+
+
+# (파일명, 코덱, ffmpeg 인코딩 옵션)
+TEST_VIDEOS = [
+    ("h264.mp4", "h264", {"vcodec": "libx264", "pix_fmt": "yuv420p", "g": 60}),
+    ("mpeg4.avi", "mpeg4", {"vcodec": "mpeg4", "q:v": 3, "g": 60}),
+    ("mjpeg.avi", "mjpeg", {"vcodec": "mjpeg", "q:v": 3}),
+    ("vp9.webm", "vp9", {"vcodec": "libvpx-vp9", "b:v": "1M", "deadline": "realtime", "cpu-used": 8, "g": 60}),
+]
+
+
+def generate_videos(output_dir: str, duration: int, size: str, fps: int):
+    os.makedirs(output_dir, exist_ok=True)
+    videos = []
+    for file_name, codec, options in TEST_VIDEOS:
+        path = os.path.join(output_dir, file_name)
+        if not os.path.exists(path):
+            print(f"테스트 비디오 생성 중: {path}")
+            (
+                ffmpeg.input(f"testsrc2=size={size}:rate={fps}:duration={duration}", f="lavfi")
+                .output(path, **options)
+                .overwrite_output()
+                .run(quiet=True)
+            )
+        videos.append((path, codec))
+    return videos
+
+
+def _measure(decoder_name: str, video_path: str, frame_indices):
+    """새 프로세스에서 실행됩니다. (경과 시간, 프레임 수, 파이썬 힙 최대치, 최대 RSS)를 반환합니다."""
+    decoder = FRAME_DECODERS[decoder_name]()
+    if decoder_name == "pyav":
+        # 모듈 import 시간은 측정에서 제외
+        import av  # noqa: F401
+    tracemalloc.start()
+    started = time.perf_counter()
+    num_frames = 0
+    for _, frame in decoder.iter_frames(video_path, frame_indices):
+        num_frames += 1
+    elapsed = time.perf_counter() - started
+    _, peak_traced = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # ffmpeg 백엔드는 디코딩이 자식 프로세스에서 일어나므로 자식 RSS도 함께 봄 (Linux: KiB 단위)
+    max_rss = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    return elapsed, num_frames, peak_traced, max_rss * 1024
+
+
+def measure(decoder_name: str, video_path: str, frame_indices):
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return executor.submit(_measure, decoder_name, video_path, frame_indices).result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output-dir", default="./tmp/decoder_benchmark")
+    parser.add_argument("--duration", type=int, default=20, help="테스트 비디오 길이(초)")
+    parser.add_argument("--size", default="1280x720")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--num-samples", type=int, default=30, help="샘플링 디코딩 프레임 수")
+    parser.add_argument("--decoders", default=",".join(FRAME_DECODERS))
+    args = parser.parse_args()
+
+    decoder_names = [name for name in args.decoders.split(",") if FRAME_DECODERS[name].is_available()]
+    total_frames = args.duration * args.fps
+    workloads = {
+        "sequential": list(range(total_frames)),
+        f"sample{args.num_samples}": NaiveVideoFrameCurator(args.num_samples).select_indices(total_frames),
+    }
+
+    print(f"{'video':<12} {'workload':<12} {'decoder':<8} {'frames':>6} {'sec':>7} {'fps':>8} "
+          f"{'py peak MB':>10} {'max RSS MB':>10}  auto")
+    for video_path, codec in generate_videos(args.output_dir, args.duration, args.size, args.fps):
+        container = os.path.splitext(video_path)[1]
+        auto = select_frame_decoder(codec, container).name
+        for workload, frame_indices in workloads.items():
+            for decoder_name in decoder_names:
+                elapsed, num_frames, peak_traced, max_rss = measure(decoder_name, video_path, frame_indices)
+                print(
+                    f"{os.path.basename(video_path):<12} {workload:<12} {decoder_name:<8} {num_frames:>6} "
+                    f"{elapsed:>7.2f} {num_frames / elapsed:>8.1f} {peak_traced / 2**20:>10.1f} "
+                    f"{max_rss / 2**20:>10.1f}  {'*' if decoder_name == auto else ''}"
+                )
+
+
+if __name__ == "__main__":
+    main()
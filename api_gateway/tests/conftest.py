@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Docker 이미지에서는 common을 pip install -e로 설치하므로, 로컬 테스트에서만 경로를 추가
+COMMON_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "common"))
+if COMMON_PATH not in sys.path:
+    sys.path.insert(0, COMMON_PATH)
@@ -0,0 +1,64 @@
+import json
+import os
+import zlib
+
+from app.features.video_processor.file_transfer import TRANSFER_HARDLINK, FileTransfer
+from app.features.video_processor.video_uploader import LocalUploader
+
+
+def _write_frames(frames_dir, num_frames=5):
+    frames_dir.mkdir()
+    for i in range(num_frames):
+        (frames_dir / f"frame_{i:04d}.jpg").write_bytes(os.urandom(1000 + i))
+
+
+def test_같은_볼륨의_프레임은_hardlink로_전송하고_manifest를_저장한다(tmp_path):
+    # given
+    frames_dir = tmp_path / "frames"
+    _write_frames(frames_dir)
+    uploader = LocalUploader()
+
+    # when
+    dest_dir = uploader.upload_frames(str(frames_dir), str(tmp_path / "published"), str(tmp_path / "manifest.json"))
+
+    # then
+    manifest = uploader.last_manifest
+    assert manifest.methods == {TRANSFER_HARDLINK: 5}
+    assert sorted(os.listdir(dest_dir)) == sorted(os.listdir(frames_dir))
+    first = manifest.files[0]
+    assert os.path.samefile(first.source, first.destination)
+    assert first.checksum == f"{zlib.crc32(open(first.source, 'rb').read()):08x}"
+    saved = json.load(open(tmp_path / "manifest.json"))
+    assert saved["total_bytes"] == sum(1000 + i for i in range(5))
+
+
+def test_hardlink를_끄면_원본과_독립된_사본을_만든다(tmp_path):
+    # given
+    source = tmp_path / "video.mp4"
+    source.write_bytes(os.urandom(4096))
+    transfer = FileTransfer(allow_hardlink=False, checksum="sha256", max_workers=2)
+
+    # when
+    result = transfer.transfer_file(str(source), str(tmp_path / "copy.mp4"))
+
+    # then
+    assert result.method != TRANSFER_HARDLINK
+    assert not os.path.samefile(result.source, result.destination)
+    assert open(result.destination, "rb").read() == source.read_bytes()
+    assert result.size == 4096
+
+
+def test_이미_있는_파일은_새_내용으로_교체한다(tmp_path):
+    # given
+    source = tmp_path / "result.json"
+    source.write_text('{"new": true}')
+    dest_dir = tmp_path / "out"
+    dest_dir.mkdir()
+    (dest_dir / "result.json").write_text('{"old": true}')
+
+    # when
+    path = LocalUploader().upload_json(str(source), str(dest_dir))
+
+    # then
+    assert open(path).read() == '{"new": true}'
+    assert not [name for name in os.listdir(dest_dir) if name.endswith(".tmp")]
@@ -0,0 +1,85 @@
+import os
+import tarfile
+
+import numpy as np
+
+from actverse_common.frame_archive import FrameArchive, FrameArchiveWriter, frame_image_names
+from app.features.video_processor.videoframe_handler import VideoFrameHandler
+
+
+def _frames(num_frames=7, size=(64, 48)):
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 255, (size[1], size[0], 3), dtype=np.uint8) for _ in range(num_frames)]
+
+
+def test_샤드에_나눠_쓴_파일을_위치와_이름으로_임의_접근한다(tmp_path):
+    # given
+    payloads = [os.urandom(100 + i * 300) for i in range(5)]
+    with FrameArchiveWriter(str(tmp_path), shard_max_frames=2) as writer:
+        for i, payload in enumerate(payloads):
+            writer.add(f"frame_{i:04d}.jpg", payload)
+
+    # when
+    archive = FrameArchive(str(tmp_path))
+
+    # then
+    assert archive.shards == ["frames-00000.tar", "frames-00001.tar", "frames-00002.tar"]
+    assert archive.read(3) == payloads[3]
+    assert archive.read_name("frame_0004.jpg") == payloads[4]
+    assert [data for _, data in archive] == payloads
+    # 표준 tar로도 읽힘
+    with tarfile.open(tmp_path / "frames-00001.tar") as tar:
+        assert tar.getnames() == ["frame_0002.jpg", "frame_0003.jpg"]
+
+
+def test_아카이브를_풀면_개별_파일로_저장한_것과_같다(tmp_path):
+    # given
+    frames = _frames()
+    handler = VideoFrameHandler()
+    handler.save_parallel(frames, str(tmp_path / "loose"), max_workers=2)
+
+    # when
+    result = handler.save_archive(frames, str(tmp_path / "archive"), max_workers=2, shard_max_frames=3)
+    archive = FrameArchive(str(tmp_path / "archive"))
+    paths = archive.materialize(str(tmp_path / "materialized"))
+
+    # then
+    assert result.num_frames == 7
+    assert len(archive.shards) == 3
+    assert sorted(os.listdir(tmp_path / "materialized")) == sorted(os.listdir(tmp_path / "loose"))
+    for path in paths:
+        assert open(path, "rb").read() == open(tmp_path / "loose" / os.path.basename(path), "rb").read()
+    assert archive.decode(0).shape == (48, 64, 3)
+
+
+def test_배치_저장은_배치마다_샤드를_닫고_인덱스를_갱신한다(tmp_path):
+    # given
+    batches = VideoFrameHandler().save_batches(_frames(), str(tmp_path), batch_size=3, archive=True, max_workers=2)
+
+    # when
+    first = next(batches)
+
+    # then: 첫 배치를 받은 시점에 이미 읽을 수 있음
+    assert FrameArchive(str(tmp_path)).names == first.files
+    remaining = list(batches)
+    assert [len(batch.files) for batch in remaining] == [3, 1]
+    archive = FrameArchive(str(tmp_path))
+    assert len(archive) == 7 and len(archive.shards) == 3
+    with archive.temporary_files(["frame_0006.jpg"]) as files:
+        assert os.path.exists(files[0])
+    assert not os.path.exists(files[0])
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".jpg")]
+
+
+def test_이미지_형식과_저장_방식에_관계없이_프레임_파일명을_찾는다(tmp_path):
+    # given: webp 개별 파일 + manifest, png 아카이브(manifest 없음)
+    handler = VideoFrameHandler()
+    frames = _frames(3)
+    handler.save_parallel(frames, str(tmp_path / "loose"), max_workers=2, image_format="webp")
+    handler.save_manifest([0, 10, 20], str(tmp_path / "loose"), image_format="webp")
+    handler.save_archive(frames, str(tmp_path / "archive"), max_workers=2, image_format="png")
+
+    # when / then
+    expected = [f"frame_{i:04d}" for i in range(3)]
+    assert frame_image_names(str(tmp_path / "loose")) == [f"{name}.webp" for name in expected]
+    assert frame_image_names(str(tmp_path / "archive")) == [f"{name}.png" for name in expected]
@@ -0,0 +1,151 @@
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from app.features.video_processor.frame_cache import CachedFrameDecoder, FrameCache, cache_base_path
+from app.features.video_processor.frame_decoders import OpenCVFrameDecoder
+from app.features.video_processor.segmented_extractor import SegmentedVideoFrameHandler
+
+SAMPLE_VIDEO = "./tmp/mp4_sample.mp4"
+MiB = 1024 * 1024
+
+
+class RecordingDecoder(OpenCVFrameDecoder):
+    """iter_frames로 요청받은 인덱스를 기록하는 디코더"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.requests = []
+
+    def iter_frames(self, video_path, frame_indices):
+        self.requests.append(list(frame_indices))
+        return super().iter_frames(video_path, self.requests[-1])
+
+
+@pytest.fixture
+def video_path(tmp_path):
+    (tmp_path / "task").mkdir()
+    path = tmp_path / "task" / "video.mp4"
+    shutil.copyfile(SAMPLE_VIDEO, path)
+    return str(path)
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return str(tmp_path / "cache")
+
+
+def test_디코딩한_프레임만_캐시에_채우고_다시_읽을_때는_디코딩하지_않는다(video_path, cache_dir):
+    # given
+    inner = RecordingDecoder(target_size=32)
+    decoder = CachedFrameDecoder(cache_dir, inner, max_bytes=64 * MiB)
+    indices = [0, 1, 500, 4000]
+
+    # when
+    first = list(decoder.iter_frames(video_path, indices))
+    second = list(decoder.iter_frames(video_path, indices + [10]))
+
+    # then: 두 번째는 캐시에 없는 프레임만 디코딩
+    assert inner.requests == [indices, [10]]
+    expected = dict(OpenCVFrameDecoder(target_size=32).iter_frames(SAMPLE_VIDEO, indices + [10]))
+    assert [i for i, _ in second] == [0, 1, 10, 500, 4000]
+    assert all(np.array_equal(frame, expected[i]) for i, frame in first + second)
+
+    cache = FrameCache.open(cache_dir, video_path, target_size=32)
+    assert cache.shape[1:] == (32, 32, 3)
+    assert cache.fps == 30.0
+    assert cache.scale == pytest.approx(32 / 314)
+    assert cache.read(0, 2).shape == (2, 32, 32, 3)
+    assert cache.read(0, 3) is None
+    # 비디오 전체를 미리 디코딩하지 않음 (sparse 파일)
+    assert os.stat(f"{cache.base_path}.npy").st_blocks * 512 < cache.capacity * 32 * 32 * 3 / 10
+
+
+def test_하드링크한_같은_비디오는_태스크가_달라도_캐시를_공유한다(video_path, cache_dir, tmp_path):
+    # given
+    list(CachedFrameDecoder(cache_dir, OpenCVFrameDecoder(target_size=32)).iter_frames(video_path, [0, 100]))
+    (tmp_path / "other_task").mkdir()
+    linked = str(tmp_path / "other_task" / "video.mp4")
+    os.link(video_path, linked)
+    inner = RecordingDecoder(target_size=32)
+
+    # when
+    frames = list(CachedFrameDecoder(cache_dir, inner).iter_frames(linked, [0, 100]))
+
+    # then
+    assert inner.requests == []
+    assert [i for i, _ in frames] == [0, 100]
+
+
+def test_원본_비디오가_바뀌면_캐시를_버린다(video_path, cache_dir):
+    # given
+    list(CachedFrameDecoder(cache_dir, OpenCVFrameDecoder(target_size=32)).iter_frames(video_path, [0]))
+    base_path = cache_base_path(cache_dir, video_path, 32)
+
+    # when: 내용은 그대로 mtime만 변경
+    os.utime(video_path, ns=(0, 0))
+
+    # then
+    assert FrameCache.open(cache_dir, video_path, target_size=32) is not None
+
+    # when: 내용 변경
+    with open(video_path, "ab") as f:
+        f.write(b"\0" * 16)
+
+    # then
+    assert FrameCache.open(cache_dir, video_path, target_size=32) is None
+    assert not os.path.exists(f"{base_path}.npy")
+    assert not os.path.exists(f"{base_path}.json")
+
+
+def test_용량을_넘는_캐시는_만들지_않고_디렉토리_전체_용량을_넘으면_오래된_캐시부터_지운다(video_path, cache_dir, tmp_path):
+    # given: 128px 캐시는 비디오 전체를 채우면 약 220MiB
+    inner = RecordingDecoder(target_size=128)
+
+    # when
+    frames = list(CachedFrameDecoder(cache_dir, inner, max_bytes=64 * MiB).iter_frames(video_path, [0, 10]))
+
+    # then: 디코딩은 하되 캐시는 만들지 않음
+    assert [i for i, _ in frames] == [0, 10]
+    assert FrameCache.open(cache_dir, video_path, target_size=128) is None
+
+    # given: 다른 비디오 두 개의 캐시가 디렉토리 상한을 넘음
+    other_path = str(tmp_path / "other.mp4")
+    shutil.copyfile(SAMPLE_VIDEO, other_path)
+    decoder = CachedFrameDecoder(cache_dir, OpenCVFrameDecoder(target_size=32), max_bytes=20 * MiB)
+    list(decoder.iter_frames(video_path, range(5000)))
+
+    # when
+    list(decoder.iter_frames(other_path, range(5000)))
+
+    # then
+    assert FrameCache.open(cache_dir, other_path, target_size=32) is not None
+    assert FrameCache.open(cache_dir, video_path, target_size=32) is None
+
+
+def test_구간별_병렬_디코딩_워커는_캐시를_채우지_않는다(video_path, cache_dir):
+    # given
+    decoder = CachedFrameDecoder(cache_dir, OpenCVFrameDecoder(target_size=32))
+    handler = SegmentedVideoFrameHandler(num_processes=2, seek_threshold=30, min_frames_per_segment=1, decoder=decoder)
+
+    # when
+    frames = list(handler.iter_frames(video_path, range(0, 300, 10)))
+
+    # then
+    assert len(frames) == 30
+    assert FrameCache.open(cache_dir, video_path, target_size=32) is None
+
+
+def test_video_parser의_프레임_수가_OpenCV보다_많으면_그만큼_캐시_용량을_잡는다(video_path, cache_dir):
+    # given: OpenCV는 4556프레임으로 읽지만 parser는 VFR 등으로 더 많은 프레임을 셈
+    decoder = CachedFrameDecoder(cache_dir, OpenCVFrameDecoder(target_size=32), frame_count=6000)
+
+    # when
+    list(decoder.iter_frames(video_path, [0]))
+
+    # then
+    cache = FrameCache.open(cache_dir, video_path, target_size=32)
+    assert cache.capacity >= 6000
+    assert decoder.read_only().frame_count == 6000
@@ -0,0 +1,164 @@
+import shutil
+
+import ffmpeg
+import numpy as np
+import pytest
+
+from app.features.video_processor.frame_decoders import (
+    FFmpegPipeFrameDecoder,
+    Letterbox,
+    OpenCVFrameDecoder,
+    PyAVFrameDecoder,
+    build_frame_decoder,
+    group_indices,
+    select_ranges,
+    select_frame_decoder,
+)
+from app.features.video_processor.videoframe_handler import VideoFrameHandler
+
+
+SAMPLE_VIDEOS = [
+    "./tmp/mp4_sample.mp4",
+    "./tmp/webm_sample.webm",
+    "./tmp/mov_sample.mov",
+    # B-프레임이 있는 H.264 AVI: pts가 표시 순서와 맞지 않음
+    "./tmp/avi_sample.avi",
+]
+
+
+def test_간격이_seek_threshold보다_크면_묶음을_나눈다():
+    assert group_indices([0, 10, 20, 200, 210, 500], 50) == [[0, 10, 20], [200, 210], [500]]
+
+
+def test_연속된_인덱스를_구간으로_묶는다():
+    assert select_ranges([0, 1, 2, 5, 7, 8]) == [(0, 2), (5, 5), (7, 8)]
+
+
+@pytest.mark.parametrize("video_path", ["./tmp/mp4_sample.mp4", "./tmp/avi_sample.avi"])
+@pytest.mark.parametrize("frame_indices", [range(0, 4556), range(0, 4556, 3), [*range(0, 4556, 37), 5, 6, 7]])
+def test_ffmpeg_파이프는_프레임이_많아도_select_식을_구간으로_나눠_디코딩한다(video_path, frame_indices):
+    if not FFmpegPipeFrameDecoder.is_available():
+        pytest.skip("ffmpeg 백엔드를 사용할 수 없습니다")
+
+    # given: 구간이 많으면 프로세스를 나누도록 상한을 낮춤
+    decoder = FFmpegPipeFrameDecoder(target_size=32)
+    decoder.max_select_ranges = 8
+
+    # when
+    actual = list(decoder.iter_frames(video_path, frame_indices))
+
+    # then
+    expected = list(OpenCVFrameDecoder(target_size=32, seek_threshold=10 ** 9).iter_frames(video_path, frame_indices))
+    assert [index for index, _ in actual] == [index for index, _ in expected]
+    assert all(np.abs(a.astype(int) - e).mean() < 2 for (_, a), (_, e) in zip(actual, expected))
+
+
+@pytest.mark.parametrize("decoder_cls", [PyAVFrameDecoder, FFmpegPipeFrameDecoder])
+@pytest.mark.parametrize("video_path", SAMPLE_VIDEOS)
+@pytest.mark.parametrize("seek_threshold", [10, 120])
+def test_백엔드별_디코딩_결과가_OpenCV와_같다(decoder_cls, video_path, seek_threshold):
+    if not decoder_cls.is_available():
+        pytest.skip(f"{decoder_cls.name} 백엔드를 사용할 수 없습니다")
+
+    # given: seek_threshold보다 먼 인덱스를 섞어 seek 경로도 확인
+    frame_indices = sorted(set(range(3, 800, 37)) | {0, 200, 401, 650, 877})
+
+    # when: 기준값은 seek하지 않고 처음부터 순차 디코딩한 결과
+    expected = list(OpenCVFrameDecoder(seek_threshold=10 ** 9).iter_frames(video_path, frame_indices))
+    actual = list(decoder_cls(seek_threshold=seek_threshold).iter_frames(video_path, frame_indices))
+
+    # then
+    assert [index for index, _ in actual] == [index for index, _ in expected]
+    for (_, expected_frame), (_, actual_frame) in zip(expected, actual):
+        assert np.array_equal(expected_frame, actual_frame)
+
+
+def test_가벼운_코덱은_OpenCV를_선택한다():
+    assert isinstance(select_frame_decoder("mp4v", "mp4"), OpenCVFrameDecoder)
+    assert isinstance(select_frame_decoder("MJPG", "avi"), OpenCVFrameDecoder)
+
+
+def test_pts를_믿을_수_없는_컨테이너는_코덱과_관계없이_OpenCV를_선택한다():
+    assert isinstance(select_frame_decoder("h264", "avi"), OpenCVFrameDecoder)
+    assert isinstance(select_frame_decoder("h264", "wmv"), OpenCVFrameDecoder)
+
+
+def test_H264는_스레드_디코딩이_되는_백엔드를_선택한다():
+    decoder = select_frame_decoder("avc1", "mp4")
+
+    if PyAVFrameDecoder.is_available():
+        assert isinstance(decoder, PyAVFrameDecoder)
+    elif FFmpegPipeFrameDecoder.is_available():
+        assert isinstance(decoder, FFmpegPipeFrameDecoder)
+    else:
+        assert isinstance(decoder, OpenCVFrameDecoder)
+
+
+def test_지원하지_않는_디코더_이름은_예외를_던진다():
+    with pytest.raises(ValueError):
+        build_frame_decoder("gstreamer")
+
+
+def test_letterbox는_긴_변을_줄이고_정사각형으로_패딩한다():
+    # when
+    letterbox = Letterbox.fit(1280, 720, 640)
+
+    # then
+    assert (letterbox.width, letterbox.height, letterbox.scale) == (640, 640, 0.5)
+    assert (letterbox.pad_left, letterbox.pad_top) == (0, 140)
+    # 출력 좌표를 원본 좌표로 되돌림
+    assert np.allclose(letterbox.to_source([[0, 140], [640, 500]]), [[0, 0], [1280, 720]])
+
+
+@pytest.mark.parametrize("decoder_cls", [OpenCVFrameDecoder, PyAVFrameDecoder, FFmpegPipeFrameDecoder])
+def test_디코딩하면서_모델_입력_크기로_줄인다(decoder_cls):
+    if not decoder_cls.is_available():
+        pytest.skip(f"{decoder_cls.name} 백엔드를 사용할 수 없습니다")
+
+    # given: 1280x720 비디오
+    video_path = "./tmp/avi_sample.avi"
+    handler = VideoFrameHandler(decoder=decoder_cls(target_size=320))
+
+    # when
+    frames = handler.extract_indices(video_path, [0, 450])
+    letterbox = handler.letterbox_for({"width": 1280, "height": 720})
+
+    # then: 위아래 패딩은 letterbox 색
+    assert [frame.shape for frame in frames] == [(320, 320, 3)] * 2
+    assert letterbox.pad_top == 70
+    assert (frames[0][:letterbox.pad_top] == 114).all()
+
+
+@pytest.fixture(params=[90, -90])
+def rotated_video(request, tmp_path):
+    """회전 메타데이터(display matrix)만 붙인 314x240 비디오"""
+    if shutil.which("ffmpeg") is None:
+        pytest.skip("ffmpeg가 설치되어 있지 않습니다")
+    path = str(tmp_path / "rotated.mp4")
+    (
+        ffmpeg.input("./tmp/mp4_sample.mp4", display_rotation=request.param, t=20)
+        .output(path, c="copy")
+        .run(quiet=True)
+    )
+    return path
+
+
+@pytest.mark.parametrize("target_size", [None, 160])
+@pytest.mark.parametrize("decoder_cls", [PyAVFrameDecoder, FFmpegPipeFrameDecoder])
+def test_회전된_비디오는_모든_백엔드가_OpenCV와_같은_방향으로_디코딩한다(decoder_cls, target_size, rotated_video):
+    if not decoder_cls.is_available():
+        pytest.skip(f"{decoder_cls.name} 백엔드를 사용할 수 없습니다")
+
+    # given
+    frame_indices = [0, 150, 400]
+    expected = list(OpenCVFrameDecoder(target_size=target_size).iter_frames(rotated_video, frame_indices))
+
+    # when
+    actual = list(decoder_cls(target_size=target_size).iter_frames(rotated_video, frame_indices))
+
+    # then: 세로 방향(240x314)으로 회전되어 나옴
+    assert [index for index, _ in actual] == frame_indices
+    assert expected[0][1].shape[:2] == ((314, 240) if target_size is None else (160, 160))
+    for (_, expected_frame), (_, actual_frame) in zip(expected, actual):
+        assert actual_frame.shape == expected_frame.shape
+        assert np.abs(actual_frame.astype(int) - expected_frame).mean() < 2
@@ -0,0 +1,40 @@
+import shutil
+
+import numpy as np
+import pytest
+
+from app.features.video_processor.keyframe_extractor import KeyframeExtractor
+from app.features.video_processor.video_parser import FFprobeVideoParser
+from app.features.video_processor.videoframe_handler import VideoFrameHandler
+
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg가 설치되어 있지 않습니다")
+
+
+def test_키프레임만_디코딩하고_실제_프레임_인덱스를_반환한다():
+    # given: 380개의 키프레임이 있는 비디오
+    video_path = "./tmp/mp4_sample.mp4"
+    keyframes = FFprobeVideoParser().extract_info(video_path)["keyframes"]
+
+    # when
+    frame_indices, frames, keyframes_only = KeyframeExtractor().extract(video_path, 10)
+
+    # then
+    assert keyframes_only
+    assert len(frames) == 10
+    assert set(frame_indices) <= set(keyframes)
+    expected = VideoFrameHandler().extract_indices(video_path, frame_indices)
+    for expected_frame, frame in zip(expected, frames):
+        assert np.array_equal(expected_frame, frame)
+
+
+def test_키프레임이_부족하면_균등_간격_seek로_전환한다():
+    # given: 키프레임이 4개뿐인 비디오
+    video_path = "./tmp/avi_sample.avi"
+
+    # when
+    frame_indices, frames, keyframes_only = KeyframeExtractor().extract(video_path, 10)
+
+    # then
+    assert not keyframes_only
+    assert frame_indices == list(range(0, 900, 90))
+    assert len(frames) == 10
@@ -0,0 +1,27 @@
+import sqlalchemy as sa
+
+from app.entities import Base
+from app.entities.migrations import add_missing_columns
+
+
+def test_기존_테이블에_새_nullable_컬럼을_추가한다(tmp_path):
+    # given: progress, error, conversion_mode가 추가되기 전의 테이블
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'db.sqlite'}")
+    with engine.begin() as connection:
+        connection.execute(sa.text("CREATE TABLE tasks (id VARCHAR PRIMARY KEY, user_id VARCHAR NOT NULL, status VARCHAR NOT NULL)"))
+        connection.execute(sa.text(
+            "CREATE TABLE task_steps (id INTEGER PRIMARY KEY, task_id VARCHAR NOT NULL, step_name VARCHAR NOT NULL, "
+            "status VARCHAR NOT NULL, started_at DATETIME, finished_at DATETIME)"
+        ))
+        connection.execute(sa.text("INSERT INTO task_steps (task_id, step_name, status) VALUES ('t1', 'labeling', 'processing')"))
+    Base.metadata.create_all(engine)
+
+    # when
+    added = add_missing_columns(engine, Base.metadata)
+
+    # then
+    assert {"task_steps.progress", "task_steps.error", "tasks.created_at", "tasks.updated_at"} <= set(added)
+    with engine.connect() as connection:
+        assert connection.execute(sa.text("SELECT progress, error FROM task_steps")).fetchall() == [(None, None)]
+    # 두 번째 실행에서는 추가할 컬럼이 없음
+    assert add_missing_columns(engine, Base.metadata) == []
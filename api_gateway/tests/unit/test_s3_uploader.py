@@ -0,0 +1,133 @@
+import os
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+
+moto = pytest.importorskip("moto")
+
+from app.features.video_processor.s3_uploader import UPLOAD_MULTIPART, UPLOAD_PUT_OBJECT, S3Uploader  # noqa: E402
+
+MiB = 1024 * 1024
+BUCKET = "actverse-test"
+
+
+@pytest.fixture
+def s3_client(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with moto.mock_aws():
+        client = boto3.client("s3")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+class FailingPartClient:
+    """지정한 파트 번호의 upload_part를 fail_times번 실패시키는 client 래퍼"""
+
+    def __init__(self, client, fail_parts, fail_times=1):
+        self.client = client
+        self.failures = {part: fail_times for part in fail_parts}
+        self.uploaded_parts = []
+
+    def upload_part(self, **kwargs):
+        part_number = kwargs["PartNumber"]
+        if self.failures.get(part_number, 0) > 0:
+            self.failures[part_number] -= 1
+            raise ClientError({"Error": {"Code": "SlowDown"}, "ResponseMetadata": {"HTTPStatusCode": 503}}, "UploadPart")
+        self.uploaded_parts.append(part_number)
+        return self.client.upload_part(**kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+def _write_video(path, size):
+    data = os.urandom(size)
+    path.write_bytes(data)
+    return data
+
+
+def _uploader(client, **kwargs):
+    options = {"multipart_threshold": 5 * MiB, "min_part_size": 5 * MiB, "max_concurrency": 3, "backoff_sec": 0}
+    options.update(kwargs)
+    return S3Uploader(BUCKET, prefix="actverse", client=client, **options)
+
+
+def test_작은_파일은_put_object로_큰_파일은_multipart로_업로드한다(s3_client, tmp_path):
+    # given
+    small = _write_video(tmp_path / "small.json", 1000)
+    large = _write_video(tmp_path / "overlaid.mp4", 12 * MiB)
+    uploader = _uploader(s3_client)
+
+    # when
+    small_result = uploader.upload_file(str(tmp_path / "small.json"), "results/small.json")
+    uri = uploader.upload_video(str(tmp_path / "overlaid.mp4"), "results/task-1")
+
+    # then
+    assert small_result.method == UPLOAD_PUT_OBJECT
+    assert s3_client.get_object(Bucket=BUCKET, Key="results/small.json")["Body"].read() == small
+    assert uri == f"s3://{BUCKET}/actverse/results/task-1/overlaid.mp4"
+    assert s3_client.get_object(Bucket=BUCKET, Key="actverse/results/task-1/overlaid.mp4")["Body"].read() == large
+    assert not os.path.exists(uploader.state_path(str(tmp_path / "overlaid.mp4")))
+
+
+def test_일시적으로_실패한_파트는_다시_보낸다(s3_client, tmp_path):
+    # given: 2번 파트가 두 번 실패
+    data = _write_video(tmp_path / "video.mp4", 12 * MiB)
+    client = FailingPartClient(s3_client, fail_parts=[2], fail_times=2)
+
+    # when
+    result = _uploader(client, max_attempts=3).upload_file(str(tmp_path / "video.mp4"), "video.mp4")
+
+    # then
+    assert result.method == UPLOAD_MULTIPART
+    assert sorted(client.uploaded_parts) == [1, 2, 3]
+    assert s3_client.get_object(Bucket=BUCKET, Key="video.mp4")["Body"].read() == data
+
+
+def test_중단된_multipart_업로드는_남은_파트만_이어서_올린다(s3_client, tmp_path):
+    # given: 2번 파트가 재시도 횟수를 넘겨 실패한 업로드
+    data = _write_video(tmp_path / "video.mp4", 12 * MiB)
+    failing = FailingPartClient(s3_client, fail_parts=[2], fail_times=10)
+    with pytest.raises(ClientError):
+        _uploader(failing, max_attempts=2).upload_file(str(tmp_path / "video.mp4"), "video.mp4")
+    assert os.path.exists(_uploader(s3_client).state_path(str(tmp_path / "video.mp4")))
+
+    # when
+    resumed = FailingPartClient(s3_client, fail_parts=[])
+    _uploader(resumed).upload_file(str(tmp_path / "video.mp4"), "video.mp4")
+
+    # then
+    assert resumed.uploaded_parts == [2]
+    assert s3_client.get_object(Bucket=BUCKET, Key="video.mp4")["Body"].read() == data
+
+
+def test_프레임_디렉토리를_동시에_업로드하고_manifest를_남긴다(s3_client, tmp_path):
+    # given
+    frames_dir = tmp_path / "frames"
+    frames_dir.mkdir()
+    for i in range(10):
+        (frames_dir / f"frame_{i:04d}.jpg").write_bytes(os.urandom(2000))
+    uploader = _uploader(s3_client)
+
+    # when
+    uri = uploader.upload_frames(str(frames_dir), "frames/task-1", str(tmp_path / "manifest.json"))
+
+    # then
+    assert uri == f"s3://{BUCKET}/actverse/frames/task-1"
+    keys = [obj["Key"] for obj in s3_client.list_objects_v2(Bucket=BUCKET)["Contents"]]
+    assert len(keys) == 10
+    assert uploader.last_manifest.methods == {UPLOAD_PUT_OBJECT: 10}
+    assert os.path.exists(tmp_path / "manifest.json")
+
+
+def test_파트_크기는_파일_크기에_맞춰_커진다():
+    uploader = S3Uploader(BUCKET, client=object())
+
+    assert uploader.part_size(100 * MiB) == 8 * MiB
+    assert uploader.part_size(5 * 1024 * MiB) == 64 * MiB
+    # 파트 수 한도 10,000개
+    assert uploader.part_size(1024 * 1024 * MiB) * 10000 >= 1024 * 1024 * MiB
+
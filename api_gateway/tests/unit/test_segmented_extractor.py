@@ -0,0 +1,114 @@
+import shutil
+
+import numpy as np
+
+from app.features.video_processor.segmented_extractor import (
+    SegmentedVideoFrameHandler,
+    estimate_decoded_frames,
+    split_segments,
+)
+from app.features.video_processor.videoframe_handler import VideoFrameHandler
+
+
+SAMPLE_VIDEO = "./tmp/mp4_sample.mp4"
+
+
+def test_타임라인을_같은_폭의_구간으로_나눈다():
+    segments = split_segments(list(range(100)), 4)
+
+    assert [len(segment) for segment in segments] == [25, 25, 25, 25]
+    assert sum(segments, []) == list(range(100))
+
+
+def test_구간당_최소_프레임_수보다_적으면_구간_수를_줄인다():
+    segments = split_segments(list(range(0, 1000, 100)), 8, min_frames_per_segment=5)
+
+    assert len(segments) == 2
+    assert sum(segments, []) == list(range(0, 1000, 100))
+
+
+def test_여러_프로세스로_디코딩한_결과가_순차_디코딩과_같다():
+    # given
+    frame_indices = list(range(0, 900, 7))
+    handler = SegmentedVideoFrameHandler(num_processes=3, seek_threshold=30, min_frames_per_segment=1)
+
+    # when
+    segmented = list(handler.iter_frames(SAMPLE_VIDEO, frame_indices))
+    serial = list(VideoFrameHandler(seek_threshold=30).iter_frames(SAMPLE_VIDEO, frame_indices))
+
+    # then
+    assert [index for index, _ in segmented] == frame_indices
+    for (_, expected), (_, actual) in zip(serial, segmented):
+        assert np.array_equal(expected, actual)
+
+
+def test_몇_프레임만_뽑아도_seek_비용이_크면_분할한다():
+    # given: 4500프레임 비디오에서 균등 간격 30프레임 -> 모든 프레임이 seek
+    frame_indices = list(range(0, 4500, 150))
+
+    # when
+    decoded_frames = estimate_decoded_frames(frame_indices, seek_threshold=120)
+
+    # then: 기본 min_frames_per_segment(256) 기준 여러 구간
+    assert decoded_frames == 30 + 30 * 60
+    assert decoded_frames // 256 >= 2
+
+
+def test_구간_결과는_임시_파일로_넘기고_읽은_뒤_지운다(tmp_path):
+    # given
+    handler = SegmentedVideoFrameHandler(
+        num_processes=2, seek_threshold=30, min_frames_per_segment=1, spill_dir=str(tmp_path)
+    )
+
+    # when: 끝까지 읽음
+    frames = list(handler.iter_frames(SAMPLE_VIDEO, range(0, 300, 10)))
+
+    # then
+    assert len(frames) == 30 and frames[0][1].flags.writeable
+    assert list(tmp_path.iterdir()) == []
+
+    # when: 중간에 멈춤
+    iterator = handler.iter_frames(SAMPLE_VIDEO, range(0, 300, 10))
+    next(iterator)
+    iterator.close()
+
+    # then
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_읽지_않은_구간이_디스크에_쌓이는_양은_max_spill_bytes를_넘지_않는다(tmp_path):
+    # given: 314x240 프레임(약 220KiB) 20장 분량
+    frame_bytes = 314 * 240 * 3
+    handler = SegmentedVideoFrameHandler(
+        num_processes=2, seek_threshold=30, min_frames_per_segment=1, spill_dir=str(tmp_path),
+        max_spill_bytes=20 * frame_bytes,
+    )
+    frame_indices = list(range(0, 300, 2))
+
+    # when: 한 장씩 천천히 읽으면서 임시 파일 크기를 확인
+    spilled = []
+    frames = []
+    for frame in handler.iter_frames(SAMPLE_VIDEO, frame_indices):
+        frames.append(frame)
+        spilled.append(sum(path.stat().st_size for path in tmp_path.iterdir()))
+
+    # then: npy 헤더를 제외하면 상한 이내
+    assert [index for index, _ in frames] == frame_indices
+    assert max(spilled) <= 20 * frame_bytes + 4 * 1024
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_spill_dir의_여유_공간이_부족하면_현재_프로세스에서_디코딩한다(tmp_path, monkeypatch):
+    # given
+    handler = SegmentedVideoFrameHandler(
+        num_processes=2, seek_threshold=30, min_frames_per_segment=1, spill_dir=str(tmp_path)
+    )
+    monkeypatch.setattr(
+        "app.features.video_processor.segmented_extractor.shutil.disk_usage", lambda path: shutil._ntuple_diskusage(0, 0, 0)
+    )
+
+    # when
+    segments = handler._plan_segments(SAMPLE_VIDEO, list(range(0, 300, 10)), num_processes=2)
+
+    # then
+    assert segments == [list(range(0, 300, 10))]
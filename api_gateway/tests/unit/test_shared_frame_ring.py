@@ -0,0 +1,185 @@
+import multiprocessing
+import os
+import signal
+import time
+import uuid
+
+import numpy as np
+import pytest
+
+from app.features.video_processor.shared_frame_ring import (
+    RingClosedError,
+    SharedFrameRing,
+    iter_shared_frames,
+    publish_video_frames,
+)
+from app.features.video_processor.video_parser import FFprobeVideoParser
+from app.features.video_processor.videoframe_handler import VideoFrameHandler
+
+SHAPE = (24, 32, 3)
+context = multiprocessing.get_context("fork")
+
+
+@pytest.fixture
+def ring_name():
+    name = f"actverse-test-{uuid.uuid4().hex[:8]}"
+    yield name
+    # 테스트가 남긴 세그먼트가 있으면 stale로 보고 정리
+    try:
+        SharedFrameRing.create(name, SHAPE, stale_after_sec=0).close(timeout=0)
+    except FileExistsError:
+        pass
+
+
+def _consume(name, results, delay_sec=0.0):
+    try:
+        with SharedFrameRing.attach(name, timeout=5) as ring:
+            received = []
+            for frame_index, frame in ring:
+                received.append((frame_index, int(frame[0, 0, 0]), float(frame.mean())))
+                time.sleep(delay_sec)
+        results.put(received)
+    except RingClosedError as e:
+        results.put(str(e))
+
+
+def _frame(value):
+    return np.full(SHAPE, value % 256, dtype=np.uint8)
+
+
+def test_모든_소비자가_모든_프레임을_순서대로_받고_느린_소비자를_기다린다(ring_name):
+    # given: 슬롯 4개, 소비자 하나는 느림
+    results = context.Queue()
+    consumers = [
+        context.Process(target=_consume, args=(ring_name, results, delay)) for delay in (0.0, 0.005)
+    ]
+
+    # when
+    with SharedFrameRing.create(ring_name, SHAPE, capacity=4) as ring:
+        for consumer in consumers:
+            consumer.start()
+        ring.wait_for_consumers(2, timeout=5)
+        published = ring.publish_all(((i * 10, _frame(i)) for i in range(30)), timeout=5)
+
+    # then
+    received = [results.get(timeout=10) for _ in consumers]
+    for consumer in consumers:
+        consumer.join()
+    assert published == 30
+    for frames in received:
+        assert [(frame_index, value) for frame_index, value, _ in frames] == [(i * 10, i) for i in range(30)]
+        assert all(mean == value for _, value, mean in frames)
+    assert not os.path.exists(f"/dev/shm/{ring_name}")
+
+
+def test_생산자가_중단하면_소비자는_예외를_받는다(ring_name):
+    # given
+    results = context.Queue()
+    consumer = context.Process(target=_consume, args=(ring_name, results))
+
+    # when
+    ring = SharedFrameRing.create(ring_name, SHAPE, capacity=4)
+    consumer.start()
+    ring.wait_for_consumers(1, timeout=5)
+
+    def failing_frames():
+        yield 0, _frame(0)
+        raise ValueError("디코딩 실패")
+
+    with pytest.raises(ValueError):
+        ring.publish_all(failing_frames())
+    ring.close()
+
+    # then
+    assert "중단" in results.get(timeout=10)
+    consumer.join()
+
+
+def test_죽은_소비자는_등록_해제되어_생산자를_막지_않는다(ring_name):
+    # given: 프레임을 읽지 않고 멈춘 뒤 강제 종료되는 소비자
+    def stuck_consumer(name):
+        SharedFrameRing.attach(name, timeout=5)
+        time.sleep(60)
+
+    ring = SharedFrameRing.create(ring_name, SHAPE, capacity=2, stale_after_sec=0.3)
+    consumer = context.Process(target=stuck_consumer, args=(ring_name,))
+    consumer.start()
+    ring.wait_for_consumers(1, timeout=5)
+    os.kill(consumer.pid, signal.SIGKILL)
+    consumer.join()
+
+    # when: capacity보다 많이 publish
+    started = time.monotonic()
+    for i in range(5):
+        ring.publish(_frame(i), i, timeout=5)
+
+    # then
+    assert time.monotonic() - started < 3
+    assert ring.num_consumers == 0
+    ring.close()
+
+
+def _crashed_producer(name):
+    # close하지 않고 종료된 생산자
+    ring = SharedFrameRing.create(name, SHAPE, capacity=2)
+    ring.publish(_frame(1), 1)
+    os._exit(1)
+
+
+def _crash_producer(name):
+    producer = context.Process(target=_crashed_producer, args=(name,))
+    producer.start()
+    producer.join()
+    time.sleep(0.3)
+
+
+def test_생산자가_죽으면_소비자는_예외를_내고_세그먼트를_지운다(ring_name):
+    # given
+    _crash_producer(ring_name)
+    consumer = SharedFrameRing.attach(ring_name, timeout=1, stale_after_sec=0.2)
+
+    # then
+    with pytest.raises(RingClosedError):
+        next(iter(consumer))
+    consumer.close()
+    assert not os.path.exists(f"/dev/shm/{ring_name}")
+
+
+def test_죽은_생산자가_남긴_세그먼트는_다시_만들_때_정리한다(ring_name):
+    # given
+    _crash_producer(ring_name)
+
+    # when
+    ring = SharedFrameRing.create(ring_name, SHAPE, stale_after_sec=0.2)
+
+    # then: 살아있는 링은 덮어쓰지 않음
+    with pytest.raises(FileExistsError):
+        SharedFrameRing.create(ring_name, SHAPE, stale_after_sec=0.2)
+    ring.close(timeout=0)
+
+
+def _consume_task(task_id, results):
+    results.put([(frame_index, frame.copy()) for frame_index, frame in iter_shared_frames(task_id, timeout=5)])
+
+
+def test_디코딩한_프레임을_디스크를_거치지_않고_넘긴다():
+    # given
+    video_path = "./tmp/mp4_sample.mp4"
+    video_info = FFprobeVideoParser(read_packets=False).extract_info(video_path)
+    handler = VideoFrameHandler(target_size=128)
+    task_id = uuid.uuid4().hex[:8]
+    results = context.Queue()
+    consumer = context.Process(target=_consume_task, args=(task_id, results))
+    consumer.start()
+
+    # when
+    published = publish_video_frames(handler, video_path, range(0, 50, 5), video_info, task_id)
+
+    # then
+    received = results.get(timeout=10)
+    consumer.join()
+    expected = list(handler.iter_frames(video_path, range(0, 50, 5)))
+    assert published == len(received) == 10
+    assert [i for i, _ in received] == [i for i, _ in expected]
+    assert all(np.array_equal(a, b) for (_, a), (_, b) in zip(received, expected))
+    assert received[0][1].shape == handler.frame_shape(video_info) == (128, 128, 3)
@@ -0,0 +1,57 @@
+from actverse_common.events import EVENT_TASK_FAILED, EVENT_VIDEO_VALIDATED
+
+from app.entities import TaskStep, Video
+from app.services.task_tracker import TaskTracker
+
+
+def _tracker(tmp_path):
+    tracker = TaskTracker(f"sqlite:///{tmp_path / 'db.sqlite'}")
+    tracker.create_tables()
+    return tracker
+
+
+def test_검증_이벤트의_품질_추정을_Video에_저장한다(tmp_path):
+    # given
+    tracker = _tracker(tmp_path)
+
+    # when
+    tracker._process_event({"event_type": EVENT_VIDEO_VALIDATED, "data": {
+        "task_id": "t1", "user_id": "u1", "camera_angle": "top", "video_quality": "qualified", "duration_sec": 12.5,
+    }})
+
+    # then
+    with tracker.Session() as session:
+        video = session.query(Video).filter(Video.task_id == "t1").one()
+        assert (video.camera_angle.value, video.video_quality.value, video.duration_sec) == ("top", "qualified", 12.5)
+        assert video.conversion_mode is None
+
+
+def test_검증_이벤트의_변환_경로를_Video에_저장한다(tmp_path):
+    # given
+    tracker = _tracker(tmp_path)
+
+    # when
+    tracker._process_event({"event_type": EVENT_VIDEO_VALIDATED, "data": {
+        "task_id": "t1", "user_id": "u1", "camera_angle": "top", "video_quality": "qualified",
+        "conversion_mode": "remux",
+    }})
+
+    # then
+    with tracker.Session() as session:
+        assert session.query(Video).filter(Video.task_id == "t1").one().conversion_mode == "remux"
+
+
+def test_품질_게이트로_실패한_태스크도_추정값을_저장한다(tmp_path):
+    # given
+    tracker = _tracker(tmp_path)
+
+    # when
+    tracker._process_event({"event_type": EVENT_TASK_FAILED, "data": {
+        "task_id": "t1", "user_id": "u1", "step": "video_validation", "reason": "unqualified_video",
+        "camera_angle": None, "video_quality": "unqualified",
+    }})
+
+    # then
+    with tracker.Session() as session:
+        assert session.query(Video).filter(Video.task_id == "t1").one().video_quality.value == "unqualified"
+        assert session.query(TaskStep).filter(TaskStep.task_id == "t1").one().error == "unqualified_video"
@@ -0,0 +1,155 @@
+import hashlib
+import os
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from app.features.video_processor.video_cache import VideoBlobCache
+from app.features.video_processor.video_downloader import VercelVideoDownloader
+
+
+class CountingHandler(SimpleHTTPRequestHandler):
+    get_count = 0
+
+    def do_GET(self):
+        CountingHandler.get_count += 1
+        super().do_GET()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(tmp_path):
+    served = tmp_path / "served"
+    served.mkdir()
+    (served / "a.mp4").write_bytes(os.urandom(3000))
+    (served / "b.mp4").write_bytes(os.urandom(3000))
+    (served / "a_copy.mp4").write_bytes((served / "a.mp4").read_bytes())
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), partial(CountingHandler, directory=str(served)))
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    CountingHandler.get_count = 0
+    yield f"http://127.0.0.1:{httpd.server_port}", served
+    httpd.shutdown()
+
+
+def test_같은_비디오를_다시_요청하면_다운로드_없이_하드링크한다(server, tmp_path):
+    # given
+    base_url, served = server
+    cache = VideoBlobCache(str(tmp_path / "cache"), max_bytes=10_000)
+
+    # when
+    first = cache.fetch(f"{base_url}/a.mp4", str(tmp_path / "task1"), VercelVideoDownloader())
+    second = cache.fetch(f"{base_url}/a.mp4", str(tmp_path / "task2"), VercelVideoDownloader())
+
+    # then
+    assert CountingHandler.get_count == 1
+    assert os.path.basename(second) == "a.mp4"
+    assert os.stat(first).st_ino == os.stat(second).st_ino
+    sha256 = hashlib.sha256((served / "a.mp4").read_bytes()).hexdigest()
+    assert os.path.exists(tmp_path / "cache" / "blobs" / sha256)
+
+
+def test_URL이_달라도_내용이_같으면_blob을_공유한다(server, tmp_path):
+    base_url, _ = server
+    cache = VideoBlobCache(str(tmp_path / "cache"), max_bytes=10_000)
+
+    first = cache.fetch(f"{base_url}/a.mp4", str(tmp_path / "task1"), VercelVideoDownloader())
+    second = cache.fetch(f"{base_url}/a_copy.mp4", str(tmp_path / "task2"), VercelVideoDownloader())
+
+    assert os.stat(first).st_ino == os.stat(second).st_ino
+    assert len(os.listdir(tmp_path / "cache" / "blobs")) == 1
+
+
+def test_용량을_넘으면_가장_오래_사용하지_않은_blob을_삭제한다(server, tmp_path):
+    # given: blob 하나만 담을 수 있는 캐시, a를 쓴 태스크는 정리됨
+    base_url, _ = server
+    cache = VideoBlobCache(str(tmp_path / "cache"), max_bytes=4000)
+    first = cache.fetch(f"{base_url}/a.mp4", str(tmp_path / "task1"), VercelVideoDownloader())
+    os.remove(first)
+
+    # when
+    cache.fetch(f"{base_url}/b.mp4", str(tmp_path / "task2"), VercelVideoDownloader())
+    cache.fetch(f"{base_url}/a.mp4", str(tmp_path / "task3"), VercelVideoDownloader())
+
+    # then: a는 b에 밀려 삭제되었으므로 다시 다운로드된다.
+    assert CountingHandler.get_count == 3
+    assert len(os.listdir(tmp_path / "cache" / "blobs")) == 2
+
+
+def test_태스크가_하드링크로_쓰는_blob은_용량을_넘어도_삭제하지_않는다(server, tmp_path):
+    # given
+    base_url, _ = server
+    cache = VideoBlobCache(str(tmp_path / "cache"), max_bytes=4000)
+    cache.fetch(f"{base_url}/a.mp4", str(tmp_path / "task1"), VercelVideoDownloader())
+
+    # when
+    cache.fetch(f"{base_url}/b.mp4", str(tmp_path / "task2"), VercelVideoDownloader())
+    cache.fetch(f"{base_url}/a.mp4", str(tmp_path / "task3"), VercelVideoDownloader())
+
+    # then: 지워도 공간이 돌아오지 않으므로 a를 남겨 다시 다운로드하지 않는다.
+    assert CountingHandler.get_count == 2
+    assert len(os.listdir(tmp_path / "cache" / "blobs")) == 2
+
+
+class ResumableDownloader(VercelVideoDownloader):
+    """fail=True면 절반만 받고 실패하고, 받다 만 파일이 있으면 남은 부분만 받는 다운로더"""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.resumed_from = []
+
+    def download(self, url, download_path, hasher=None):
+        os.makedirs(download_path, exist_ok=True)
+        target = os.path.join(download_path, os.path.basename(url))
+        part_path = f"{target}.part"
+        data = requests.get(url).content
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        self.resumed_from.append(offset)
+        with open(part_path, "ab") as f:
+            if self.fail:
+                f.write(data[offset:len(data) // 2])
+                raise ConnectionError("connection reset")
+            f.write(data[offset:])
+        if hasher is not None:
+            hasher.update(data)
+        os.replace(part_path, target)
+        return target
+
+
+def test_중단된_다운로드는_같은_URL로_다시_요청하면_이어받고_끝나면_임시_파일을_지운다(server, tmp_path):
+    # given
+    base_url, served = server
+    cache = VideoBlobCache(str(tmp_path / "cache"), max_bytes=10_000)
+    url = f"{base_url}/a.mp4"
+    with pytest.raises(ConnectionError):
+        cache.fetch(url, str(tmp_path / "task1"), ResumableDownloader(fail=True))
+
+    # when
+    downloader = ResumableDownloader()
+    downloaded = cache.fetch(url, str(tmp_path / "task1"), downloader)
+
+    # then: 실패한 다운로드가 받은 1500바이트 뒤부터 이어받음
+    assert downloader.resumed_from == [1500]
+    assert open(downloaded, "rb").read() == (served / "a.mp4").read_bytes()
+    assert os.listdir(tmp_path / "cache" / "tmp") == []
+
+
+def test_오래_재개되지_않은_임시_파일은_다음_다운로드_때_지운다(server, tmp_path):
+    # given
+    base_url, _ = server
+    cache = VideoBlobCache(str(tmp_path / "cache"), max_bytes=10_000, tmp_max_age=60)
+    with pytest.raises(ConnectionError):
+        cache.fetch(f"{base_url}/a.mp4", str(tmp_path / "task1"), ResumableDownloader(fail=True))
+    (stale,) = (tmp_path / "cache" / "tmp").iterdir()
+    for path in [stale, *stale.iterdir()]:
+        os.utime(path, (0, 0))
+
+    # when
+    cache.fetch(f"{base_url}/b.mp4", str(tmp_path / "task2"), VercelVideoDownloader())
+
+    # then
+    assert os.listdir(tmp_path / "cache" / "tmp") == []
@@ -0,0 +1,232 @@
+import os
+import shutil
+
+import cv2
+import ffmpeg
+import numpy as np
+import pytest
+
+from app.entities import Video
+from app.features.video_processor.video_converter import (
+    CONVERSION_REMUX,
+    CONVERSION_TRANSCODE,
+    FFmpegVideoConverter,
+    convert_for_stages,
+    convert_stream_for_stage,
+    find_conversion,
+    load_conversions,
+)
+from app.repositories.fake_repository import FakeRepository
+from app.services import video_service
+
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg가 설치되어 있지 않습니다")
+
+
+def _write_video(path, fourcc, num_frames=30, size=(64, 48), fps=30):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*fourcc), fps, size)
+    for i in range(num_frames):
+        writer.write(np.full((size[1], size[0], 3), i * 8 % 256, dtype=np.uint8))
+    writer.release()
+
+
+def _read_chunks(path, chunk_size=4096):
+    with open(path, "rb") as f:
+        yield from iter(lambda: f.read(chunk_size), b"")
+
+
+def _frame_count(path):
+    cap = cv2.VideoCapture(str(path))
+    count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+    return count
+
+
+def test_스트림을_ffmpeg로_바로_변환하고_원본을_함께_저장한다(tmp_path):
+    # given: 스트림으로 읽을 수 있는 avi
+    source = tmp_path / "source.avi"
+    _write_video(source, "MJPG")
+
+    # when
+    result = FFmpegVideoConverter().convert_stream(
+        _read_chunks(source), str(tmp_path / "out" / "source.mp4"), tee_path=str(tmp_path / "tee.avi")
+    )
+
+    # then
+    assert _frame_count(result.output_file) == 30
+    assert (tmp_path / "tee.avi").read_bytes() == source.read_bytes()
+
+
+def test_moov가_끝에_있는_mp4는_저장된_원본으로_다시_변환한다(tmp_path):
+    # given: cv2.VideoWriter의 mp4는 moov atom을 파일 끝에 기록
+    source = tmp_path / "source.mp4"
+    _write_video(source, "mp4v")
+
+    # when
+    result = FFmpegVideoConverter().convert_stream(
+        _read_chunks(source), str(tmp_path / "out" / "source.mp4"), tee_path=str(tmp_path / "tee.mp4")
+    )
+
+    # then
+    assert _frame_count(result.output_file) == 30
+
+
+def _write_h264_mp4(path):
+    source = path.with_suffix(".avi")
+    _write_video(source, "MJPG")
+    ffmpeg.input(str(source)).output(str(path), vcodec="libx264", pix_fmt="yuv420p").overwrite_output().run(quiet=True)
+
+
+def test_H264_mp4는_재인코딩없이_remux한다(tmp_path):
+    # given
+    source = tmp_path / "h264.mp4"
+    _write_h264_mp4(source)
+
+    # when
+    result = FFmpegVideoConverter().convert(str(source), str(tmp_path / "out"))
+
+    # then
+    assert result.mode == CONVERSION_REMUX
+    assert _frame_count(result.output_file) == 30
+
+
+def test_mpeg4_mp4는_transcode하고_Video에_기록한다(tmp_path):
+    # given
+    source = tmp_path / "mpeg4.mp4"
+    _write_video(source, "mp4v")
+    repository = FakeRepository()
+    repository.add(Video(id="task-1", task_id="task-1"))
+
+    # when
+    result = video_service.convert_video(str(source), str(tmp_path / "out"), task_id="task-1", repository=repository)
+
+    # then
+    assert result.mode == CONVERSION_TRANSCODE
+    assert repository.get("task-1").conversion_mode == CONVERSION_TRANSCODE
+
+
+def test_analysis_프로파일은_해상도와_fps를_제한한다(tmp_path):
+    # given: 1280x720, 60fps
+    source = tmp_path / "large.avi"
+    _write_video(source, "MJPG", num_frames=60, size=(1280, 720), fps=60)
+
+    # when
+    result = FFmpegVideoConverter("analysis-640").convert(str(source), str(tmp_path / "out"))
+
+    # then
+    assert result.output_file.endswith("large_analysis-640.mp4")
+    stream = ffmpeg.probe(result.output_file)["streams"][0]
+    assert (stream["width"], stream["height"]) == (640, 360)
+    assert stream["avg_frame_rate"] == "30/1"
+
+
+def test_H264_mp4라도_키프레임_간격이_있는_프로파일은_재인코딩한다(tmp_path):
+    # given
+    source = tmp_path / "h264.mp4"
+    _write_h264_mp4(source)
+
+    # when
+    result = FFmpegVideoConverter("labeling").convert(str(source), str(tmp_path / "out"))
+
+    # then
+    assert result.mode == CONVERSION_TRANSCODE
+
+
+def test_같은_프로파일을_쓰는_단계는_한번만_변환하고_원본을_삭제한다(tmp_path):
+    # given
+    source = tmp_path / "source.avi"
+    _write_video(source, "MJPG")
+
+    # when
+    results = convert_for_stages(
+        str(source), str(tmp_path / "out"), ["frame_extraction", "inference", "upload"], keep_original=False
+    )
+
+    # then
+    assert sorted(os.listdir(tmp_path / "out")) == [
+        "conversions.json", "source.avi", "source_analysis-640.mp4", "source_labeling.mp4"
+    ]
+    assert results["upload"].output_file.endswith("source.avi")
+    assert not source.exists()
+    conversions = load_conversions(str(tmp_path / "out"))
+    assert conversions["original_kept"] is False
+    assert conversions["stages"]["inference"]["profile"] == "analysis-640"
+
+
+def test_다운로드하면서_변환한_단계는_다시_변환하지_않는다(tmp_path):
+    # given: 다운로드 청크를 inference 프로파일로 바로 변환하고 원본은 download 디렉토리에 저장
+    source = tmp_path / "source.avi"
+    _write_video(source, "MJPG")
+    original = tmp_path / "download" / "source.avi"
+    original.parent.mkdir()
+    streamed = convert_stream_for_stage(_read_chunks(source), str(original), str(tmp_path / "out"), "inference")
+    streamed_mtime = os.stat(streamed.output_file).st_mtime_ns
+
+    # when
+    results = convert_for_stages(
+        str(original), str(tmp_path / "out"), ["inference", "frame_extraction"], converted={"inference": streamed}
+    )
+
+    # then
+    assert original.read_bytes() == source.read_bytes()
+    assert results["inference"].output_file == str(tmp_path / "out" / "source_analysis-640.mp4")
+    assert os.stat(results["inference"].output_file).st_mtime_ns == streamed_mtime
+    assert results["inference"].geometry is not None
+    assert os.path.exists(results["frame_extraction"].output_file)
+
+
+def test_원본을_대신할_archive_변환본이_없으면_원본을_지우지_않는다(tmp_path):
+    # given
+    source = tmp_path / "source.avi"
+    _write_video(source, "MJPG")
+
+    # when
+    convert_for_stages(str(source), str(tmp_path / "out"), ["inference"], keep_original=False)
+
+    # then
+    assert source.exists()
+    assert load_conversions(str(tmp_path / "out"))["original_kept"] is True
+
+
+def test_변환본의_좌표와_프레임_번호를_원본으로_되돌릴_정보를_남긴다(tmp_path):
+    # given: 1280x720, 60fps
+    source = tmp_path / "large.avi"
+    _write_video(source, "MJPG", num_frames=60, size=(1280, 720), fps=60)
+
+    # when
+    results = convert_for_stages(str(source), str(tmp_path / "out"), ["inference", "frame_extraction"])
+
+    # then: 변환 결과와 conversions.json 모두 원본 대비 배율과 fps를 가짐
+    geometry = results["inference"].geometry
+    assert (geometry.source_width, geometry.source_height, geometry.source_fps) == (1280, 720, 60.0)
+    assert (geometry.width, geometry.height, geometry.fps) == (640, 360, 30.0)
+    assert geometry.scale == 0.5
+    assert geometry.to_source_frame_index(15) == 30
+
+    conversion = find_conversion(results["inference"].output_file, "inference")
+    assert conversion.geometry == geometry
+    assert find_conversion(results["frame_extraction"].output_file, "inference") is None
+    assert find_conversion(results["frame_extraction"].output_file, "frame_extraction").geometry.scale == 1.0
+
+
+def test_지원하지_않는_프로파일은_예외를_던진다():
+    with pytest.raises(ValueError):
+        FFmpegVideoConverter("4k")
+
+
+def test_변환과_프레임_샘플링을_한번에_처리한다(tmp_path):
+    # given: 프레임마다 밝기가 다른 60프레임 비디오
+    source = tmp_path / "source.avi"
+    _write_video(source, "MJPG", num_frames=60)
+
+    # when
+    result, frame_indices = FFmpegVideoConverter("labeling").convert_and_sample(
+        str(source), str(tmp_path / "out"), str(tmp_path / "frames"), num_frames=6
+    )
+
+    # then: NaiveVideoFrameCurator와 같은 인덱스를, 같은 밝기의 프레임으로 저장
+    assert frame_indices == [0, 10, 20, 30, 40, 50]
+    assert _frame_count(result.output_file) == 60
+    assert sorted(os.listdir(tmp_path / "frames")) == [f"frame_{i:04d}.jpg" for i in range(6)]
+    for i, frame_index in enumerate(frame_indices):
+        frame = cv2.imread(str(tmp_path / "frames" / f"frame_{i:04d}.jpg"))
+        assert abs(int(frame.mean()) - frame_index * 8 % 256) <= 3
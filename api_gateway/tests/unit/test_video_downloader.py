@@ -0,0 +1,165 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from app.features.video_processor.video_downloader import RangedVideoDownloader
+
+
+class RangeRequestHandler(SimpleHTTPRequestHandler):
+    """단일 구간 Range 요청을 지원하는 테스트용 정적 파일 핸들러"""
+
+    requested_ranges = []
+
+    def do_GET(self):
+        match = re.match(r"bytes=(\d+)-(\d+)", self.headers.get("Range", ""))
+        if not match:
+            return super().do_GET()
+
+        path = self.translate_path(self.path)
+        with open(path, "rb") as f:
+            data = f.read()
+        start, end = int(match.group(1)), min(int(match.group(2)), len(data) - 1)
+        self.requested_ranges.append((start, end))
+
+        self.send_response(206)
+        self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("ETag", '"sample-etag"')
+        self.end_headers()
+        self.wfile.write(data[start:end + 1])
+
+    def log_message(self, *args):
+        pass
+
+
+class FlakyRangeRequestHandler(RangeRequestHandler):
+    """구간마다 첫 요청은 절반만 보내고 연결을 끊는 핸들러"""
+
+    failed_starts = set()
+
+    def do_GET(self):
+        match = re.match(r"bytes=(\d+)-(\d+)", self.headers.get("Range", ""))
+        if not match or match.group(1) == "0" and match.group(2) == "0" or match.group(1) in self.failed_starts:
+            return super().do_GET()
+        self.failed_starts.add(match.group(1))
+
+        path = self.translate_path(self.path)
+        with open(path, "rb") as f:
+            data = f.read()
+        start, end = int(match.group(1)), min(int(match.group(2)), len(data) - 1)
+        self.send_response(206)
+        self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        self.wfile.write(data[start:start + (end - start + 1) // 2])
+        self.close_connection = True
+
+
+def _serve(directory, handler_class):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(handler_class, directory=str(directory)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def sample_file(tmp_path):
+    served = tmp_path / "served"
+    served.mkdir()
+    data = os.urandom(1024 * 1024 + 123)
+    (served / "sample.mp4").write_bytes(data)
+    return served, data
+
+
+def test_여러_연결로_구간을_나눠_다운로드한다(sample_file, tmp_path):
+    # given
+    served, data = sample_file
+    server = _serve(served, RangeRequestHandler)
+    RangeRequestHandler.requested_ranges = []
+    downloader = RangedVideoDownloader(num_connections=4, range_chunk_size=256 * 1024)
+
+    # when
+    downloaded = downloader.download(f"http://127.0.0.1:{server.server_port}/sample.mp4", str(tmp_path / "out"))
+    server.shutdown()
+
+    # then: probe 1회 + 청크 5개
+    assert open(downloaded, "rb").read() == data
+    assert len(RangeRequestHandler.requested_ranges) == 6
+    assert not os.path.exists(f"{downloaded}.part.json")
+
+
+def test_상태_파일이_있으면_남은_청크만_이어받는다(sample_file, tmp_path):
+    # given: 첫 두 청크는 이미 받은 상태
+    served, data = sample_file
+    server = _serve(served, RangeRequestHandler)
+    url = f"http://127.0.0.1:{server.server_port}/sample.mp4"
+    chunk_size = 256 * 1024
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    part = bytearray(len(data))
+    part[:2 * chunk_size] = data[:2 * chunk_size]
+    (out_dir / "sample.mp4.part").write_bytes(bytes(part))
+    (out_dir / "sample.mp4.part.json").write_text(json.dumps({
+        "url": url, "size": len(data), "etag": '"sample-etag"', "chunk_size": chunk_size, "completed": [0, 1],
+    }))
+    RangeRequestHandler.requested_ranges = []
+
+    # when
+    hasher = hashlib.sha256()
+    downloaded = RangedVideoDownloader(num_connections=2, range_chunk_size=chunk_size).download(
+        url, str(out_dir), hasher=hasher
+    )
+    server.shutdown()
+
+    # then: 이미 받은 청크까지 포함한 전체 해시
+    assert open(downloaded, "rb").read() == data
+    assert hasher.hexdigest() == hashlib.sha256(data).hexdigest()
+    assert all(start >= 2 * chunk_size for start, _ in RangeRequestHandler.requested_ranges[1:])
+
+
+def test_서버가_Range를_무시하면_단일_연결로_다운로드한다(sample_file, tmp_path):
+    served, data = sample_file
+    server = _serve(served, SimpleHTTPRequestHandler)
+
+    downloaded = RangedVideoDownloader().download(
+        f"http://127.0.0.1:{server.server_port}/sample.mp4", str(tmp_path / "out")
+    )
+    server.shutdown()
+
+    assert open(downloaded, "rb").read() == data
+
+
+def test_끊긴_청크는_다시_받고_해시는_순서대로_계산한다(sample_file, tmp_path):
+    # given
+    served, data = sample_file
+    server = _serve(served, FlakyRangeRequestHandler)
+    FlakyRangeRequestHandler.failed_starts = set()
+    hasher = hashlib.sha256()
+
+    # when
+    downloaded = RangedVideoDownloader(num_connections=3, range_chunk_size=256 * 1024, retry_backoff=0.01).download(
+        f"http://127.0.0.1:{server.server_port}/sample.mp4", str(tmp_path / "out"), hasher=hasher
+    )
+    server.shutdown()
+
+    # then
+    assert open(downloaded, "rb").read() == data
+    assert hasher.hexdigest() == hashlib.sha256(data).hexdigest()
+    assert len(FlakyRangeRequestHandler.failed_starts) == 5
+
+
+def test_오류_응답은_파일로_저장하지_않고_예외를_발생시킨다(sample_file, tmp_path):
+    served, _ = sample_file
+    server = _serve(served, SimpleHTTPRequestHandler)
+
+    with pytest.raises(requests.HTTPError):
+        RangedVideoDownloader().download(f"http://127.0.0.1:{server.server_port}/missing.mp4", str(tmp_path / "out"))
+    server.shutdown()
+
+    assert not os.path.exists(tmp_path / "out" / "missing.mp4")
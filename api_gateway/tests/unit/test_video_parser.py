@@ -0,0 +1,70 @@
+import os
+import shutil
+
+import pytest
+
+from app.features.video_processor import video_parser
+from app.features.video_processor.video_parser import FFprobeVideoParser
+
+pytestmark = pytest.mark.skipif(shutil.which("ffprobe") is None, reason="ffprobe가 설치되어 있지 않습니다")
+
+
+def test_패킷을_세어_정확한_프레임_수와_키프레임_위치를_구한다():
+    # when: webm은 헤더에 프레임 수가 없어 OpenCV는 길이*fps로 추정 (916)
+    info = FFprobeVideoParser().extract_info("./tmp/webm_sample.webm")
+
+    # then
+    assert info["frame_count"] == 901
+    assert info["keyframes"][0] == 0
+    assert info["keyframes"] == sorted(info["keyframes"])
+    assert (info["width"], info["height"], info["pix_fmt"]) == (640, 360, "yuv420p")
+    assert info["video_type"] == "webm"
+
+
+def test_같은_내용의_파일은_다시_probe하지_않는다(tmp_path, monkeypatch):
+    # given: 다른 경로에 복사한 같은 파일과 디스크 캐시를 공유하는 새 파서
+    copied = tmp_path / "copied.avi"
+    shutil.copyfile("./tmp/avi_sample.avi", copied)
+    FFprobeVideoParser(cache_dir=str(tmp_path / "probe")).extract_info("./tmp/avi_sample.avi")
+
+    probe_calls = []
+    original_probe = video_parser.ffmpeg.probe
+    monkeypatch.setattr(
+        video_parser.ffmpeg, "probe", lambda *args, **kwargs: probe_calls.append(args) or original_probe(*args, **kwargs)
+    )
+
+    # when
+    info = FFprobeVideoParser(cache_dir=str(tmp_path / "probe")).extract_info(str(copied))
+
+    # then
+    assert probe_calls == []
+    assert info["frame_count"] == 901
+
+
+def test_크기와_앞뒤가_같아도_내용이_다르면_다시_probe한다(tmp_path, monkeypatch):
+    # given: 중간 일부 바이트만 다른 같은 크기의 파일
+    original = tmp_path / "original.avi"
+    changed = tmp_path / "changed.avi"
+    shutil.copyfile("./tmp/avi_sample.avi", original)
+    data = bytearray(original.read_bytes())
+    data[len(data) // 4] ^= 0xFF
+    changed.write_bytes(bytes(data))
+    parser = FFprobeVideoParser(read_packets=False, cache_dir=str(tmp_path / "probe"))
+    parser.extract_info(str(original))
+
+    probe_calls = []
+    original_probe = video_parser.ffmpeg.probe
+    monkeypatch.setattr(
+        video_parser.ffmpeg, "probe", lambda *args, **kwargs: probe_calls.append(args) or original_probe(*args, **kwargs)
+    )
+
+    # when
+    parser.extract_info(str(changed))
+    # 같은 파일을 제자리에서 수정해도 mtime이 바뀌어 해시를 다시 계산
+    original.write_bytes(bytes(data))
+    os.utime(original, ns=(1, 1))
+    parser.extract_info(str(original))
+    parser.extract_info(str(changed))
+
+    # then: 수정된 original은 changed와 내용이 같아 캐시를 공유
+    assert len(probe_calls) == 1
@@ -0,0 +1,81 @@
+import cv2
+import numpy as np
+
+from app.entities.video import CameraAngle, VideoQuality
+from app.features.video_processor.video_parser import FFprobeVideoParser
+from app.features.video_processor.video_quality_estimator import (
+    REASON_BLURRY,
+    REASON_LOW_RESOLUTION,
+    REASON_TOO_DARK,
+    REASON_WRONG_ANGLE,
+    FrameStatistics,
+    NearestCentroidCameraAngleClassifier,
+    VideoQualityEstimator,
+)
+
+
+def _textured_frames(num_frames=4, size=(160, 120), seed=0):
+    rng = np.random.default_rng(seed)
+    return [rng.integers(40, 220, (size[1], size[0], 3), dtype=np.uint8) for _ in range(num_frames)]
+
+
+def test_탑뷰_샘플_비디오는_qualified로_추정한다():
+    # given: 위에서 내려다본 아레나 영상 (314x240)
+    video_path = "./tmp/mp4_sample.mp4"
+    video_info = FFprobeVideoParser(read_packets=False).extract_info(video_path)
+
+    # when
+    estimate = VideoQualityEstimator().estimate(video_path, video_info)
+
+    # then
+    assert estimate.video_quality == VideoQuality.QUALIFIED
+    assert estimate.camera_angle == CameraAngle.TOP
+    assert estimate.to_video_info() == {"camera_angle": "top", "video_quality": "qualified"}
+
+
+def _checkerboard(size=(160, 120), cell=30):
+    y, x = np.mgrid[:size[1], :size[0]]
+    return np.dstack([((y // cell + x // cell) % 2 * 160 + 50).astype(np.uint8)] * 3)
+
+
+def test_어둡고_흐리고_작은_비디오는_사유와_함께_unqualified로_추정한다():
+    # given: 대비는 유지하고 경계만 흐린 프레임
+    dark = [(frame * 0.1).astype(np.uint8) for frame in _textured_frames()]
+    blurry = [cv2.GaussianBlur(_checkerboard(), (0, 0), 4)] * 4
+    estimator = VideoQualityEstimator()
+
+    # then
+    assert REASON_TOO_DARK in estimator.estimate_frames(dark).reasons
+    assert estimator.estimate_frames(blurry).reasons == [REASON_BLURRY]
+    small = estimator.estimate_frames(_textured_frames(), width=320, height=180)
+    assert small.video_quality == VideoQuality.UNQUALIFIED
+    assert small.reasons == [REASON_LOW_RESOLUTION]
+
+
+def test_허용하지_않은_앵글은_unqualified로_추정한다():
+    # given: 정면 뷰로 분류되는 해변 영상
+    video_path = "./tmp/mkv_sample.mkv"
+    video_info = FFprobeVideoParser(read_packets=False).extract_info(video_path)
+
+    # when
+    estimate = VideoQualityEstimator(allowed_angles=["top"]).estimate(video_path, video_info)
+
+    # then
+    assert estimate.camera_angle == CameraAngle.FRONT
+    assert estimate.reasons == [REASON_WRONG_ANGLE]
+
+
+def test_centroid_분류기를_학습하고_저장한_뒤_불러와_예측한다(tmp_path):
+    # given: 가로 줄무늬(정면 뷰 특성)와 세로 줄무늬 프레임
+    rows = np.tile((np.arange(120) // 6 % 2 * 200)[:, None, None], (1, 160, 3)).astype(np.uint8)
+    columns = np.ascontiguousarray(rows.transpose(1, 0, 2)[:120, :160])
+    statistics = [FrameStatistics.from_frames([rows]), FrameStatistics.from_frames([columns])]
+    classifier = NearestCentroidCameraAngleClassifier.fit(statistics, ["front", "top"])
+
+    # when
+    classifier.save(str(tmp_path / "angle.json"))
+    loaded = NearestCentroidCameraAngleClassifier.load(str(tmp_path / "angle.json"))
+
+    # then
+    assert loaded.predict(statistics[0]) == CameraAngle.FRONT
+    assert loaded.predict(statistics[1]) == CameraAngle.TOP
@@ -0,0 +1,100 @@
+import shutil
+import time
+
+import cv2
+import ffmpeg
+import numpy as np
+import pytest
+
+from app.features.video_processor.video_validator import (
+    REASON_EMPTY_FILE,
+    REASON_MISSING_MOOV,
+    REASON_TRUNCATED_CONTAINER,
+    REASON_TRUNCATED_STREAM,
+    VideoValidator,
+    scan_mp4_boxes,
+)
+
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg가 설치되어 있지 않습니다")
+
+
+def _write_video(path, num_frames=90, size=(64, 48), fps=30):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), fps, size)
+    for i in range(num_frames):
+        writer.write(np.full((size[1], size[0], 3), i % 256, dtype=np.uint8))
+    writer.release()
+
+
+@pytest.mark.parametrize("video_path", ["./tmp/mp4_sample.mp4", "./tmp/avi_sample.avi", "./tmp/mkv_sample.mkv"])
+def test_정상_비디오는_1초_안에_통과한다(video_path):
+    # when
+    started = time.perf_counter()
+    result = VideoValidator().validate(video_path)
+
+    # then
+    assert result.valid, result
+    assert time.perf_counter() - started < 1.0
+    assert len(result.samples) == 5
+
+
+def test_moov가_끝에_있는_mp4의_box를_읽는다(tmp_path):
+    # given: cv2.VideoWriter의 mp4는 moov를 파일 끝에 기록
+    source = tmp_path / "source.mp4"
+    _write_video(source)
+
+    # then
+    assert scan_mp4_boxes(str(source))[-1] == "moov"
+    assert scan_mp4_boxes("./tmp/avi_sample.avi") is None
+
+
+def test_mdat_중간에서_잘린_mp4는_잘린_컨테이너로_실패한다(tmp_path):
+    # given
+    data = open("./tmp/mp4_sample.mp4", "rb").read()
+    truncated = tmp_path / "truncated.mp4"
+    truncated.write_bytes(data[:len(data) // 2])
+
+    # when
+    result = VideoValidator().validate(str(truncated))
+
+    # then
+    assert not result.valid
+    assert result.reason == REASON_TRUNCATED_CONTAINER
+
+
+def test_moov가_없는_mp4는_실패한다(tmp_path):
+    # given: ftyp 뒤에 mdat만 있는 파일
+    source = tmp_path / "source.mp4"
+    _write_video(source)
+    data = source.read_bytes()
+    moov_offset = data.rindex(b"moov") - 4
+    broken = tmp_path / "no_moov.mp4"
+    broken.write_bytes(data[:moov_offset])
+
+    # when
+    result = VideoValidator().validate(str(broken))
+
+    # then
+    assert result.reason == REASON_MISSING_MOOV
+
+
+def test_헤더의_길이보다_짧게_잘린_mkv는_실패한다(tmp_path):
+    # given: 길이는 헤더에 남아 있고 뒷부분 클러스터만 잘린 파일
+    source = tmp_path / "source.mkv"
+    ffmpeg.input("./tmp/mp4_sample.mp4", t=10).output(str(source), vcodec="copy").run(quiet=True)
+    data = source.read_bytes()
+    truncated = tmp_path / "truncated.mkv"
+    truncated.write_bytes(data[:len(data) // 2])
+
+    # when
+    result = VideoValidator().validate(str(truncated))
+
+    # then
+    assert not result.valid
+    assert result.reason == REASON_TRUNCATED_STREAM
+
+
+def test_빈_파일은_실패한다(tmp_path):
+    empty = tmp_path / "empty.mp4"
+    empty.write_bytes(b"")
+
+    assert VideoValidator().validate(str(empty)).reason == REASON_EMPTY_FILE
@@ -0,0 +1,225 @@
+import json
+
+import cv2
+import numpy as np
+import pytest
+
+from app.features.video_processor.frame_decoders import OpenCVFrameDecoder
+from app.features.video_processor.videoframe_curator import (
+    DiversityFrameCurator,
+    MotionFrameCurator,
+    QualityFrameCurator,
+    build_frame_curator,
+    exposure_scores,
+    sharpness_scores,
+)
+from app.features.video_processor.videoframe_handler import CompositeCurator, NaiveVideoFrameCurator, VideoFrameHandler
+
+
+SAMPLE_VIDEO = "./tmp/mp4_sample.mp4"
+
+
+def _scene(pattern: int, count: int):
+    """같은 장면이 count번 반복되는 프레임 리스트"""
+    frame = np.zeros((64, 64, 3), dtype=np.uint8)
+    if pattern == 1:
+        frame[:, :32] = 255
+    elif pattern == 2:
+        frame[::8, :] = 255
+    return [frame.copy() for _ in range(count)]
+
+
+def test_정지_구간이_길어도_서로_다른_장면을_하나씩_고른다():
+    # given: 긴 정지 구간 두 개와 짧은 장면 하나
+    frames = _scene(0, 200) + _scene(1, 5) + _scene(2, 200)
+
+    for method in ("farthest", "kmeans++"):
+        # when
+        selected = DiversityFrameCurator(num_frames=3, method=method, seed=0).select(frames)
+
+        # then
+        scenes = {0 if i < 200 else 1 if i < 205 else 2 for i in selected}
+        assert scenes == {0, 1, 2}
+
+
+def test_요청_프레임_수가_후보보다_많으면_모두_반환한다():
+    frames = _scene(0, 4)
+
+    assert DiversityFrameCurator(num_frames=10).select(frames) == [0, 1, 2, 3]
+
+
+def test_같은_프레임만_있어도_중복_없이_고른다():
+    frames = _scene(0, 10)
+
+    selected = DiversityFrameCurator(num_frames=5).select(frames)
+
+    assert len(set(selected)) == 5
+
+
+def test_컴포지트_큐레이터에서_디코딩_중인_프레임으로_다양성_샘플링한다():
+    curator = CompositeCurator([NaiveVideoFrameCurator(60), DiversityFrameCurator(num_frames=8)])
+
+    frame_indices, frames = VideoFrameHandler().extract_curated(
+        SAMPLE_VIDEO, curator, {"frame_count": 600, "fps": 30.0}
+    )
+
+    assert len(frames) == 8
+    assert frame_indices == sorted(frame_indices)
+    assert set(frame_indices) <= set(range(0, 600, 10))
+
+
+class RecordingDecoder(OpenCVFrameDecoder):
+    """iter_frames로 요청받은 인덱스를 기록하는 디코더"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.requests = []
+
+    def iter_frames(self, video_path, frame_indices):
+        self.requests.append(list(frame_indices))
+        return super().iter_frames(video_path, self.requests[-1])
+
+
+def test_점수를_매기며_디코딩한_프레임을_선택_결과로_재사용한다():
+    # given
+    decoder = RecordingDecoder(target_size=32)
+    curator = CompositeCurator([NaiveVideoFrameCurator(60), QualityFrameCurator(num_frames=8, min_sharpness=0)])
+    video_info = {"frame_count": 600, "fps": 30.0}
+    handler = VideoFrameHandler(decoder=decoder, retain_max_bytes=1024 * 1024)
+
+    # when
+    frame_indices, frames = handler.extract_curated(SAMPLE_VIDEO, curator, video_info)
+
+    # then: 점수 계산을 위한 디코딩 한 번뿐이고, 결과는 다시 디코딩한 프레임과 같다
+    assert decoder.requests == [list(range(0, 600, 10))]
+    assert len(frames) == 8
+    expected = dict(OpenCVFrameDecoder(target_size=32).iter_frames(SAMPLE_VIDEO, frame_indices))
+    assert all(np.array_equal(frame, expected[i]) for i, frame in zip(frame_indices, frames))
+
+
+def test_기본값은_프레임을_보관하지_않고_선택된_프레임만_다시_디코딩한다():
+    # given
+    decoder = RecordingDecoder(target_size=32)
+    curator = CompositeCurator([NaiveVideoFrameCurator(60), QualityFrameCurator(num_frames=8, min_sharpness=0)])
+
+    # when
+    frame_indices, _ = VideoFrameHandler(decoder=decoder).extract_curated(
+        SAMPLE_VIDEO, curator, {"frame_count": 600, "fps": 30.0}
+    )
+
+    # then
+    assert decoder.requests == [list(range(0, 600, 10)), frame_indices]
+
+
+def test_보관_용량을_넘으면_고르게_줄여_보관하고_나머지만_다시_디코딩한다():
+    # given: 32x32x3 프레임 10장만 보관할 수 있는 용량
+    decoder = RecordingDecoder(target_size=32)
+    curator = CompositeCurator([NaiveVideoFrameCurator(60), QualityFrameCurator(num_frames=8, min_sharpness=0)])
+    handler = VideoFrameHandler(decoder=decoder, retain_max_bytes=10 * 32 * 32 * 3)
+
+    # when
+    frame_indices, frames = handler.extract_curated(SAMPLE_VIDEO, curator, {"frame_count": 600, "fps": 30.0})
+
+    # then: 보관 간격(8 x 10프레임)에 맞지 않는 선택 프레임만 다시 디코딩
+    assert len(decoder.requests) == 2
+    assert decoder.requests[1] == [i for i in frame_indices if i % 80]
+    assert len(frames) == len(frame_indices) == 8
+
+
+def test_통과_프레임이_목표_위치에서_같은_거리에_있으면_뒤쪽을_고른다():
+    available = [3, 7, 12]
+
+    assert QualityFrameCurator._nearest_passed(5, available) == 7
+    assert QualityFrameCurator._nearest_passed(5, available) == 3
+    assert QualityFrameCurator._nearest_passed(100, available) == 12
+    assert QualityFrameCurator._nearest_passed(0, available) is None
+
+
+def _moving_square_frames(idle: int, active: int):
+    """idle개의 정지 프레임 뒤에 사각형이 움직이는 active개 프레임이 이어지는 (index, frame) 제너레이터"""
+    for i in range(idle + active):
+        frame = np.zeros((64, 64, 3), dtype=np.uint8)
+        x = 0 if i < idle else (i - idle) * 3 % 48
+        frame[20:36, x:x + 16] = 255
+        yield i, frame
+
+
+def test_움직임이_많은_구간에서_더_많은_프레임을_고른다():
+    # given: 300 프레임 정지 후 100 프레임 동안 움직임
+    curator = MotionFrameCurator(num_frames=20, seed=0)
+
+    # when
+    selected = curator.select_stream(_moving_square_frames(idle=300, active=100))
+
+    # then
+    assert len(selected) == 20
+    assert sum(i >= 300 for i in selected) >= 15
+
+
+def test_움직임_점수는_정지_구간에서_0이다():
+    frame_indices, scores = MotionFrameCurator(num_frames=1).motion_scores(_moving_square_frames(10, 10))
+
+    assert frame_indices == list(range(20))
+    assert np.all(scores[:11] == 0)
+    assert np.all(scores[11:] > 0)
+
+
+def test_이름으로_큐레이터를_생성한다():
+    assert isinstance(build_frame_curator("motion", 10), MotionFrameCurator)
+    with pytest.raises(ValueError):
+        build_frame_curator("unknown", 10)
+
+
+def _textured_frame(seed: int):
+    return np.random.default_rng(seed).integers(40, 215, (128, 128, 3), dtype=np.uint8)
+
+
+def test_흐린_프레임과_노출이_맞지_않는_프레임의_점수가_낮다():
+    sharp = cv2.cvtColor(_textured_frame(0), cv2.COLOR_BGR2GRAY)
+    blurred = cv2.GaussianBlur(sharp, (15, 15), 5)
+    dark = np.full_like(sharp, 5)
+    thumbnails = np.stack([sharp, blurred, dark])
+
+    sharpness = sharpness_scores(thumbnails)
+    exposure = exposure_scores(thumbnails)
+
+    assert sharpness[0] > sharpness[1] * 10
+    assert exposure[0] == 1.0
+    assert exposure[2] == 0.0
+
+
+def test_기준_미달_프레임은_가까운_프레임으로_대체해_요청_수를_채운다():
+    # given: 균등 샘플링 목표 위치(0, 10, 20, 30)의 프레임만 어둡다
+    frames = [_textured_frame(i) for i in range(40)]
+    for i in (0, 10, 20, 30):
+        frames[i] = np.zeros_like(frames[i])
+    curator = QualityFrameCurator(num_frames=4, batch_size=16)
+
+    # when
+    selected = curator.select(frames)
+
+    # then
+    assert selected == [1, 11, 21, 31]
+    assert curator.scores[10]["passed"] is False
+    assert curator.scores[11]["selected"] is True
+
+
+def test_통과_프레임이_부족하면_점수가_높은_프레임으로_채운다():
+    frames = [np.zeros((64, 64, 3), dtype=np.uint8) for _ in range(10)]
+    frames[3] = _textured_frame(3)
+
+    selected = QualityFrameCurator(num_frames=3).select(frames)
+
+    assert len(selected) == 3
+    assert 3 in selected
+
+
+def test_프레임별_점수를_저장한다(tmp_path):
+    curator = QualityFrameCurator(num_frames=2)
+    curator.select([_textured_frame(i) for i in range(5)])
+
+    curator.save_scores(str(tmp_path / "frame_scores.json"))
+
+    saved = json.loads((tmp_path / "frame_scores.json").read_text())
+    assert set(saved["frames"]) == {"0", "1", "2", "3", "4"}
+    assert saved["min_sharpness"] == curator.min_sharpness
@@ -0,0 +1,224 @@
+import json
+import os
+
+import pytest
+import cv2
+import numpy as np
+
+from app.features.video_processor.videoframe_handler import (
+    VideoFrameHandler,
+    VideoFrameCurator,
+    NaiveVideoFrameCurator,
+    CompositeCurator,
+)
+
+
+SAMPLE_VIDEO = "./tmp/mp4_sample.mp4"
+
+
+class EvenPositionCurator(VideoFrameCurator):
+    """테스트용 픽셀 기반 큐레이터: 받은 프레임 수를 기록하고 짝수 번째만 남긴다."""
+
+    def __init__(self):
+        self.received = 0
+
+    def curate(self, frames):
+        self.received = len(frames)
+        return frames[::2]
+
+
+def _read_all_frames(video_path):
+    cap = cv2.VideoCapture(video_path)
+    frames = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def test_전체_프레임_수만으로_균등한_프레임_인덱스를_계산한다():
+    curator = NaiveVideoFrameCurator(num_frames=4)
+
+    assert curator.select_indices(10) == [0, 2, 4, 6]
+    assert curator.select_indices(3) == [0, 1, 2]
+    assert curator.select_indices(0) == []
+
+
+def test_인덱스_기반_선택과_리스트_기반_큐레이션의_결과가_같다():
+    frames = [np.full((2, 2, 3), i, dtype=np.uint8) for i in range(17)]
+    curator = NaiveVideoFrameCurator(num_frames=5)
+
+    curated = curator.curate(frames)
+
+    assert [int(f[0, 0, 0]) for f in curated] == curator.select_indices(len(frames))
+
+
+def test_지정한_인덱스의_프레임만_순서대로_반환한다():
+    # given: grab으로 건너뛰는 구간과 seek하는 구간이 모두 포함된 인덱스
+    handler = VideoFrameHandler(seek_threshold=50)
+    frame_indices = [0, 3, 10, 300, 301]
+    all_frames = _read_all_frames(SAMPLE_VIDEO)[:302]
+
+    # when
+    extracted = list(handler.iter_frames(SAMPLE_VIDEO, frame_indices))
+
+    # then
+    assert [index for index, _ in extracted] == frame_indices
+    for index, frame in extracted:
+        assert np.array_equal(frame, all_frames[index])
+
+
+def test_영상_길이를_넘는_인덱스는_무시한다():
+    handler = VideoFrameHandler()
+
+    extracted = handler.extract_indices(SAMPLE_VIDEO, [0, 10_000_000])
+
+    assert len(extracted) == 1
+
+
+def test_컴포지트_큐레이터는_인덱스_단계를_먼저_적용해_디코딩할_프레임을_줄인다():
+    # given: 픽셀 기반 큐레이터가 인덱스 기반 큐레이터보다 앞에 등록되어 있어도
+    pixel_curator = EvenPositionCurator()
+    curator = CompositeCurator([pixel_curator, NaiveVideoFrameCurator(num_frames=6)])
+    video_info = {"frame_count": 600, "fps": 30.0}
+
+    # when
+    frame_indices, frames = VideoFrameHandler().extract_curated(SAMPLE_VIDEO, curator, video_info)
+
+    # then: 균등 샘플링된 6개 프레임만 디코딩되어 픽셀 큐레이터에 전달된다.
+    assert curator.plan(video_info) == [0, 100, 200, 300, 400, 500]
+    assert pixel_curator.received == 6
+    assert frame_indices == [0, 200, 400]
+    assert len(frames) == 3
+
+
+def test_컴포지트_큐레이터는_프레임_리스트와_비디오에_같은_순서로_단계를_적용한다():
+    # given: 픽셀 기반 큐레이터를 먼저 등록
+    curator = CompositeCurator([EvenPositionCurator(), NaiveVideoFrameCurator(num_frames=6)])
+    video_info = {"frame_count": 600, "fps": 30.0}
+    frames = _read_all_frames(SAMPLE_VIDEO)[:600]
+
+    # when
+    positions = curator.select(frames)
+    frame_indices, _ = VideoFrameHandler().extract_curated(SAMPLE_VIDEO, curator, video_info)
+
+    # then: 둘 다 균등 샘플링(6개) 후 짝수 위치만 남김
+    assert positions == frame_indices == [0, 200, 400]
+
+
+def test_컴포지트_큐레이터는_프레임_리스트에도_모든_단계를_적용한다():
+    frames = [np.full((2, 2, 3), i, dtype=np.uint8) for i in range(12)]
+    curator = CompositeCurator().add_curation(NaiveVideoFrameCurator(6)).add_curation(EvenPositionCurator())
+
+    curated = curator.curate(frames)
+
+    assert [int(f[0, 0, 0]) for f in curated] == [0, 4, 8]
+
+
+def test_이터레이터로_받은_프레임을_병렬로_저장하고_통계를_반환한다(tmp_path):
+    # given
+    frames = (np.random.randint(0, 255, (48, 64, 3), dtype=np.uint8) for _ in range(20))
+
+    # when
+    result = VideoFrameHandler().save_parallel(frames, str(tmp_path), max_workers=3, quality=80)
+
+    # then
+    saved_files = sorted(p.name for p in tmp_path.glob("*.jpg"))
+    assert saved_files == [f"frame_{i:04d}.jpg" for i in range(20)]
+    assert result.num_frames == 20
+    assert result.bytes_written == sum(p.stat().st_size for p in tmp_path.glob("*.jpg"))
+    assert result.frames_per_sec > 0
+
+
+def test_흑백_프레임을_webp로_저장한다(tmp_path):
+    frames = [np.zeros((16, 16), dtype=np.uint8)]
+
+    VideoFrameHandler().save_parallel(frames, str(tmp_path), image_format="webp", start_index=5)
+
+    saved = cv2.imread(str(tmp_path / "frame_0005.webp"))
+    assert saved.shape == (16, 16, 3)
+
+
+def test_저장할_프레임이_없으면_예외를_발생시킨다(tmp_path):
+    with pytest.raises(ValueError):
+        VideoFrameHandler().save_parallel(iter([]), str(tmp_path))
+
+
+def test_이미지_파일과_프레임_인덱스_대응을_manifest로_저장한다(tmp_path):
+    # when
+    manifest_path = VideoFrameHandler().save_manifest([3, 50], str(tmp_path), image_format="webp", extraction_mode="keyframe")
+
+    # then
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    assert manifest == {
+        "extraction_mode": "keyframe",
+        "frames": [
+            {"file": "frame_0000.webp", "frame_index": 3},
+            {"file": "frame_0001.webp", "frame_index": 50},
+        ],
+    }
+
+
+def test_변환본에서_추출한_프레임은_원본_프레임_인덱스를_함께_기록한다(tmp_path):
+    # when: 60fps 원본을 30fps로 변환한 비디오에서 추출
+    manifest_path = VideoFrameHandler().save_manifest(
+        [3, 50], str(tmp_path), source_frame_indices=[6, 100], conversion={"scale": 0.5}
+    )
+
+    # then
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    assert manifest["conversion"] == {"scale": 0.5}
+    assert manifest["frames"] == [
+        {"file": "frame_0000.jpg", "frame_index": 3, "source_frame_index": 6},
+        {"file": "frame_0001.jpg", "frame_index": 50, "source_frame_index": 100},
+    ]
+
+
+def test_지원하지_않는_이미지_형식은_프레임을_읽기_전에_예외를_발생시킨다(tmp_path):
+    # given
+    frames = (np.zeros((16, 16, 3), dtype=np.uint8) for _ in range(3))
+
+    # when / then
+    with pytest.raises(ValueError):
+        VideoFrameHandler().save_batches(frames, str(tmp_path), batch_size=2, image_format="bmp")
+    assert next(frames) is not None
+    assert os.listdir(tmp_path) == []
+
+
+def test_프레임을_배치로_나눠_저장하고_배치마다_파일명을_반환한다(tmp_path):
+    # given
+    frames = (np.full((16, 16, 3), i, dtype=np.uint8) for i in range(7))
+
+    # when
+    batches = list(VideoFrameHandler().save_batches(frames, str(tmp_path), batch_size=3, max_workers=2))
+
+    # then: 파일 번호는 배치를 이어서 매긴다
+    assert [batch.batch_index for batch in batches] == [0, 1, 2]
+    assert [batch.files for batch in batches] == [
+        ["frame_0000.jpg", "frame_0001.jpg", "frame_0002.jpg"],
+        ["frame_0003.jpg", "frame_0004.jpg", "frame_0005.jpg"],
+        ["frame_0006.jpg"],
+    ]
+    assert sorted(p.name for p in tmp_path.glob("*.jpg")) == [f"frame_{i:04d}.jpg" for i in range(7)]
+
+
+def test_인덱스_기반_큐레이션은_디코딩되는_대로_프레임을_반환한다():
+    # given
+    curator = NaiveVideoFrameCurator(num_frames=6)
+    video_info = {"frame_count": 600, "fps": 30.0}
+    handler = VideoFrameHandler()
+
+    # when
+    decoded = handler.iter_curated(SAMPLE_VIDEO, curator, video_info)
+
+    # then: 리스트가 아닌 이터레이터이고, extract_curated와 같은 프레임을 반환한다
+    assert not isinstance(decoded, list)
+    frame_indices, frames = handler.extract_curated(SAMPLE_VIDEO, curator, video_info)
+    for (frame_index, frame), expected_index, expected_frame in zip(decoded, frame_indices, frames):
+        assert frame_index == expected_index
+        assert np.array_equal(frame, expected_frame)
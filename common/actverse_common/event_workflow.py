@@ -5,6 +5,8 @@
 
 from actverse_common.events import (
     EVENT_VIDEO_DOWNLOADED,
+    EVENT_VIDEO_VALIDATION_REQUESTED,
+    EVENT_VIDEO_VALIDATED,
     EVENT_FRAMES_EXTRACTION_REQUESTED,
     EVENT_FRAMES_EXTRACTED,
     EVENT_LABELING_REQUESTED,
@@ -21,7 +23,8 @@ from actverse_common.events import (
 # 이벤트 워크플로우 정의
 # 키: 이벤트 타입, 값: 다음에 발행할 이벤트 타입
 EVENT_WORKFLOW = {
-    EVENT_VIDEO_DOWNLOADED: EVENT_FRAMES_EXTRACTION_REQUESTED,
+    EVENT_VIDEO_DOWNLOADED: EVENT_VIDEO_VALIDATION_REQUESTED,
+    EVENT_VIDEO_VALIDATED: EVENT_FRAMES_EXTRACTION_REQUESTED,
     EVENT_FRAMES_EXTRACTED: EVENT_LABELING_REQUESTED,
     EVENT_LABELING_COMPLETED: EVENT_MODEL_TRAINING_REQUESTED,
     EVENT_MODEL_TRAINING_COMPLETED: EVENT_MODEL_DEPLOYMENT_REQUESTED,
@@ -12,7 +12,10 @@ EVENT_INFERENCE_REQUESTED = "inference.requested"
 
 # Video Processor 이벤트
 EVENT_VIDEO_DOWNLOADED = "video.downloaded"
+EVENT_VIDEO_VALIDATION_REQUESTED = "video.validation.requested"
+EVENT_VIDEO_VALIDATED = "video.validated"
 EVENT_FRAMES_EXTRACTED = "video.frames.extracted"
+EVENT_FRAMES_BATCH_EXTRACTED = "video.frames.batch_extracted"
 
 # Labeling Manager 이벤트
 EVENT_LABELING_REQUESTED = "labeling.created"
@@ -49,14 +52,18 @@ EVENT_DESCRIPTIONS = {
     EVENT_DEPLOYMENT_REQUESTED: "모델 배포 요청",
     EVENT_INFERENCE_REQUESTED: "모델 추론 요청",
     EVENT_VIDEO_DOWNLOADED: "비디오 다운로드 완료",
+    EVENT_VIDEO_VALIDATION_REQUESTED: "비디오 검증 요청",
+    EVENT_VIDEO_VALIDATED: "비디오 검증 완료",
     EVENT_FRAMES_EXTRACTED: "프레임 추출 완료",
+    EVENT_FRAMES_BATCH_EXTRACTED: "프레임 배치 저장 완료",
     EVENT_LABELING_REQUESTED: "라벨링 작업 요청",
     EVENT_LABELING_COMPLETED: "라벨링 작업 완료", 
     EVENT_MODEL_TRAINING_REQUESTED: "모델 학습 요청",
     EVENT_MODEL_TRAINING_COMPLETED: "모델 학습 완료",
     EVENT_MODEL_DEPLOYMENT_REQUESTED: "모델 배포 요청",
     EVENT_MODEL_DEPLOYMENT_COMPLETED: "모델 배포 완료",
-    EVENT_MODEL_INFERENCE_COMPLETED: "모델 추론 완료"
+    EVENT_MODEL_INFERENCE_COMPLETED: "모델 추론 완료",
+    EVENT_TASK_FAILED: "태스크 실패"
 }
 
 def get_event_description(event_type):
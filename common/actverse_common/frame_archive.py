@@ -0,0 +1,257 @@
+"""
+프레임 이미지를 수천 개의 개별 파일 대신 tar 샤드 몇 개와 오프셋 인덱스로 저장합니다.
+
+디렉토리 구조::
+
+    frames/{task_id}/
+        frames-00000.tar      # frame_0000.jpg ~ frame_0999.jpg
+        frames-00001.tar
+        frames_index.json     # 파일명 -> (샤드, 데이터 오프셋, 크기)
+
+샤드는 표준 tar라 ``tar xf``로도 풀 수 있고, 인덱스의 오프셋으로 tar를 파싱하지 않고
+pread 한 번에 원하는 프레임을 읽습니다. 파일명은 ``VideoFrameHandler.save_parallel``과 같으므로
+``FrameArchive.materialize``로 풀면 기존 프레임 디렉토리와 똑같아집니다.
+"""
+import io
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+INDEX_NAME = "frames_index.json"
+INDEX_VERSION = 1
+# VideoFrameHandler.save_manifest가 쓰는 이미지 파일명 -> 원본 프레임 인덱스 대응
+MANIFEST_NAME = "frames_manifest.json"
+# FRAME_IMAGE_FORMAT(jpg|webp|png)로 저장될 수 있는 확장자
+FRAME_IMAGE_EXTENSIONS = (".jpg", ".webp", ".png")
+
+
+def shard_name(shard_index: int) -> str:
+    return f"frames-{shard_index:05d}.tar"
+
+
+def frame_image_names(path: str) -> List[str]:
+    """프레임 디렉토리에 저장된 이미지 파일명을 정렬해서 반환합니다.
+
+    manifest가 있으면 manifest의 파일명을 그대로 쓰고, 없으면(추출 중인 배치 등)
+    개별 파일 또는 샤드 아카이브에서 FRAME_IMAGE_EXTENSIONS 확장자의 파일을 찾습니다.
+    """
+    manifest_path = os.path.join(path, MANIFEST_NAME)
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            return sorted(frame["file"] for frame in json.load(f)["frames"])
+    if FrameArchive.exists(path):
+        with FrameArchive(path) as archive:
+            names = archive.names
+    else:
+        names = os.listdir(path) if os.path.isdir(path) else []
+    return sorted(name for name in names if name.endswith(FRAME_IMAGE_EXTENSIONS))
+
+
+def _padded_size(size: int) -> int:
+    return (size + tarfile.BLOCKSIZE - 1) // tarfile.BLOCKSIZE * tarfile.BLOCKSIZE
+
+
+class FrameArchiveWriter:
+    """프레임을 순서대로 tar 샤드에 추가하고 인덱스를 기록합니다.
+
+    샤드가 닫힐 때마다 인덱스를 다시 쓰므로, 배치 단위로 ``close_shard``하면 읽는 쪽은
+    추출이 끝나기 전에도 닫힌 샤드의 프레임을 읽을 수 있습니다.
+    """
+
+    def __init__(self, output_path: str, shard_max_frames: int = 1000, shard_max_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            output_path: 샤드와 인덱스를 저장할 디렉토리
+            shard_max_frames, shard_max_bytes: 둘 중 하나를 넘으면 다음 샤드로 넘어감
+        """
+        os.makedirs(output_path, exist_ok=True)
+        self.output_path = output_path
+        self.shard_max_frames = shard_max_frames
+        self.shard_max_bytes = shard_max_bytes
+        self.shards: List[str] = []
+        self.frames: List[dict] = []
+        self._tar: Optional[tarfile.TarFile] = None
+        self._shard_frames = 0
+        self._shard_bytes = 0
+
+    def add(self, name: str, data: bytes):
+        """현재 샤드 끝에 파일 하나를 추가합니다."""
+        if self._tar is None:
+            self.shards.append(shard_name(len(self.shards)))
+            self._tar = tarfile.open(os.path.join(self.output_path, self.shards[-1]), "w", format=tarfile.USTAR_FORMAT)
+            self._shard_frames = 0
+            self._shard_bytes = 0
+
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = int(time.time())
+        self._tar.addfile(info, io.BytesIO(data))
+        # addfile 후 offset은 패딩된 데이터 블록 끝이므로, 헤더 크기와 관계없이 데이터 시작 위치를 구할 수 있음
+        self.frames.append({
+            "name": name,
+            "shard": len(self.shards) - 1,
+            "offset": self._tar.offset - _padded_size(len(data)),
+            "size": len(data),
+        })
+
+        self._shard_frames += 1
+        self._shard_bytes += len(data)
+        if self._shard_frames >= self.shard_max_frames or self._shard_bytes >= self.shard_max_bytes:
+            self.close_shard()
+
+    def close_shard(self):
+        """현재 샤드를 닫고 인덱스를 갱신합니다. 열린 샤드가 없으면 아무 일도 하지 않습니다."""
+        if self._tar is None:
+            return
+        self._tar.close()
+        self._tar = None
+        self.save_index()
+
+    def save_index(self) -> str:
+        index_path = os.path.join(self.output_path, INDEX_NAME)
+        temp_path = f"{index_path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"version": INDEX_VERSION, "shards": self.shards, "frames": self.frames}, f)
+        os.replace(temp_path, index_path)
+        return index_path
+
+    def close(self) -> str:
+        """마지막 샤드를 닫고 인덱스 경로를 반환합니다."""
+        self.close_shard()
+        return self.save_index()
+
+    def __enter__(self) -> "FrameArchiveWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class FrameArchive:
+    """``FrameArchiveWriter``가 만든 샤드를 읽습니다.
+
+    프레임 번호(저장 순서)나 파일명으로 임의 접근하고, ``__iter__``/``iter_frames``로 샤드를 순서대로
+    스트리밍합니다. 파일 경로가 꼭 필요한 소비자(라벨링 SDK, YOLO 학습 디렉토리)를 위해
+    ``materialize``/``temporary_files``로 개별 파일을 만들 수 있습니다.
+    """
+
+    def __init__(self, path: str):
+        with open(os.path.join(path, INDEX_NAME)) as f:
+            index = json.load(f)
+        self.path = path
+        self.shards: List[str] = index["shards"]
+        self.frames: List[dict] = index["frames"]
+        self._positions: Dict[str, int] = {entry["name"]: i for i, entry in enumerate(self.frames)}
+        self._fds: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def exists(path: str) -> bool:
+        return os.path.exists(os.path.join(path, INDEX_NAME))
+
+    @property
+    def names(self) -> List[str]:
+        return [entry["name"] for entry in self.frames]
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._positions
+
+    def read(self, position: int) -> bytes:
+        """저장 순서 position(= frame_{position:04d})의 인코딩된 이미지를 읽습니다."""
+        entry = self.frames[position]
+        return os.pread(self._fd(entry["shard"]), entry["size"], entry["offset"])
+
+    def read_name(self, name: str) -> bytes:
+        return self.read(self._positions[name])
+
+    def decode(self, position: int):
+        """position의 프레임을 BGR numpy 배열로 디코딩합니다."""
+        import cv2
+        import numpy as np
+
+        return cv2.imdecode(np.frombuffer(self.read(position), dtype=np.uint8), cv2.IMREAD_COLOR)
+
+    def __iter__(self) -> Iterator[Tuple[str, bytes]]:
+        """(파일명, 인코딩된 이미지)를 저장 순서대로 반환합니다. 샤드를 앞에서부터 순차적으로 읽습니다."""
+        for position, entry in enumerate(self.frames):
+            yield entry["name"], self.read(position)
+
+    def iter_frames(self, positions: Optional[Iterable[int]] = None) -> Iterator[Tuple[int, "np.ndarray"]]:
+        """(position, 디코딩한 프레임)을 반환합니다. positions를 주지 않으면 전체를 순서대로 읽습니다."""
+        for position in range(len(self)) if positions is None else positions:
+            yield position, self.decode(position)
+
+    def materialize(self, dest_dir: str, names: Optional[Iterable[str]] = None) -> List[str]:
+        """names(기본값: 전체) 파일을 dest_dir에 개별 파일로 풀고 경로를 반환합니다.
+
+        가능하면 copy_file_range로 샤드에서 커널 안에서 복사합니다.
+        """
+        os.makedirs(dest_dir, exist_ok=True)
+        paths = []
+        for name in self.names if names is None else names:
+            entry = self.frames[self._positions[name]]
+            path = os.path.join(dest_dir, name)
+            with open(path, "wb") as dst:
+                self._copy_entry(entry, dst.fileno())
+            paths.append(path)
+        return paths
+
+    @contextmanager
+    def temporary_files(self, names: Optional[Iterable[str]] = None) -> Iterator[List[str]]:
+        """names를 임시 디렉토리에 풀어 경로 리스트를 넘기고, 블록이 끝나면 지웁니다."""
+        temp_dir = tempfile.mkdtemp(prefix="frames-")
+        try:
+            yield self.materialize(temp_dir, names)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def close(self):
+        with self._lock:
+            for fd in self._fds.values():
+                os.close(fd)
+            self._fds.clear()
+
+    def __enter__(self) -> "FrameArchive":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _fd(self, shard: int) -> int:
+        fd = self._fds.get(shard)
+        if fd is None:
+            with self._lock:
+                fd = self._fds.get(shard)
+                if fd is None:
+                    fd = os.open(os.path.join(self.path, self.shards[shard]), os.O_RDONLY)
+                    self._fds[shard] = fd
+        return fd
+
+    def _copy_entry(self, entry: dict, dst_fd: int):
+        src_fd = self._fd(entry["shard"])
+        if hasattr(os, "copy_file_range"):
+            try:
+                copied = 0
+                while copied < entry["size"]:
+                    sent = os.copy_file_range(
+                        src_fd, dst_fd, entry["size"] - copied, offset_src=entry["offset"] + copied
+                    )
+                    if sent == 0:
+                        break
+                    copied += sent
+                if copied == entry["size"]:
+                    return
+            except OSError:
+                pass
+            os.lseek(dst_fd, 0, os.SEEK_SET)
+            os.ftruncate(dst_fd, 0)
+        os.write(dst_fd, os.pread(src_fd, entry["size"], entry["offset"]))
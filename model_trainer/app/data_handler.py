@@ -5,6 +5,7 @@ import os
 import shutil 
 from pathlib import Path
 import yaml
+from actverse_common.frame_archive import FrameArchive, frame_image_names
 
 
 class DataHandler(ABC):
@@ -21,7 +22,9 @@ class YamlDataHandler(DataHandler):
         label_path = f'{data_path}/labels/{task_id}'
 
         # 전체 데이터 갯수 파악
-        image_list = glob(f'{image_path}/*.jpg')
+        # 이미지 형식(jpg/webp/png)과 관계없이 manifest에 기록된 프레임을 사용
+        # 샤드 아카이브로 저장된 프레임은 경로만 만들고 save_data에서 아카이브에서 바로 풀어 씀
+        image_list = [f'{image_path}/{name}' for name in frame_image_names(image_path)]
         label_list = glob(f'{label_path}/*.txt')
 
         # shuffle
@@ -55,14 +58,26 @@ class YamlDataHandler(DataHandler):
         os.makedirs(train_label_path, exist_ok=True)
         os.makedirs(valid_label_path, exist_ok=True)
 
+        # 샤드 아카이브로 저장된 프레임 디렉토리별 reader
+        archives = {}
         for image, label in zip(train_image_list, train_label_list):
-            shutil.copy(image, train_image_path)
+            self._copy_image(image, train_image_path, archives)
             shutil.copy(label, train_label_path)
 
         for image, label in zip(valid_image_list, valid_label_list):
-            shutil.copy(image, valid_image_path)
+            self._copy_image(image, valid_image_path, archives)
             shutil.copy(label, valid_label_path)
 
+    def _copy_image(self, image: str, dest_dir: str, archives: dict):
+        if os.path.exists(image):
+            shutil.copy(image, dest_dir)
+            return
+        # 개별 파일이 없으면 같은 디렉토리의 샤드 아카이브에서 풀기
+        image_dir = os.path.dirname(image)
+        if image_dir not in archives:
+            archives[image_dir] = FrameArchive(image_dir)
+        archives[image_dir].materialize(dest_dir, [os.path.basename(image)])
+
     def create_yaml(self, data_path: str):
         # TODO: yaml에 필요없는 부분 제거
         flip_idx = [0, 2, 1, 4, 3, 6, 5, 7, 8, 9, 10]